@@ -0,0 +1,129 @@
+"""Aggregation layer - every metric the report and charts need, computed once
+
+summarize() walks the prepared company table (analyze_data.load_companies)
+once per grouping and returns a plain, JSON-serialisable dict. The printed
+statistics and every chart read from it instead of re-deriving counts from
+the frame.
+"""
+from datetime import datetime, timezone
+import json
+import pandas as pd
+
+from dataset import filled
+
+# Company age and team size buckets
+AGE_BINS = [0, 2, 5, 10, 20]
+AGE_LABELS = ['0-2 years', '3-5 years', '6-10 years', '10+ years']
+TEAM_BINS = [0, 1, 2, 3, 10]
+TEAM_LABELS = ['No team info', '1 member', '2 members', '3+ members']
+
+COMPLETENESS_FIELDS = ['company_name', 'tagline', 'location', 'founded_year', 'funding_amount',
+                       'investors', 'team_members', 'description']
+
+TOP_INVESTORS = 10
+
+def _bucket_counts(value_counts, bins, labels):
+    """Bucket a value -> count histogram without expanding it back to rows"""
+    buckets = pd.cut(pd.Series(value_counts.index, dtype='float64'), bins=bins, labels=labels)
+    return (pd.Series(value_counts.to_numpy()).groupby(buckets.to_numpy(), observed=False).sum()
+            .reindex(labels, fill_value=0))
+
+def crawl_year(crawled_at=None):
+    """Year company ages are counted up to: the crawl's, or the current year without one"""
+    return (crawled_at or datetime.now(timezone.utc)).year
+
+def summarize(df, reference_year=None):
+    """All report and chart metrics for a prepared company table
+
+    Company ages are counted up to `reference_year`, by default the current
+    year; pass the crawl's year (crawl_year) for a dataset crawled earlier.
+    """
+    reference_year = reference_year or crawl_year()
+    total = len(df)
+    flags = df[['has_funding', 'has_investors', 'has_team', 'has_description']].sum()
+    funding = df['funding_numeric']
+
+    city_counts = df['city'].value_counts()
+    industry_counts = df['industry'].value_counts()
+    industry_funding = funding.groupby(df['industry']).sum().sort_values()
+
+    funded = df.loc[df['has_funding'], ['company_name', 'funding_numeric']].sort_values('funding_numeric')
+
+    year_counts = df['founded_year_numeric'].dropna().astype(int).value_counts().sort_index()
+    age_counts = _bucket_counts(pd.Series(year_counts.to_numpy(), index=reference_year - year_counts.index),
+                                AGE_BINS, AGE_LABELS)
+    team_histogram = df['team_count_numeric'].value_counts()
+    team_counts = _bucket_counts(team_histogram, TEAM_BINS, TEAM_LABELS)
+
+    investor_counts = df.loc[df['has_investors'], 'investors'].explode().value_counts().head(TOP_INVESTORS)
+
+    completeness = [float(filled(df[field]).sum() / total * 100) if field in df.columns else 0.0
+                    for field in COMPLETENESS_FIELDS]
+
+    most_funded = None
+    if flags['has_funding'] > 0:
+        idx = funding.idxmax()
+        most_funded = {'company': df.at[idx, 'company_name'], 'amount': float(funding[idx])}
+
+    return {
+        'reference_year': reference_year,
+        'companies': total,
+        'with_funding': int(flags['has_funding']),
+        'with_investors': int(flags['has_investors']),
+        'with_team': int(flags['has_team']),
+        'with_description': int(flags['has_description']),
+        'total_funding': float(funding.sum()),
+        'average_funding': float(funded['funding_numeric'].mean()) if len(funded) else None,
+        'average_team_size': float(df['team_count_numeric'].mean()),
+        'cities': int(city_counts.size),
+        'industries': int(industry_counts.size),
+        'top_city': [city_counts.index[0], int(city_counts.iloc[0])] if total else None,
+        'top_industry': [industry_counts.index[0], int(industry_counts.iloc[0])] if total else None,
+        'most_funded': most_funded,
+        'charts': {
+            '01_funding_distribution': {
+                'companies': funded['company_name'].tolist(),
+                'funding': funded['funding_numeric'].tolist(),
+            },
+            '02_geographic_distribution': {
+                'cities': city_counts.sort_values().index.tolist(),
+                'counts': city_counts.sort_values().tolist(),
+            },
+            '03_industry_distribution': {
+                'industries': industry_counts.index.tolist(),
+                'counts': industry_counts.tolist(),
+            },
+            '04_founding_timeline': {
+                'years': year_counts.index.tolist(),
+                'counts': year_counts.tolist(),
+            },
+            '05_funding_by_industry': {
+                'industries': industry_funding.index.tolist(),
+                'funding': industry_funding.tolist(),
+            },
+            '06_maturity_and_team': {
+                'age_labels': AGE_LABELS,
+                'age_counts': [int(v) for v in age_counts],
+                'team_labels': TEAM_LABELS,
+                'team_counts': [int(v) for v in team_counts],
+            },
+            '07_investor_engagement': {
+                'with_investors': int(flags['has_investors']),
+                'without_investors': total - int(flags['has_investors']),
+                'top_investors': investor_counts.index.tolist(),
+                'top_counts': investor_counts.tolist(),
+            },
+            '08_data_completeness': {
+                'fields': COMPLETENESS_FIELDS,
+                'completeness': completeness,
+            },
+        },
+    }
+
+def save_summary(summary, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+def load_summary(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
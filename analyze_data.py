@@ -1,396 +1,191 @@
-"""Data Analysis and Visualization for F6S Kazakhstan Companies"""
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+"""Data Analysis and Visualization for F6S Kazakhstan Companies
+
+Subcommands:
+    stats              print the data quality overview and key statistics
+    charts [NAME ...]  render charts (all by default)
+    export             write the enriched analysis table
+Without a subcommand both the statistics and all charts are produced. With
+--db the statistics and charts are aggregated in the SQLite store instead;
+with --chunk-size the dataset is streamed in chunks of that many rows
+(streaming.py) so memory stays bounded however large it is.
+
+Importing this module has no side effects; matplotlib and seaborn are only
+loaded by the charts command.
+"""
+from contextlib import closing
 from pathlib import Path
-import re
-
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 10
-
-# Create charts directory
-Path("charts").mkdir(exist_ok=True)
-
-# Load data
-print("Loading data...")
-df = pd.read_csv('f6s_kazakhstan_companies.csv')
-print(f"Total companies: {len(df)}")
-
-# Data cleaning and preprocessing
-print("\n" + "="*60)
-print("DATA QUALITY OVERVIEW")
-print("="*60)
-
-# Clean funding amounts
-def parse_funding(value):
-    if pd.isna(value) or value == '':
-        return 0
-    value = str(value).upper().replace('$', '').replace(',', '').strip()
-    multiplier = 1
-    if 'K' in value:
-        multiplier = 1000
-        value = value.replace('K', '')
-    elif 'M' in value:
-        multiplier = 1000000
-        value = value.replace('M', '')
-    elif 'B' in value:
-        multiplier = 1000000000
-        value = value.replace('B', '')
-    try:
-        return float(value) * multiplier
-    except:
-        return 0
-
-df['funding_numeric'] = df['funding_amount'].apply(parse_funding)
-df['has_funding'] = df['funding_numeric'] > 0
-
-# Parse founded year
-df['founded_year_numeric'] = pd.to_numeric(df['founded_year'], errors='coerce')
-
-# Categories
-df['has_investors'] = df['investors'].notna() & (df['investors'] != '')
-df['has_team'] = df['team_members'].notna() & (df['team_members'] != '')
-df['has_description'] = df['description'].notna() & (df['description'] != '')
-
-# Extract cities from location
-def extract_city(location):
-    if pd.isna(location) or location == '':
-        return 'Unknown'
-    # Take first part before comma
-    city = location.split(',')[0].strip()
-    return city
-
-df['city'] = df['location'].apply(extract_city)
-
-# Categorize by industry based on description and tagline
-def categorize_industry(row):
-    text = str(row['description']) + ' ' + str(row['tagline'])
-    text = text.lower()
-
-    if any(word in text for word in ['ai', 'artificial intelligence', 'machine learning', 'ml', 'neural']):
-        return 'AI & Machine Learning'
-    elif any(word in text for word in ['fintech', 'payment', 'banking', 'neobank', 'financial', 'investment', 'credit']):
-        return 'FinTech'
-    elif any(word in text for word in ['saas', 'software', 'platform', 'cloud', 'crm']):
-        return 'SaaS & Enterprise Software'
-    elif any(word in text for word in ['game', 'gaming', 'mobile game']):
-        return 'Gaming'
-    elif any(word in text for word in ['blockchain', 'web3', 'crypto', 'bitcoin']):
-        return 'Blockchain & Web3'
-    elif any(word in text for word in ['health', 'medical', 'healthcare', 'diagnostic']):
-        return 'HealthTech'
-    elif any(word in text for word in ['energy', 'solar', 'wind', 'renewable']):
-        return 'Clean Energy'
-    elif any(word in text for word in ['ecommerce', 'e-commerce', 'marketplace', 'retail']):
-        return 'E-commerce'
-    elif any(word in text for word in ['education', 'learning', 'school', 'course']):
-        return 'EdTech'
+import argparse
+
+from aggregate import crawl_year, save_summary, summarize
+from classifier import industry_labels
+from dataset import DATASET_CSV, crawled_at, filled, load_dataset
+from features import city_column
+from normalize import default_aliases
+
+COLUMNS = ['company_name', 'tagline', 'location', 'founded_year', 'funding_amount', 'funding_usd',
+           'investors', 'team_members', 'team_count', 'description']
+
+def load_companies(path=DATASET_CSV):
+    """Load the dataset and add the derived analysis columns"""
+    return add_analysis_columns(load_dataset(path, columns=COLUMNS))
+
+def add_analysis_columns(df, aliases=None):
+    """Add the derived analysis columns to a typed company frame (or one chunk of it)"""
+    df['funding_numeric'] = df['funding_usd'].fillna(0)
+    df['has_funding'] = df['funding_numeric'] > 0
+
+    # Founded year is stored as a nullable integer
+    df['founded_year_numeric'] = df['founded_year'].astype('float64')
+
+    # Canonical investor, city and company spellings (aliases.json)
+    aliases = aliases or default_aliases()
+    df['company_name'] = aliases.column('companies', df['company_name'])
+    df['investors'] = aliases.list_column('investors', df['investors'])
+
+    # Categories
+    df['has_investors'] = filled(df['investors'])
+    df['has_team'] = filled(df['team_members'])
+    df['has_description'] = filled(df['description'])
+
+    df['city'] = aliases.column('cities', city_column(df['location']))
+    df['industry'] = industry_labels(df)['industry']
+    df['team_count_numeric'] = df['team_count'].fillna(0).astype(int)
+    return df
+
+def print_overview(summary):
+    total = summary['companies']
+    print("\n" + "="*60)
+    print("DATA QUALITY OVERVIEW")
+    print("="*60)
+
+    print(f"\nCompanies with funding: {summary['with_funding']} ({summary['with_funding']/total*100:.1f}%)")
+    print(f"Companies with investors: {summary['with_investors']} ({summary['with_investors']/total*100:.1f}%)")
+    print(f"Companies with team info: {summary['with_team']} ({summary['with_team']/total*100:.1f}%)")
+    print(f"Companies with description: {summary['with_description']} ({summary['with_description']/total*100:.1f}%)")
+    print(f"\nTotal funding: ${summary['total_funding']:,.0f}")
+    average = summary['average_funding']
+    print(f"Average funding (funded companies): ${float('nan') if average is None else average:,.0f}")
+
+def print_summary(summary):
+    print("\n" + "="*60)
+    print("ANALYSIS COMPLETE - KEY STATISTICS")
+    print("="*60)
+    print(f"\nTotal Companies: {summary['companies']}")
+    print(f"Cities Represented: {summary['cities']}")
+    print(f"Industries: {summary['industries']}")
+    print(f"Total Funding: ${summary['total_funding']:,.0f}")
+    print(f"Companies with Funding: {summary['with_funding']}")
+    print(f"Companies with Investors: {summary['with_investors']}")
+    print(f"Average Team Size: {summary['average_team_size']:.1f}")
+
+    city, city_count = summary['top_city']
+    industry, industry_count = summary['top_industry']
+    print(f"\nTop City: {city} ({city_count} companies)")
+    print(f"Top Industry: {industry} ({industry_count} companies)")
+
+    if summary['most_funded']:
+        print(f"\nMost Funded Company: {summary['most_funded']['company']}")
+        print(f"Amount: ${summary['most_funded']['amount']:,.0f}")
+
+EXPORT_FORMATS = ('csv', 'parquet', 'json')
+
+def run_charts(summary, names=None, dpi=None, fmt=None, workers=None, force=False):
+    from charts import DPI, FORMAT, render_charts
+
+    print()
+    render_charts(summary['charts'], names=names, dpi=dpi or DPI, fmt=fmt or FORMAT,
+                  workers=workers, force=force)
+
+def export_table(df, path, fmt=None):
+    """Write the analysis table; list columns become comma-joined text outside Parquet"""
+    fmt = fmt or Path(path).suffix.lstrip('.') or 'csv'
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+        return
+    flat = df.copy()
+    for column in ('investors', 'team_members'):
+        flat[column] = flat[column].map(', '.join)
+    if fmt == 'json':
+        flat.to_json(path, orient='records', force_ascii=False, indent=1)
     else:
-        return 'Other'
-
-df['industry'] = df.apply(categorize_industry, axis=1)
-
-# Print summary
-print(f"\nCompanies with funding: {df['has_funding'].sum()} ({df['has_funding'].sum()/len(df)*100:.1f}%)")
-print(f"Companies with investors: {df['has_investors'].sum()} ({df['has_investors'].sum()/len(df)*100:.1f}%)")
-print(f"Companies with team info: {df['has_team'].sum()} ({df['has_team'].sum()/len(df)*100:.1f}%)")
-print(f"Companies with description: {df['has_description'].sum()} ({df['has_description'].sum()/len(df)*100:.1f}%)")
-print(f"\nTotal funding: ${df['funding_numeric'].sum():,.0f}")
-print(f"Average funding (funded companies): ${df[df['has_funding']]['funding_numeric'].mean():,.0f}")
-
-# ========================================
-# CHART 1: Funding Distribution
-# ========================================
-print("\n[1/8] Creating funding distribution chart...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-funded = df[df['has_funding']].sort_values('funding_numeric', ascending=True)
-colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(funded)))
-
-bars = ax.barh(funded['company_name'], funded['funding_numeric'], color=colors)
-ax.set_xlabel('Funding Amount ($)', fontsize=12, fontweight='bold')
-ax.set_title('Top Funded Kazakhstan Startups from F6S', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlim(0, funded['funding_numeric'].max() * 1.1)
-
-# Add value labels
-for i, (idx, row) in enumerate(funded.iterrows()):
-    value = row['funding_numeric']
-    if value >= 1000000:
-        label = f"${value/1000000:.1f}M"
-    elif value >= 1000:
-        label = f"${value/1000:.0f}K"
+        flat.to_csv(path, index=False, encoding='utf-8-sig')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=DATASET_CSV, help='dataset CSV (its .parquet copy is preferred)')
+    parser.add_argument('--db', help='aggregate in this SQLite store (store.py) instead of loading the dataset')
+    parser.add_argument('--all-history', action='store_true',
+                        help='with --db, also count companies no longer listed by the latest crawl')
+    parser.add_argument('--reference-year', type=int,
+                        help='year company ages are counted up to (default: the year the dataset was crawled)')
+    parser.add_argument('--chunk-size', type=int,
+                        help='stream the dataset in chunks of this many rows instead of loading it whole')
+    sub = parser.add_subparsers(dest='command')
+
+    stats = sub.add_parser('stats', help='print summary statistics only')
+    stats.add_argument('--json', help='also write every aggregate to this JSON file')
+
+    charts = sub.add_parser('charts', help='render charts')
+    charts.add_argument('names', nargs='*', help='chart names, e.g. 01_funding_distribution (default: all)')
+    # Accepted before or after `charts`; the subparser suppresses its defaults so it
+    # does not overwrite values given before the subcommand
+    for p, default in ((parser, None), (charts, argparse.SUPPRESS)):
+        p.add_argument('--dpi', type=int, default=default, help='default 300; e.g. 72 for fast previews')
+        p.add_argument('--format', choices=['png', 'svg', 'pdf'], default=default, help='default png')
+        p.add_argument('--workers', type=int, default=default, help='rendering processes (default: CPU count)')
+        p.add_argument('--force', action='store_true', default=default or False,
+                       help='re-render charts even if unchanged')
+
+    export = sub.add_parser('export', help='write the enriched analysis table')
+    export.add_argument('-o', '--output', default='analysis_companies.csv')
+    export.add_argument('--format', choices=EXPORT_FORMATS, help='default: from the file extension')
+
+    args = parser.parse_args()
+    command = args.command or 'all'
+
+    if args.chunk_size and command != 'export':
+        from streaming import summarize_stream
+
+        print(f"Streaming {args.data} in chunks of {args.chunk_size:,} rows...")
+        summary = summarize_stream([args.data], args.chunk_size, args.reference_year)
+        print(f"Total companies: {summary['companies']}")
+    elif command == 'export' or not args.db:
+        # Load data
+        print("Loading data...")
+        df = load_companies(args.data)
+        print(f"Total companies: {len(df)}")
+
+        if command == 'export':
+            export_table(df, args.output, args.format)
+            print(f"Exported {len(df)} companies to {args.output}")
+            return
+
+        summary = summarize(df, args.reference_year or crawl_year(crawled_at(args.data)))
     else:
-        label = f"${value:.0f}"
-    ax.text(value, i, f'  {label}', va='center', fontsize=9, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/01_funding_distribution.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/01_funding_distribution.png")
-plt.close()
-
-# ========================================
-# CHART 2: Geographic Distribution (single bar chart)
-# ========================================
-print("[2/8] Creating geographic distribution chart (horizontal bar)...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-# Count companies per city and sort for better readability (smallest→largest so largest appear on top)
-city_counts = df['city'].value_counts().sort_values(ascending=True)
-
-# Use a colormap sized to the number of cities
-colors_pie = plt.cm.tab20(np.linspace(0, 1, len(city_counts)))
-
-# Horizontal bar chart
-ax.barh(city_counts.index, city_counts.values, color=colors_pie)
-ax.set_xlabel('Number of Companies', fontsize=12, fontweight='bold')
-ax.set_title('Companies by City (Count)', fontsize=16, fontweight='bold', pad=20)
-
-# Add value labels at the end of each bar
-max_count = city_counts.values.max() if len(city_counts) else 1
-label_x_offset = max_count * 0.01  # small offset so labels don't overlap bars
-for i, v in enumerate(city_counts.values):
-    ax.text(v + label_x_offset, i, str(v), va='center', fontweight='bold', fontsize=10)
-
-# Improve layout if there are many cities
-ax.set_xlim(0, max_count * 1.08)
-plt.tight_layout()
-plt.savefig('charts/02_geographic_distribution.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/02_geographic_distribution.png")
-plt.close()
-
-# ========================================
-# CHART 3: Industry Distribution
-# ========================================
-print("[3/8] Creating industry distribution chart...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-industry_counts = df['industry'].value_counts()
-colors_ind = plt.cm.tab20(range(len(industry_counts)))
-
-bars = ax.barh(industry_counts.index, industry_counts.values, color=colors_ind)
-ax.set_xlabel('Number of Companies', fontsize=12, fontweight='bold')
-ax.set_title('Kazakhstan Startups by Industry Sector', fontsize=16, fontweight='bold', pad=20)
-
-# Add value labels
-for i, v in enumerate(industry_counts.values):
-    ax.text(v + 0.3, i, str(v), va='center', fontsize=10, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/03_industry_distribution.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/03_industry_distribution.png")
-plt.close()
-
-# ========================================
-# CHART 4: Founded Year Timeline
-# ========================================
-print("[4/8] Creating founding year timeline...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-founded_years = df[df['founded_year_numeric'].notna()]['founded_year_numeric'].astype(int)
-year_counts = founded_years.value_counts().sort_index()
-
-ax.plot(year_counts.index, year_counts.values, marker='o', linewidth=3, markersize=8, color='#2E86AB')
-ax.fill_between(year_counts.index, year_counts.values, alpha=0.3, color='#2E86AB')
-ax.set_xlabel('Year Founded', fontsize=12, fontweight='bold')
-ax.set_ylabel('Number of Companies', fontsize=12, fontweight='bold')
-ax.set_title('Startup Founding Timeline (2009-2025)', fontsize=16, fontweight='bold', pad=20)
-ax.grid(True, alpha=0.3)
-
-# Add value labels on peaks
-for x, y in zip(year_counts.index, year_counts.values):
-    if y >= 3:  # Only label significant peaks
-        ax.text(x, y + 0.3, str(y), ha='center', fontsize=9, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/04_founding_timeline.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/04_founding_timeline.png")
-plt.close()
-
-# ========================================
-# CHART 5: Funding by Industry
-# ========================================
-print("[5/8] Creating funding by industry chart...")
-fig, ax = plt.subplots(figsize=(14, 8))
-
-industry_funding = df.groupby('industry')['funding_numeric'].sum().sort_values(ascending=True)
-colors_fund = plt.cm.plasma(np.linspace(0.2, 0.9, len(industry_funding)))
-
-bars = ax.barh(industry_funding.index, industry_funding.values, color=colors_fund)
-ax.set_xlabel('Total Funding ($)', fontsize=12, fontweight='bold')
-ax.set_title('Total Funding by Industry Sector', fontsize=16, fontweight='bold', pad=20)
-
-# Add value labels
-for i, (idx, value) in enumerate(industry_funding.items()):
-    if value >= 1000000:
-        label = f"${value/1000000:.1f}M"
-    elif value >= 1000:
-        label = f"${value/1000:.0f}K"
-    else:
-        label = f"${value:.0f}"
-    if value > 0:
-        ax.text(value, i, f'  {label}', va='center', fontsize=9, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/05_funding_by_industry.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/05_funding_by_industry.png")
-plt.close()
-
-# ========================================
-# CHART 6: Company Maturity & Team Size
-# ========================================
-print("[6/8] Creating company maturity analysis...")
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
-
-# Company age distribution
-df_with_year = df[df['founded_year_numeric'].notna()].copy()
-df_with_year['age'] = 2024 - df_with_year['founded_year_numeric']
-age_bins = [0, 2, 5, 10, 20]
-age_labels = ['0-2 years', '3-5 years', '6-10 years', '10+ years']
-df_with_year['age_group'] = pd.cut(df_with_year['age'], bins=age_bins, labels=age_labels)
-
-age_counts = df_with_year['age_group'].value_counts().reindex(age_labels, fill_value=0)
-colors_age = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
-age_counts.plot(kind='bar', ax=ax1, color=colors_age, width=0.7)
-ax1.set_xlabel('Company Age', fontsize=11, fontweight='bold')
-ax1.set_ylabel('Number of Companies', fontsize=11, fontweight='bold')
-ax1.set_title('Company Maturity Distribution', fontsize=14, fontweight='bold', pad=20)
-ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45, ha='right')
-
-# Add value labels
-for i, v in enumerate(age_counts.values):
-    if v > 0:
-        ax1.text(i, v + 0.5, str(v), ha='center', fontweight='bold')
-
-# Team size distribution
-df['team_count_numeric'] = pd.to_numeric(df['team_count'], errors='coerce').fillna(0).astype(int)
-team_bins = [0, 1, 2, 3, 10]
-team_labels = ['No team info', '1 member', '2 members', '3+ members']
-df['team_size'] = pd.cut(df['team_count_numeric'], bins=team_bins, labels=team_labels)
-
-team_counts = df['team_size'].value_counts().reindex(team_labels, fill_value=0)
-colors_team = ['#DDA15E', '#BC6C25', '#606C38', '#283618']
-team_counts.plot(kind='bar', ax=ax2, color=colors_team, width=0.7)
-ax2.set_xlabel('Team Size', fontsize=11, fontweight='bold')
-ax2.set_ylabel('Number of Companies', fontsize=11, fontweight='bold')
-ax2.set_title('Team Size Distribution', fontsize=14, fontweight='bold', pad=20)
-ax2.set_xticklabels(ax2.get_xticklabels(), rotation=45, ha='right')
-
-# Add value labels
-for i, v in enumerate(team_counts.values):
-    if v > 0:
-        ax2.text(i, v + 1, str(v), ha='center', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/06_maturity_and_team.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/06_maturity_and_team.png")
-plt.close()
-
-# ========================================
-# CHART 7: Investor Engagement
-# ========================================
-print("[7/8] Creating investor engagement analysis...")
-fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
-
-# Companies with/without investors
-investor_status = df['has_investors'].value_counts()
-labels = ['No Investors', 'Has Investors']
-colors_inv = ['#E63946', '#06D6A0']
-sizes = [investor_status.get(False, 0), investor_status.get(True, 0)]
-
-wedges, texts, autotexts = ax1.pie(sizes, labels=labels, autopct='%1.1f%%',
-                                     colors=colors_inv, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-    autotext.set_fontsize(12)
-ax1.set_title('Investor Engagement Overview', fontsize=14, fontweight='bold', pad=20)
-
-# Top investors by number of investments
-all_investors = []
-for investors in df[df['has_investors']]['investors']:
-    if pd.notna(investors) and investors != '':
-        investor_list = [inv.strip() for inv in str(investors).split(',')]
-        all_investors.extend(investor_list)
-
-if all_investors:
-    investor_counts = pd.Series(all_investors).value_counts().head(10)
-    colors_top = plt.cm.Spectral(np.linspace(0.1, 0.9, len(investor_counts)))
-    investor_counts.plot(kind='barh', ax=ax2, color=colors_top)
-    ax2.set_xlabel('Number of Investments', fontsize=11, fontweight='bold')
-    ax2.set_title('Top 10 Most Active Investors', fontsize=14, fontweight='bold', pad=20)
-
-    # Add value labels
-    for i, v in enumerate(investor_counts.values):
-        ax2.text(v + 0.1, i, str(v), va='center', fontweight='bold')
-else:
-    ax2.text(0.5, 0.5, 'No investor data available', ha='center', va='center',
-             transform=ax2.transAxes, fontsize=12)
-    ax2.set_xlim(0, 1)
-    ax2.set_ylim(0, 1)
-
-plt.tight_layout()
-plt.savefig('charts/07_investor_engagement.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/07_investor_engagement.png")
-plt.close()
-
-# ========================================
-# CHART 8: Data Completeness Heatmap
-# ========================================
-print("[8/8] Creating data quality heatmap...")
-fig, ax = plt.subplots(figsize=(10, 8))
-
-# Calculate completeness for each field
-fields = ['company_name', 'tagline', 'location', 'founded_year', 'funding_amount',
-          'investors', 'team_members', 'description']
-completeness = []
-
-for field in fields:
-    if field in df.columns:
-        non_empty = df[field].notna() & (df[field] != '')
-        completeness.append(non_empty.sum() / len(df) * 100)
-    else:
-        completeness.append(0)
-
-# Create bar chart
-colors_comp = plt.cm.RdYlGn(np.array(completeness) / 100)
-bars = ax.barh(fields, completeness, color=colors_comp)
-ax.set_xlabel('Completeness (%)', fontsize=12, fontweight='bold')
-ax.set_title('Dataset Completeness by Field', fontsize=16, fontweight='bold', pad=20)
-ax.set_xlim(0, 105)
-
-# Add percentage labels
-for i, (field, pct) in enumerate(zip(fields, completeness)):
-    ax.text(pct + 2, i, f'{pct:.1f}%', va='center', fontsize=10, fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/08_data_completeness.png', dpi=300, bbox_inches='tight')
-print("   Saved: charts/08_data_completeness.png")
-plt.close()
-
-# ========================================
-# Generate Summary Statistics
-# ========================================
-print("\n" + "="*60)
-print("ANALYSIS COMPLETE - KEY STATISTICS")
-print("="*60)
-print(f"\nTotal Companies: {len(df)}")
-print(f"Cities Represented: {df['city'].nunique()}")
-print(f"Industries: {df['industry'].nunique()}")
-print(f"Total Funding: ${df['funding_numeric'].sum():,.0f}")
-print(f"Companies with Funding: {df['has_funding'].sum()}")
-print(f"Companies with Investors: {df['has_investors'].sum()}")
-print(f"Average Team Size: {df['team_count_numeric'].mean():.1f}")
-
-print(f"\nTop City: {df['city'].value_counts().index[0]} ({df['city'].value_counts().values[0]} companies)")
-print(f"Top Industry: {df['industry'].value_counts().index[0]} ({df['industry'].value_counts().values[0]} companies)")
-
-if df['has_funding'].sum() > 0:
-    print(f"\nMost Funded Company: {df.loc[df['funding_numeric'].idxmax(), 'company_name']}")
-    print(f"Amount: ${df['funding_numeric'].max():,.0f}")
-
-print("\n" + "="*60)
-print("All charts saved successfully to /charts directory!")
-print("="*60)
+        from store import connect, summarize_db
+
+        print(f"Aggregating in {args.db}...")
+        with closing(connect(args.db)) as conn:
+            summary = summarize_db(conn, args.reference_year, args.all_history)
+        print(f"Total companies: {summary['companies']}")
+
+    if getattr(args, 'json', None):
+        save_summary(summary, args.json)
+
+    if command in ('all', 'stats'):
+        print_overview(summary)
+
+    if command in ('all', 'charts'):
+        run_charts(summary, names=getattr(args, 'names', None) or None, dpi=args.dpi, fmt=args.format,
+                   workers=args.workers, force=args.force)
+
+    if command in ('all', 'stats'):
+        print_summary(summary)
+
+    if command == 'all':
+        print("\n" + "="*60)
+        print("All charts saved successfully to /charts directory!")
+        print("="*60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""Read-only JSON API over the company dataset
+
+Endpoints (GET):
+    /companies  filtered, paginated companies - city, industry, investor,
+                year, year_from, year_to, min_funding, max_funding (USD),
+                sort (page | funding | name), offset, limit
+    /summary    every report aggregate (aggregate.summarize)
+    /facets     companies per city, industry, investor and founding year
+    /health     dataset size, load time and cache statistics
+
+The dataset is loaded once into a CompanyIndex: row positions per city,
+industry and investor, plus founding year and funding sorted for range
+lookups, so a query is a handful of array intersections. Responses are kept
+in an LRU cache keyed by the normalised query. When a crawl rewrites the
+dataset the index is rebuilt and the cache starts over.
+"""
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregate import crawl_year, summarize
+from dataset import DATASET_CSV, crawled_at, load_dataset, parquet_path
+from normalize import default_aliases
+
+DEFAULT_PORT = 8000
+PAGE_LIMIT = 50
+MAX_LIMIT = 500
+CACHE_SIZE = 1024
+RELOAD_CHECK = 2.0  # seconds between checks for a newly crawled dataset
+
+RECORD_FIELDS = ('company_name', 'company_url', 'tagline', 'logo_url', 'location', 'city', 'industry',
+                 'founded_year', 'funding_amount', 'funding_usd', 'investors', 'investor_count',
+                 'team_members', 'team_count', 'description')
+FILTERS = ('city', 'industry', 'investor', 'year', 'year_from', 'year_to', 'min_funding', 'max_funding',
+           'sort', 'offset', 'limit')
+SORTS = ('page', 'funding', 'name')
+
+def _positions(keys, rows):
+    """{key: ascending row positions} for parallel arrays of keys and row positions"""
+    codes, uniques = pd.factorize(keys)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {key: rows[order[bounds[i]:bounds[i + 1]]] for i, key in enumerate(uniques)}
+
+def _value(value):
+    """JSON-ready cell: NA -> None, arrays -> lists, numpy scalars -> Python"""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(v) for v in value]
+    if pd.isna(value):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+class CompanyIndex:
+    """Prepared company table with lookup structures for the API filters"""
+
+    def __init__(self, df, reference_year=None):
+        self.size = len(df)
+        self.loaded_at = time.time()
+        rows = np.arange(self.size)
+        self.records = [{field: _value(value) for field, value in zip(RECORD_FIELDS, values)}
+                        for values in df[list(RECORD_FIELDS)].itertuples(index=False)]
+
+        # Exact-match filters, case-insensitive
+        investors = pd.Series(df['investors'].to_numpy(), index=rows).explode().dropna()
+        columns = {
+            'city': (df['city'].astype(str), rows),
+            'industry': (df['industry'].astype(str), rows),
+            'investor': (investors.astype(str), investors.index.to_numpy()),
+        }
+        self.names = {}
+        self.by = {}
+        for field, (values, positions) in columns.items():
+            values = values.to_numpy()
+            keys = pd.Series(values).str.casefold().to_numpy()
+            self.by[field] = _positions(keys, positions)
+            self.names[field] = dict(zip(keys, values))
+
+        # Range filters: values sorted once, rows found by binary search
+        years = df['founded_year'].astype('float64').to_numpy()
+        self.funding = df['funding_numeric'].to_numpy()
+        self.ranges = {}
+        for field, values in (('year', years), ('funding', self.funding)):
+            known = np.flatnonzero(~np.isnan(values))
+            order = known[np.argsort(values[known], kind='stable')]
+            self.ranges[field] = (values[order], order)
+        self.name_rank = np.argsort(np.argsort(df['company_name'].str.casefold().to_numpy(), kind='stable'))
+
+        self.summary = summarize(df, reference_year)
+
+    @classmethod
+    def load(cls, path=DATASET_CSV, reference_year=None):
+        from analyze_data import add_analysis_columns
+
+        df = add_analysis_columns(load_dataset(path), default_aliases())
+        return cls(df, reference_year or crawl_year(crawled_at(path)))
+
+    def _range(self, field, low, high):
+        values, order = self.ranges[field]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        stop = len(values) if high is None else np.searchsorted(values, high, side='right')
+        return np.sort(order[start:stop])
+
+    def query(self, city=None, industry=None, investor=None, year_from=None, year_to=None,
+              min_funding=None, max_funding=None, sort='page'):
+        """Row positions matching every given filter, in `sort` order"""
+        matches = []
+        for field, value in (('city', city), ('industry', industry), ('investor', investor)):
+            if value is not None:
+                matches.append(self.by[field].get(value.casefold(), np.empty(0, dtype=np.int64)))
+        if year_from is not None or year_to is not None:
+            matches.append(self._range('year', year_from, year_to))
+        if min_funding is not None or max_funding is not None:
+            matches.append(self._range('funding', min_funding, max_funding))
+
+        # Intersect smallest first so every step works on the fewest rows
+        selected = None
+        for rows in sorted(matches, key=len):
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+        if selected is None:
+            selected = np.arange(self.size)
+
+        if sort == 'funding':
+            selected = selected[np.argsort(-self.funding[selected], kind='stable')]
+        elif sort == 'name':
+            selected = selected[np.argsort(self.name_rank[selected], kind='stable')]
+        return selected
+
+    def facets(self):
+        def counts(field):
+            found = sorted(self.by[field].items(), key=lambda item: (-len(item[1]), item[0]))
+            return {self.names[field][key]: len(rows) for key, rows in found}
+        timeline = self.summary['charts']['04_founding_timeline']
+        return {'cities': counts('city'), 'industries': counts('industry'), 'investors': counts('investor'),
+                'years': dict(zip(map(str, timeline['years']), timeline['counts']))}
+
+def _number(params, name, kind=float):
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+def list_companies(index, params):
+    unknown = sorted(set(params) - set(FILTERS))
+    if unknown:
+        raise ValueError(f"unknown parameter {unknown[0]!r}; expected one of {', '.join(FILTERS)}")
+    sort = params.get('sort', 'page')
+    if sort not in SORTS:
+        raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+    year = _number(params, 'year', int)
+    offset = max(_number(params, 'offset', int) or 0, 0)
+    limit = _number(params, 'limit', int)
+    limit = PAGE_LIMIT if limit is None else min(max(limit, 0), MAX_LIMIT)
+
+    rows = index.query(city=params.get('city'), industry=params.get('industry'), investor=params.get('investor'),
+                       year_from=year if year is not None else _number(params, 'year_from', int),
+                       year_to=year if year is not None else _number(params, 'year_to', int),
+                       min_funding=_number(params, 'min_funding'), max_funding=_number(params, 'max_funding'),
+                       sort=sort)
+    return {'total': int(len(rows)), 'offset': offset, 'limit': limit,
+            'companies': [index.records[i] for i in rows[offset:offset + limit]]}
+
+ROUTES = {
+    '/companies': list_companies,
+    '/summary': lambda index, params: index.summary,
+    '/facets': lambda index, params: index.facets(),
+}
+
+class LRUCache:
+    """Thread-safe least-recently-used cache; size 0 disables it"""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        return {'size': self.size, 'entries': len(self._items), 'hits': self.hits, 'misses': self.misses}
+
+class ApiServer(ThreadingHTTPServer):
+    """HTTP server holding the current CompanyIndex and the response cache"""
+    daemon_threads = True
+
+    def __init__(self, address, path=DATASET_CSV, cache_size=CACHE_SIZE, reference_year=None):
+        super().__init__(address, ApiHandler)
+        self.dataset = path
+        self.reference_year = reference_year
+        self.cache = LRUCache(cache_size)
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._checked = time.monotonic()
+        self._stamp = self.dataset_stamp()
+        self.index = CompanyIndex.load(path, reference_year)
+
+    def dataset_stamp(self):
+        """Modification times of the dataset files; a crawl changes them"""
+        return tuple(p.stat().st_mtime_ns if p.exists() else None
+                     for p in (Path(self.dataset), parquet_path(self.dataset)))
+
+    def current(self, force=False):
+        """(index, generation), rebuilding the index first if the dataset was rewritten"""
+        if force or time.monotonic() - self._checked >= RELOAD_CHECK:
+            with self._lock:
+                self._checked = time.monotonic()
+                stamp = self.dataset_stamp()
+                if stamp != self._stamp:
+                    try:
+                        index = CompanyIndex.load(self.dataset, self.reference_year)
+                    except Exception as e:
+                        # Most likely caught mid-write; keep serving the old index and retry
+                        print(f"Reload of {self.dataset} failed ({type(e).__name__}: {e})")
+                    else:
+                        self.index, self._stamp = index, stamp
+                        self.generation += 1
+                        self.cache.clear()
+                        print(f"Reloaded {self.dataset}: {index.size} companies")
+        return self.index, self.generation
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # One buffered write per response; separate header and body packets stall keep-alive clients on delayed ACKs
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/') or '/'
+        params = dict(parse_qsl(url.query))
+        index, generation = self.server.current()
+
+        if path == '/health':
+            return self._send(200, {'companies': index.size, 'generation': generation,
+                                    'loaded_at': index.loaded_at, 'cache': self.server.cache.stats()})
+        route = ROUTES.get(path)
+        if route is None:
+            return self._send(404, {'error': f"unknown path {url.path}", 'paths': sorted(ROUTES) + ['/health']})
+
+        key = (generation, path, tuple(sorted(params.items())))
+        body = self.server.cache.get(key)
+        if body is None:
+            try:
+                payload = route(index, params)
+            except ValueError as e:
+                return self._send(400, {'error': str(e)})
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.server.cache.put(key, body)
+        self._send_body(200, body)
+
+    def _send(self, status, payload):
+        self._send_body(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+    def _send_body(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default=DATASET_CSV, help='dataset CSV (its .parquet copy is preferred)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='0 picks a free port')
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help='cached responses (0 disables)')
+    parser.add_argument('--reference-year', type=int,
+                        help='year company ages are counted up to (default: the year the dataset was crawled)')
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    server = ApiServer((args.host, args.port), args.data, args.cache_size, args.reference_year)
+    host, port = server.server_address[:2]
+    print(f"Loaded {server.index.size} companies in {time.monotonic() - started:.2f}s")
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""Content-addressed archive of raw crawl HTML for replaying extraction without a browser
+
+Layout:
+    <root>/objects/ab/abcdef...html.zst   one compressed object per unique page or block
+    <root>/manifest.jsonl                 one line per crawl: url, time, page and block hashes
+
+Objects are keyed by the SHA-256 of their uncompressed markup, so blocks that
+did not change between crawls are stored once.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from extract import BACKENDS, FIELDS, get_backend
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = 'archive'
+
+class SnapshotArchive:
+    """Compressed, content-addressed store of crawl HTML plus a crawl manifest"""
+
+    def __init__(self, root=ARCHIVE_DIR, compression=None):
+        self.root = Path(root)
+        self.compression = compression or ('zstd' if zstandard else 'gzip')
+        if self.compression == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd compression needs the 'zstandard' package")
+        self.manifest = self.root / 'manifest.jsonl'
+        self._lock = threading.Lock()
+        (self.root / 'objects').mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest, compression):
+        ext = 'zst' if compression == 'zstd' else 'gz'
+        return self.root / 'objects' / digest[:2] / f"{digest}.html.{ext}"
+
+    def put(self, markup):
+        """Store `markup` unless already present and return its hash"""
+        raw = markup.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        if self.has(digest):
+            return digest
+
+        path = self._path(digest, self.compression)
+        path.parent.mkdir(exist_ok=True)
+        if self.compression == 'zstd':
+            data = zstandard.ZstdCompressor(level=10).compress(raw)
+        else:
+            data = gzip.compress(raw, mtime=0)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return digest
+
+    def has(self, digest):
+        return any(self._path(digest, c).exists() for c in ('zstd', 'gzip'))
+
+    def get(self, digest):
+        """Return the markup stored under `digest`"""
+        path = self._path(digest, 'zstd')
+        if path.exists():
+            if zstandard is None:
+                raise RuntimeError(f"{path} needs the 'zstandard' package to read")
+            return zstandard.ZstdDecompressor().decompress(path.read_bytes()).decode('utf-8')
+        return gzip.decompress(self._path(digest, 'gzip').read_bytes()).decode('utf-8')
+
+    def record_crawl(self, url, page_html=None, block_digests=None, crawled_at=None):
+        """Store a crawl's page HTML and append its manifest entry; returns the entry"""
+        crawled_at = crawled_at or datetime.now(timezone.utc)
+        entry = {
+            'crawl_id': f"{crawled_at:%Y%m%dT%H%M%S%fZ}-{hashlib.sha1(url.encode()).hexdigest()[:8]}",
+            'url': url,
+            'crawled_at': crawled_at.isoformat(),
+            'page': self.put(page_html) if page_html is not None else None,
+            'blocks': list(block_digests or []),
+        }
+        with self._lock, open(self.manifest, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def crawls(self):
+        """Manifest entries, oldest first"""
+        if not self.manifest.exists():
+            return []
+        with open(self.manifest, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def replay(self, crawl_ids=None, backend='bs4'):
+        """Yield (crawl entry, row) by re-running extraction over archived HTML
+
+        Crawls archived with per-block hashes are replayed block by block and
+        each distinct block is extracted once; others are re-parsed from the page.
+        """
+        find, extract = get_backend(backend)
+        seen = {}
+        for entry in self.crawls():
+            if crawl_ids and entry['crawl_id'] not in crawl_ids:
+                continue
+            if entry['blocks']:
+                for digest in entry['blocks']:
+                    if digest not in seen:
+                        blocks = find(self.get(digest))
+                        seen[digest] = extract(blocks[0]) if blocks else None
+                    if seen[digest] and seen[digest]['company_name']:
+                        yield entry, seen[digest]
+            elif entry['page']:
+                for block in find(self.get(entry['page'])):
+                    data = extract(block)
+                    if data['company_name']:
+                        yield entry, data
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive raw crawl HTML and replay extraction over it')
+    parser.add_argument('--archive', default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('list', help='list archived crawls')
+
+    add = sub.add_parser('add', help='archive saved listing HTML files as crawls')
+    add.add_argument('files', nargs='+')
+    add.add_argument('--url', help='listing URL to record (defaults to the file path)')
+    add.add_argument('--blocks', action='store_true', help='also store each company block')
+
+    replay = sub.add_parser('replay', help='re-extract companies from archived crawls')
+    replay.add_argument('--crawl', action='append', help='crawl id to replay (default: all)')
+    replay.add_argument('--backend', choices=BACKENDS, default='bs4')
+    replay.add_argument('-o', '--output', default='replayed_companies.csv')
+
+    args = parser.parse_args()
+    archive = SnapshotArchive(args.archive)
+
+    if args.command == 'list':
+        for entry in archive.crawls():
+            print(f"{entry['crawl_id']}  {len(entry['blocks']):5d} blocks  {entry['url']}")
+
+    elif args.command == 'add':
+        from extract import split_blocks
+        for path in args.files:
+            html = Path(path).read_text(encoding='utf-8')
+            digests = [archive.put(b) for b in split_blocks(html)] if args.blocks else None
+            entry = archive.record_crawl(args.url or str(path), html, digests)
+            print(f"{entry['crawl_id']}  {path}")
+
+    else:
+        import pandas as pd
+        rows = [dict(row, crawl_id=entry['crawl_id'])
+                for entry, row in archive.replay(args.crawl, backend=args.backend)]
+        pd.DataFrame(rows, columns=FIELDS + ('crawl_id',)).to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"Replayed {len(rows)} companies to {args.output}")
+
+if __name__ == '__main__':
+    main()
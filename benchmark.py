@@ -0,0 +1,449 @@
+"""Benchmarks for the scraping and analysis pipeline"""
+from datetime import datetime, timezone
+from itertools import cycle, islice
+from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from extract import BACKENDS, get_backend
+from fixtures import load_rows, render_listing
+
+DATASET = 'f6s_kazakhstan_companies.csv'
+
+def synthetic_listing(n_blocks, source=DATASET):
+    """Listing HTML with `n_blocks` company blocks cycled from a saved dataset"""
+    rows = load_rows(source)
+    return render_listing(islice(cycle(rows), n_blocks))
+
+def best_of(func, repeat):
+    """Run `func` `repeat` times and return (best seconds, last result)"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def bench_extract(args):
+    html = synthetic_listing(args.blocks)
+    print(f"Extracting {args.blocks} blocks ({len(html) / 1e6:.1f} MB of HTML)")
+
+    outputs = {}
+    for name in args.backend:
+        find_blocks, extract_company_data = get_backend(name)
+        elapsed, rows = best_of(lambda: [extract_company_data(b) for b in find_blocks(html)], args.repeat)
+        outputs[name] = rows
+        print(f"  {name:6s} {elapsed:8.3f}s  {len(rows) / elapsed:10,.0f} blocks/sec")
+
+    reference, *others = args.backend
+    for name in others:
+        if outputs[name] != outputs[reference]:
+            mismatches = sum(a != b for a, b in zip(outputs[reference], outputs[name]))
+            raise SystemExit(f"{name} output differs from {reference} in {mismatches} rows")
+    if others:
+        print(f"  outputs identical across {', '.join(args.backend)}")
+
+# Odd values mixed into synthetic tables so the equivalence checks cover edge cases
+EDGE_ROWS = [
+    {'funding_amount': '$1,200', 'location': '', 'description': 'AI platform', 'tagline': ''},
+    {'funding_amount': '$2.5b', 'location': ' Almaty , KZ', 'description': '', 'tagline': 'Gaming studio'},
+    {'funding_amount': '$.', 'location': 'Astana', 'description': 'Crypto', 'tagline': 'mail'},
+    {'funding_amount': '$3.4k', 'location': 'Shymkent, Kazakhstan', 'description': 'Solar', 'tagline': 'school'},
+]
+
+def synthetic_table(n_rows, source=DATASET):
+    """Raw text company table with `n_rows` rows cycled from a saved dataset"""
+    import pandas as pd
+    rows = load_rows(source) + EDGE_ROWS
+    base = pd.DataFrame(rows).fillna('')
+    reps = -(-n_rows // len(base))
+    return pd.concat([base] * reps, ignore_index=True).iloc[:n_rows]
+
+def bench_features(args):
+    from dataset import parse_funding
+    import features
+
+    df = synthetic_table(args.rows)
+    print(f"Feature engineering over {len(df):,} rows")
+
+    checks = [
+        ('funding', lambda: df['funding_amount'].apply(parse_funding),
+                    lambda: features.funding_column(df['funding_amount'])),
+        ('city', lambda: df['location'].apply(features.extract_city),
+                 lambda: features.city_column(df['location'])),
+        ('industry', lambda: df.apply(features.categorize_industry, axis=1),
+                     lambda: features.industry_column(df)),
+    ]
+    for name, rowwise, vectorized in checks:
+        slow, expected = best_of(rowwise, 1)
+        fast, actual = best_of(vectorized, args.repeat)
+        if not (expected.astype(object) == actual.astype(object)).all():
+            raise SystemExit(f"{name}: vectorized output differs from the row-wise function")
+        print(f"  {name:9s} apply {slow:7.3f}s  vectorized {fast:7.3f}s  ({slow / fast:5.1f}x, identical)")
+
+def bench_stream(args):
+    import math
+    import tempfile
+    import tracemalloc
+    from aggregate import summarize
+    from analyze_data import load_companies
+    from streaming import TOP_FUNDED, summarize_stream
+
+    def close(a, b):
+        if isinstance(a, dict):
+            return a.keys() == b.keys() and all(close(a[k], b[k]) for k in a)
+        if isinstance(a, list):
+            return len(a) == len(b) and all(close(x, y) for x, y in zip(a, b))
+        if isinstance(a, float) or isinstance(b, float):
+            return math.isclose(a, b, rel_tol=1e-9) or (math.isnan(a) and math.isnan(b))
+        return a == b
+
+    def traced(func):
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        return elapsed, peak, result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'companies.csv'
+        df = synthetic_table(args.rows)
+        df['company_name'] = df['company_name'] + ' #' + df.index.astype(str)
+        df.to_csv(path, index=False)
+        del df
+        print(f"Summarizing {args.rows:,} rows ({path.stat().st_size / 1e6:.0f} MB CSV)")
+
+        elapsed, peak, expected = traced(lambda: summarize(load_companies(path)))
+        print(f"  in memory         {elapsed:7.2f}s  peak {peak:8.1f} MB")
+        for chunk_size in args.chunk_size:
+            elapsed, peak, actual = traced(lambda: summarize_stream([path], chunk_size))
+            print(f"  chunks of {chunk_size:<7,d} {elapsed:7.2f}s  peak {peak:8.1f} MB")
+
+            # The stream keeps only the TOP_FUNDED best funded companies for chart 01
+            funding = expected['charts']['01_funding_distribution']['funding'][-TOP_FUNDED:]
+            if not close(actual['charts']['01_funding_distribution']['funding'], funding):
+                raise SystemExit(f"chunks of {chunk_size}: funding chart differs from the in-memory summary")
+            strip = lambda s: {**s, 'charts': {k: v for k, v in s['charts'].items() if k != '01_funding_distribution'}}
+            if not close(strip(actual), strip(expected)):
+                raise SystemExit(f"chunks of {chunk_size}: summary differs from the in-memory summary")
+        print(f"  summaries identical (funding chart: top {TOP_FUNDED})")
+
+def bench_classify(args):
+    from classifier import IndustryClassifier, TAXONOMY_PATH
+    import features
+
+    df = synthetic_table(args.rows)
+    if args.unique:
+        # Make every text distinct so the per-unique shortcut cannot help
+        df['tagline'] = df['tagline'] + ' #' + df.index.astype(str)
+    classifier = IndustryClassifier.from_file(args.taxonomy or TAXONOMY_PATH)
+    print(f"Classifying {len(df):,} rows ({len(classifier.keyword_categories)} keywords, "
+          f"{len(classifier.categories)} categories)")
+
+    legacy_time, legacy = best_of(lambda: features.industry_column(df), args.repeat)
+    compiled_time, (primary, labels) = best_of(lambda: classifier.classify_frame(df), args.repeat)
+    print(f"  substring keywords   {legacy_time:7.3f}s  {len(df) / legacy_time:12,.0f} rows/sec")
+    print(f"  compiled classifier  {compiled_time:7.3f}s  {len(df) / compiled_time:12,.0f} rows/sec")
+    print(f"  primary label agrees with substring matching on {(primary == legacy).mean() * 100:.1f}% of rows, "
+          f"{(labels.map(len) > 1).mean() * 100:.1f}% of rows have several labels")
+
+def bench_fetch(args):
+    from extract import FIELDS
+    from fixtures import render_pages, serve_fixtures
+    from http_fetch import iter_companies_http, make_session
+    import tempfile
+
+    rows = list(islice(cycle(load_rows(DATASET)), args.companies))
+    # Cycled rows repeat URLs; make each company distinct like a real listing
+    expected = [{field: row.get(field, '') for field in FIELDS} for row in rows]
+    for i, row in enumerate(expected):
+        row['company_url'] += f'-{i}'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        specs = {kind: render_pages(expected, Path(tmp) / kind, page_size=args.page_size, kind=kind)
+                 for kind in args.kind}
+        server, base_url = serve_fixtures(tmp)
+        try:
+            print(f"Fetching {len(expected):,} companies in pages of {args.page_size} from {base_url}")
+            for kind, spec in specs.items():
+                session = make_session()
+                fetch = lambda: [row for _, row in iter_companies_http(session, f'{base_url}/{kind}/index.html',
+                                                                       spec, backend=args.backend)]
+                elapsed, fetched = best_of(fetch, args.repeat)
+                session.close()
+                if fetched != expected:
+                    mismatches = sum(a != b for a, b in zip(expected, fetched)) + abs(len(expected) - len(fetched))
+                    raise SystemExit(f"{kind}: {mismatches} rows differ from the fixture data")
+                print(f"  {kind:5s} {elapsed:7.3f}s  {len(fetched) / elapsed:8,.0f} companies/sec  (identical)")
+        finally:
+            server.shutdown()
+
+def api_queries(index, n_queries, seed=0):
+    """A reproducible mix of /companies, /summary and /facets requests over the index's values"""
+    import random
+    from urllib.parse import urlencode
+
+    rng = random.Random(seed)
+    facets = index.facets()
+    choices = {'city': list(facets['cities']), 'industry': list(facets['industries']),
+               'investor': list(facets['investors'])}
+    queries = ['/summary', '/facets']
+    while len(queries) < n_queries:
+        params = {}
+        for field in rng.sample(sorted(choices), rng.randint(0, 2)):
+            params[field] = rng.choice(choices[field])
+        if rng.random() < 0.3:
+            low = rng.randint(2005, 2024)
+            params.update(year_from=low, year_to=low + rng.randint(0, 5))
+        if rng.random() < 0.3:
+            params['min_funding'] = rng.choice([1, 10000, 100000, 1000000])
+        params['sort'] = rng.choice(['page', 'funding', 'name'])
+        params['offset'] = rng.choice([0, 0, 50, 200])
+        queries.append(f"/companies?{urlencode(params)}")
+    return queries
+
+def expected_urls(df, params):
+    """company_url of every row a /companies query should match, by brute-force filtering"""
+    mask = df['company_url'].notna()
+    if 'city' in params:
+        mask &= df['city'].str.casefold() == params['city'].casefold()
+    if 'industry' in params:
+        mask &= df['industry'].str.casefold() == params['industry'].casefold()
+    if 'investor' in params:
+        wanted = params['investor'].casefold()
+        mask &= df['investors'].map(lambda names: any(name.casefold() == wanted for name in names))
+    years = df['founded_year'].astype('float64')
+    if 'year_from' in params:
+        mask &= years.between(int(params['year_from']), int(params['year_to']))
+    if 'min_funding' in params:
+        mask &= df['funding_numeric'] >= float(params['min_funding'])
+    selected = df[mask]
+    if params.get('sort') == 'funding':
+        selected = selected.sort_values('funding_numeric', ascending=False, kind='stable')
+    elif params.get('sort') == 'name':
+        selected = selected.iloc[selected['company_name'].str.casefold().argsort(kind='stable')]
+    return selected['company_url'].tolist()
+
+def bench_serve(args):
+    import http.client
+    import random
+    import tempfile
+    import threading
+    import numpy as np
+    from urllib.parse import parse_qsl, urlsplit
+    from analyze_data import add_analysis_columns
+    from api import RELOAD_CHECK, CompanyIndex
+    from dataset import load_dataset
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'companies.csv'
+        table = synthetic_table(args.rows)
+        table['company_url'] = table['company_url'] + '-' + table.index.astype(str)
+        table.to_csv(path, index=False, encoding='utf-8-sig')
+
+        index = CompanyIndex.load(path)
+        queries = api_queries(index, args.queries)
+        df = add_analysis_columns(load_dataset(path))
+
+        # Every query answered by the index must match brute-force filtering of the table
+        for query in queries:
+            url = urlsplit(query)
+            if url.path != '/companies':
+                continue
+            params = dict(parse_qsl(url.query))
+            rows = index.query(**{k: (int(v) if k.startswith('year') else float(v) if k.endswith('funding') else v)
+                                  for k, v in params.items() if k != 'offset'})
+            if [index.records[i]['company_url'] for i in rows] != expected_urls(df, params):
+                raise SystemExit(f"{query}: index result differs from filtering the table")
+        print(f"Serving {args.rows:,} companies; {len(queries)} distinct queries match brute-force filtering")
+
+        for cache_size in (0, args.cache_size):
+            process = subprocess.Popen([sys.executable, 'api.py', '--data', str(path), '--port', '0',
+                                        '--cache-size', str(cache_size)],
+                                       stdout=subprocess.PIPE, text=True)
+            try:
+                line = ''
+                while not line.startswith('Serving on'):
+                    line = process.stdout.readline()
+                    if not line:
+                        raise SystemExit("api.py exited before serving")
+                host, port = line.split('//')[1].strip().split(':')
+
+                latencies = []
+                lock = threading.Lock()
+
+                def client(seed):
+                    rng = random.Random(seed)
+                    conn = http.client.HTTPConnection(host, int(port))
+                    mine = []
+                    for _ in range(args.requests // args.clients):
+                        query = rng.choice(queries)
+                        started = time.perf_counter()
+                        conn.request('GET', query)
+                        response = conn.getresponse()
+                        response.read()
+                        mine.append(time.perf_counter() - started)
+                        if response.status != 200:
+                            raise RuntimeError(f"{query}: HTTP {response.status}")
+                    conn.close()
+                    with lock:
+                        latencies.extend(mine)
+
+                threads = [threading.Thread(target=client, args=(seed,)) for seed in range(args.clients)]
+                started = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+                if len(latencies) < args.requests // args.clients * args.clients:
+                    raise SystemExit("some requests failed")
+
+                p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+                conn = http.client.HTTPConnection(host, int(port))
+                conn.request('GET', '/health')
+                health = json.loads(conn.getresponse().read())
+                cache = health['cache']
+                hit_rate = cache['hits'] / max(cache['hits'] + cache['misses'], 1)
+                label = f"cache {cache_size}" if cache_size else 'no cache'
+                print(f"  {label:11s} {len(latencies) / elapsed:8,.0f} req/s  p50 {p50:6.2f} ms  "
+                      f"p95 {p95:6.2f} ms  p99 {p99:6.2f} ms  hits {hit_rate:.0%}")
+
+                if cache_size:
+                    # A new crawl rewrites the dataset: the server must reload and drop cached results
+                    table.iloc[:1].assign(company_url='https://www.f6s.com/company/new-crawl').to_csv(
+                        path, mode='a', header=False, index=False)
+                    time.sleep(RELOAD_CHECK + 0.5)
+                    conn.request('GET', '/health')
+                    health = json.loads(conn.getresponse().read())
+                    if health['generation'] != 1 or health['companies'] != args.rows + 1:
+                        raise SystemExit(f"dataset change not picked up: {health}")
+                    print(f"  new crawl picked up: {health['companies']:,} companies, cache reset "
+                          f"({health['cache']['entries']} entries)")
+                conn.close()
+            finally:
+                process.terminate()
+                process.wait()
+
+def bench_investors(args):
+    import numpy as np
+    import pandas as pd
+    from investor_index import InvestorIndex
+
+    # Power-law-ish deal counts: a few very active funds, a long tail of angels
+    rng = np.random.default_rng(0)
+    weights = 1.0 / np.arange(1, args.investors + 1)
+    weights /= weights.sum()
+    sizes = rng.integers(1, 5, args.companies)
+    df = pd.DataFrame({
+        'company_name': [f"Company {i}" for i in range(args.companies)],
+        'investors': [[f"Investor {j}" for j in rng.choice(args.investors, size, replace=False, p=weights)]
+                      for size in sizes],
+    })
+
+    elapsed, index = best_of(lambda: InvestorIndex.build(df), 1)
+    print(f"Indexed {index.incidence.nnz:,} investments, {len(index.investors):,} investors, "
+          f"{index.coinvest.nnz // 2:,} co-investment edges in {elapsed:.3f}s")
+
+    names = rng.choice(index.investors, args.queries)
+    queries = [
+        ('top_k', lambda name: index.top_k(10)),
+        ('portfolio', index.portfolio),
+        ('co_investors', lambda name: index.co_investors(name, 10)),
+        ('path', lambda name: index.path(index.investors[0], name)),
+    ]
+    for label, query in queries:
+        started = time.perf_counter()
+        for name in names:
+            query(name)
+        elapsed = (time.perf_counter() - started) / len(names)
+        print(f"  {label:13s} {elapsed * 1000:8.3f} ms/query")
+
+STARTUP_COMMANDS = {
+    'import': [sys.executable, '-c', 'import analyze_data'],
+    'stats': [sys.executable, 'analyze_data.py', 'stats'],
+}
+
+def bench_startup(args):
+    loaded = subprocess.run([sys.executable, '-c', 'import analyze_data, sys; '
+                             'print(sorted(m for m in ("matplotlib", "seaborn") if m in sys.modules))'],
+                            capture_output=True, text=True, check=True).stdout.strip()
+    print(f"Plotting modules loaded by 'import analyze_data': {loaded}")
+
+    results = {}
+    for name, command in STARTUP_COMMANDS.items():
+        elapsed, _ = best_of(lambda: subprocess.run(command, capture_output=True, check=True), args.repeat)
+        results[name] = round(elapsed, 4)
+        print(f"  {name:7s} {elapsed * 1000:8.1f} ms")
+
+    if args.record:
+        entry = {'benchmark': 'startup', 'at': datetime.now(timezone.utc).isoformat(), **results}
+        with open(args.record, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        print(f"Recorded to {args.record}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    extract = sub.add_parser('extract', help='company block extraction throughput per parser backend')
+    extract.add_argument('--blocks', type=int, default=10000)
+    extract.add_argument('--backend', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    extract.add_argument('--repeat', type=int, default=3)
+    extract.set_defaults(func=bench_extract)
+
+    feats = sub.add_parser('features', help='row-wise vs vectorized feature engineering')
+    feats.add_argument('--rows', type=int, default=1000000)
+    feats.add_argument('--repeat', type=int, default=3)
+    feats.set_defaults(func=bench_features)
+
+    classify = sub.add_parser('classify', help='industry classification throughput')
+    classify.add_argument('--rows', type=int, default=1000000)
+    classify.add_argument('--repeat', type=int, default=3)
+    classify.add_argument('--taxonomy', help='taxonomy JSON (default: taxonomy.json)')
+    classify.add_argument('--unique', action='store_true', help='make every row\'s text distinct')
+    classify.set_defaults(func=bench_classify)
+
+    stream = sub.add_parser('stream', help='chunked analysis vs in-memory: peak memory and identical summary')
+    stream.add_argument('--rows', type=int, default=100000)
+    stream.add_argument('--chunk-size', type=int, nargs='+', default=[10000, 50000])
+    stream.set_defaults(func=bench_stream)
+
+    serve = sub.add_parser('serve', help='api.py under concurrent load, with and without the response cache')
+    serve.add_argument('--rows', type=int, default=20000)
+    serve.add_argument('--clients', type=int, default=8)
+    serve.add_argument('--requests', type=int, default=4000)
+    serve.add_argument('--queries', type=int, default=200, help='distinct queries in the request mix')
+    serve.add_argument('--cache-size', type=int, default=1024)
+    serve.set_defaults(func=bench_serve)
+
+    fetch = sub.add_parser('fetch', help='HTTP fetch backend against paginated fixture responses')
+    fetch.add_argument('--companies', type=int, default=1000)
+    fetch.add_argument('--page-size', type=int, default=20)
+    fetch.add_argument('--kind', nargs='+', choices=['json', 'html'], default=['json', 'html'])
+    fetch.add_argument('--backend', choices=BACKENDS, default='lxml')
+    fetch.add_argument('--repeat', type=int, default=3)
+    fetch.set_defaults(func=bench_fetch)
+
+    investors = sub.add_parser('investors', help='investor index build time and query latency')
+    investors.add_argument('--companies', type=int, default=20000)
+    investors.add_argument('--investors', type=int, default=5000)
+    investors.add_argument('--queries', type=int, default=200)
+    investors.set_defaults(func=bench_investors)
+
+    startup = sub.add_parser('startup', help='analysis CLI import and stats start-up time')
+    startup.add_argument('--repeat', type=int, default=5)
+    startup.add_argument('--record', help='append the timings as a JSON line to this file')
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
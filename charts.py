@@ -0,0 +1,316 @@
+"""Chart registry for the analysis - parallel, cached rendering
+
+Each chart is a function of a small precomputed aggregate (plain lists and
+numbers, see aggregate.summarize). Charts render in a process pool and
+are skipped when the hash of their aggregate, render options, this module's
+source (drawing code, helpers and style) and the plotting library versions
+matches the one recorded for the existing file.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import hashlib
+import inspect
+import json
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+# Set style
+sns.set_style("whitegrid")
+plt.rcParams['figure.figsize'] = (12, 8)
+plt.rcParams['font.size'] = 10
+
+CHART_DIR = 'charts'
+CACHE_FILE = '.chart_cache.json'
+DPI = 300
+FORMAT = 'png'
+
+CHARTS = {}
+
+def chart(name, title):
+    """Register a chart drawing function under its output file name"""
+    def register(func):
+        CHARTS[name] = (title, func)
+        return func
+    return register
+
+def money_label(value):
+    if value >= 1000000:
+        return f"${value/1000000:.1f}M"
+    elif value >= 1000:
+        return f"${value/1000:.0f}K"
+    return f"${value:.0f}"
+
+# ========================================
+# CHART 1: Funding Distribution
+# ========================================
+@chart('01_funding_distribution', 'funding distribution chart')
+def funding_distribution(data):
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    names, amounts = data['companies'], data['funding']
+    colors = plt.cm.viridis(np.linspace(0.3, 0.9, len(names)))
+
+    ax.barh(names, amounts, color=colors)
+    ax.set_xlabel('Funding Amount ($)', fontsize=12, fontweight='bold')
+    ax.set_title('Top Funded Kazakhstan Startups from F6S', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlim(0, max(amounts, default=0) * 1.1)
+
+    # Add value labels
+    for i, value in enumerate(amounts):
+        ax.text(value, i, f'  {money_label(value)}', va='center', fontsize=9, fontweight='bold')
+    return fig
+
+# ========================================
+# CHART 2: Geographic Distribution (single bar chart)
+# ========================================
+@chart('02_geographic_distribution', 'geographic distribution chart (horizontal bar)')
+def geographic_distribution(data):
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    # Cities sorted smallest→largest so the largest appear on top
+    cities, counts = data['cities'], data['counts']
+
+    # Use a colormap sized to the number of cities
+    colors_pie = plt.cm.tab20(np.linspace(0, 1, len(cities)))
+
+    # Horizontal bar chart
+    ax.barh(cities, counts, color=colors_pie)
+    ax.set_xlabel('Number of Companies', fontsize=12, fontweight='bold')
+    ax.set_title('Companies by City (Count)', fontsize=16, fontweight='bold', pad=20)
+
+    # Add value labels at the end of each bar
+    max_count = max(counts) if len(counts) else 1
+    label_x_offset = max_count * 0.01  # small offset so labels don't overlap bars
+    for i, v in enumerate(counts):
+        ax.text(v + label_x_offset, i, str(v), va='center', fontweight='bold', fontsize=10)
+
+    # Improve layout if there are many cities
+    ax.set_xlim(0, max_count * 1.08)
+    return fig
+
+# ========================================
+# CHART 3: Industry Distribution
+# ========================================
+@chart('03_industry_distribution', 'industry distribution chart')
+def industry_distribution(data):
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    industries, counts = data['industries'], data['counts']
+    colors_ind = plt.cm.tab20(range(len(industries)))
+
+    ax.barh(industries, counts, color=colors_ind)
+    ax.set_xlabel('Number of Companies', fontsize=12, fontweight='bold')
+    ax.set_title('Kazakhstan Startups by Industry Sector', fontsize=16, fontweight='bold', pad=20)
+
+    # Add value labels
+    for i, v in enumerate(counts):
+        ax.text(v + 0.3, i, str(v), va='center', fontsize=10, fontweight='bold')
+    return fig
+
+# ========================================
+# CHART 4: Founded Year Timeline
+# ========================================
+@chart('04_founding_timeline', 'founding year timeline')
+def founding_timeline(data):
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    years, counts = data['years'], data['counts']
+
+    ax.plot(years, counts, marker='o', linewidth=3, markersize=8, color='#2E86AB')
+    ax.fill_between(years, counts, alpha=0.3, color='#2E86AB')
+    ax.set_xlabel('Year Founded', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Number of Companies', fontsize=12, fontweight='bold')
+    ax.set_title('Startup Founding Timeline (2009-2025)', fontsize=16, fontweight='bold', pad=20)
+    ax.grid(True, alpha=0.3)
+
+    # Add value labels on peaks
+    for x, y in zip(years, counts):
+        if y >= 3:  # Only label significant peaks
+            ax.text(x, y + 0.3, str(y), ha='center', fontsize=9, fontweight='bold')
+    return fig
+
+# ========================================
+# CHART 5: Funding by Industry
+# ========================================
+@chart('05_funding_by_industry', 'funding by industry chart')
+def funding_by_industry(data):
+    fig, ax = plt.subplots(figsize=(14, 8))
+
+    industries, totals = data['industries'], data['funding']
+    colors_fund = plt.cm.plasma(np.linspace(0.2, 0.9, len(industries)))
+
+    ax.barh(industries, totals, color=colors_fund)
+    ax.set_xlabel('Total Funding ($)', fontsize=12, fontweight='bold')
+    ax.set_title('Total Funding by Industry Sector', fontsize=16, fontweight='bold', pad=20)
+
+    # Add value labels
+    for i, value in enumerate(totals):
+        if value > 0:
+            ax.text(value, i, f'  {money_label(value)}', va='center', fontsize=9, fontweight='bold')
+    return fig
+
+# ========================================
+# CHART 6: Company Maturity & Team Size
+# ========================================
+@chart('06_maturity_and_team', 'company maturity analysis')
+def maturity_and_team(data):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+
+    # Company age distribution
+    age_counts = pd.Series(data['age_counts'], index=data['age_labels'])
+    colors_age = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4']
+    age_counts.plot(kind='bar', ax=ax1, color=colors_age, width=0.7)
+    ax1.set_xlabel('Company Age', fontsize=11, fontweight='bold')
+    ax1.set_ylabel('Number of Companies', fontsize=11, fontweight='bold')
+    ax1.set_title('Company Maturity Distribution', fontsize=14, fontweight='bold', pad=20)
+    ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45, ha='right')
+
+    # Add value labels
+    for i, v in enumerate(age_counts.values):
+        if v > 0:
+            ax1.text(i, v + 0.5, str(v), ha='center', fontweight='bold')
+
+    # Team size distribution
+    team_counts = pd.Series(data['team_counts'], index=data['team_labels'])
+    colors_team = ['#DDA15E', '#BC6C25', '#606C38', '#283618']
+    team_counts.plot(kind='bar', ax=ax2, color=colors_team, width=0.7)
+    ax2.set_xlabel('Team Size', fontsize=11, fontweight='bold')
+    ax2.set_ylabel('Number of Companies', fontsize=11, fontweight='bold')
+    ax2.set_title('Team Size Distribution', fontsize=14, fontweight='bold', pad=20)
+    ax2.set_xticklabels(ax2.get_xticklabels(), rotation=45, ha='right')
+
+    # Add value labels
+    for i, v in enumerate(team_counts.values):
+        if v > 0:
+            ax2.text(i, v + 1, str(v), ha='center', fontweight='bold')
+    return fig
+
+# ========================================
+# CHART 7: Investor Engagement
+# ========================================
+@chart('07_investor_engagement', 'investor engagement analysis')
+def investor_engagement(data):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 7))
+
+    # Companies with/without investors
+    labels = ['No Investors', 'Has Investors']
+    colors_inv = ['#E63946', '#06D6A0']
+    sizes = [data['without_investors'], data['with_investors']]
+
+    wedges, texts, autotexts = ax1.pie(sizes, labels=labels, autopct='%1.1f%%',
+                                         colors=colors_inv, startangle=90)
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+        autotext.set_fontsize(12)
+    ax1.set_title('Investor Engagement Overview', fontsize=14, fontweight='bold', pad=20)
+
+    # Top investors by number of investments
+    if data['top_investors']:
+        investor_counts = pd.Series(data['top_counts'], index=data['top_investors'])
+        colors_top = plt.cm.Spectral(np.linspace(0.1, 0.9, len(investor_counts)))
+        investor_counts.plot(kind='barh', ax=ax2, color=colors_top)
+        # Streaming summaries past the sketch capacity can only give lower bounds (streaming.py)
+        error = data.get('top_counts_error')
+        xlabel = f'Number of Investments (estimates, up to {error} low)' if error else 'Number of Investments'
+        ax2.set_xlabel(xlabel, fontsize=11, fontweight='bold')
+        ax2.set_title('Top 10 Most Active Investors' + (' (approximate)' if error else ''),
+                      fontsize=14, fontweight='bold', pad=20)
+
+        # Add value labels
+        for i, v in enumerate(investor_counts.values):
+            ax2.text(v + 0.1, i, str(v), va='center', fontweight='bold')
+    else:
+        ax2.text(0.5, 0.5, 'No investor data available', ha='center', va='center',
+                 transform=ax2.transAxes, fontsize=12)
+        ax2.set_xlim(0, 1)
+        ax2.set_ylim(0, 1)
+    return fig
+
+# ========================================
+# CHART 8: Data Completeness Heatmap
+# ========================================
+@chart('08_data_completeness', 'data quality heatmap')
+def data_completeness(data):
+    fig, ax = plt.subplots(figsize=(10, 8))
+
+    fields, completeness = data['fields'], data['completeness']
+
+    # Create bar chart
+    colors_comp = plt.cm.RdYlGn(np.array(completeness) / 100)
+    ax.barh(fields, completeness, color=colors_comp)
+    ax.set_xlabel('Completeness (%)', fontsize=12, fontweight='bold')
+    ax.set_title('Dataset Completeness by Field', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlim(0, 105)
+
+    # Add percentage labels
+    for i, pct in enumerate(completeness):
+        ax.text(pct + 2, i, f'{pct:.1f}%', va='center', fontsize=10, fontweight='bold')
+    return fig
+
+def chart_hash(name, data, dpi, fmt):
+    """Hash of everything a chart's output depends on"""
+    spec = {
+        'name': name,
+        'data': data,
+        'dpi': dpi,
+        'format': fmt,
+        'code': inspect.getsource(inspect.getmodule(chart_hash)),
+        'versions': [matplotlib.__version__, sns.__version__, np.__version__],
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+def render_chart(name, data, path, dpi=DPI, fmt=FORMAT):
+    """Draw one registered chart to `path` (runs in worker processes)"""
+    fig = CHARTS[name][1](data)
+    plt.tight_layout()
+    fig.savefig(path, dpi=dpi, format=fmt, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+def render_charts(inputs, names=None, out_dir=CHART_DIR, dpi=DPI, fmt=FORMAT,
+                  workers=None, force=False):
+    """Render registered charts from `inputs` (chart name -> aggregate)
+
+    Charts whose hash matches the cache entry for an existing file are
+    skipped unless `force`. Returns {name: (path, rendered)}.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(exist_ok=True)
+    cache_path = out_dir / CACHE_FILE
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+
+    names = list(names or CHARTS)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        raise ValueError(f"Unknown charts: {', '.join(unknown)}")
+
+    results = {}
+    stale = []
+    for name in names:
+        path = out_dir / f"{name}.{fmt}"
+        digest = chart_hash(name, inputs[name], dpi, fmt)
+        if not force and path.exists() and cache.get(path.name) == digest:
+            results[name] = (path, False)
+        else:
+            stale.append((name, path, digest))
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(name, path, digest, pool.submit(render_chart, name, inputs[name], path, dpi, fmt))
+                       for name, path, digest in stale]
+            for name, path, digest, future in futures:
+                future.result()
+                cache[path.name] = digest
+                results[name] = (path, True)
+        cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+    for i, name in enumerate(names, 1):
+        path, rendered = results[name]
+        status = 'Saved' if rendered else 'Unchanged'
+        print(f"[{i}/{len(names)}] {CHARTS[name][0]}: {status} {path}")
+    return results
@@ -0,0 +1,119 @@
+"""Crawl checkpoints - rows extracted so far and the scroll position per listing
+
+Each listing gets two files under checkpoints/: an append-only JSON-lines
+file of extracted rows and a small JSON state file (blocks read, scrolls,
+last company_url, done flag) that is replaced atomically after every batch.
+Rows appended after the last state write are cut off on load, so a crash
+between the two writes cannot duplicate or lose committed rows.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+import argparse
+import hashlib
+import json
+import os
+import re
+
+CHECKPOINT_DIR = 'checkpoints'
+
+def checkpoint_name(url):
+    """'https://www.f6s.com/companies/kazakhstan/lo' -> 'www.f6s.com_companies_kazakhstan_lo-<hash>'"""
+    parsed = urlparse(url)
+    slug = re.sub(r'[^\w-]+', '_', f"{parsed.netloc}{parsed.path}").strip('_')[:80]
+    return f"{slug}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}"
+
+class Checkpoint:
+    """Resumable progress of one listing crawl"""
+
+    def __init__(self, url, directory=CHECKPOINT_DIR):
+        self.url = url
+        self.directory = Path(directory)
+        name = checkpoint_name(url)
+        self.state_path = self.directory / f'{name}.json'
+        self.rows_path = self.directory / f'{name}.jsonl'
+        self.state = {'url': url, 'seen': 0, 'scrolls': 0, 'last_url': None, 'rows': 0, 'done': False}
+        self.rows = []
+        self.urls = set()
+        self._pending = []
+
+    @property
+    def done(self):
+        return self.state['done']
+
+    @property
+    def position(self):
+        """(blocks already read, company_url of the last one)"""
+        return self.state['seen'], self.state['last_url']
+
+    def load(self):
+        """Read the committed state and rows; returns self"""
+        if not self.state_path.exists():
+            self.rows_path.unlink(missing_ok=True)
+            return self
+        self.state = json.loads(self.state_path.read_text(encoding='utf-8'))
+        self.rows = []
+        if self.rows_path.exists():
+            with open(self.rows_path, 'r+b') as f:
+                while len(self.rows) < self.state['rows']:
+                    self.rows.append(json.loads(f.readline()))
+                # Drop rows of a batch whose state never got written
+                f.truncate()
+        self.urls = {row['company_url'] for row in self.rows}
+        return self
+
+    def reset(self):
+        """Forget earlier progress for this listing"""
+        for path in (self.state_path, self.rows_path):
+            path.unlink(missing_ok=True)
+        self.__init__(self.url, self.directory)
+
+    def add(self, row):
+        """Buffer an extracted row until the next commit(); False if the company is already saved"""
+        if row['company_url'] and row['company_url'] in self.urls:
+            return False
+        self.urls.add(row['company_url'])
+        self._pending.append(row)
+        return True
+
+    def commit(self, seen, scrolls, last_url=None, done=False):
+        """Persist buffered rows, then the position they lead up to"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._pending:
+            with open(self.rows_path, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in self._pending)
+                f.flush()
+                os.fsync(f.fileno())
+            self.rows += self._pending
+            self._pending = []
+
+        self.state.update(seen=seen, scrolls=scrolls, rows=len(self.rows), done=done,
+                          updated_at=datetime.now(timezone.utc).isoformat())
+        if last_url is not None:
+            self.state['last_url'] = last_url
+        tmp = self.directory / f'{self.state_path.name}.tmp'
+        tmp.write_text(json.dumps(self.state, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.state_path)
+
+    def finish(self):
+        self.commit(self.state['seen'], self.state['scrolls'], done=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', default=CHECKPOINT_DIR)
+    parser.add_argument('--clear', action='store_true', help='delete every checkpoint')
+    args = parser.parse_args()
+
+    for path in sorted(Path(args.dir).glob('*.json')):
+        if args.clear:
+            path.unlink()
+            (path.parent / f'{path.stem}.jsonl').unlink(missing_ok=True)
+            continue
+        state = json.loads(path.read_text(encoding='utf-8'))
+        status = 'done' if state['done'] else f"{state['seen']} blocks, {state['scrolls']} scrolls"
+        print(f"{state['rows']:6d} rows  {status:28s} {state['url']}")
+    if args.clear:
+        print(f"Cleared {args.dir}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Taxonomy-driven industry classifier - one compiled word-boundary matcher for all keywords
+
+The category -> keywords map lives in taxonomy.json; category order sets the
+priority of the primary label. Keywords match whole words only (an optional
+plural 's' is allowed), so 'ai' no longer fires inside 'mail' or 'ml' inside
+'html'. Where keywords overlap the longest wins, e.g. 'machine learning'
+counts for AI without also tagging EdTech through 'learning'.
+"""
+from pathlib import Path
+import json
+import pandas as pd
+import re
+
+from features import industry_text, per_unique
+
+TAXONOMY_PATH = Path(__file__).with_name('taxonomy.json')
+OTHER = 'Other'
+
+def trie_regex(words):
+    """Regex alternation for `words` factored into a prefix trie
+
+    Python's re tries alternatives one by one; sharing prefixes means each
+    text position is checked against one branch per leading character
+    instead of every keyword.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return build(trie)
+
+class IndustryClassifier:
+    """Primary and multi-label industry classification from free text"""
+
+    def __init__(self, taxonomy):
+        self.categories = list(taxonomy)
+        self.keyword_categories = {}
+        for category, keywords in taxonomy.items():
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword.lower(), []).append(category)
+
+        # Expects lowercased text; the trie's optional suffixes are greedy, so
+        # 'machine learning' wins over 'learning' at the same position
+        self.pattern = re.compile(r'\b' + trie_regex(self.keyword_categories) + r's?\b')
+
+    @classmethod
+    def from_file(cls, path=TAXONOMY_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _categories(self, match):
+        if match not in self.keyword_categories:
+            match = match[:-1]
+        return self.keyword_categories.get(match, ())
+
+    def labels_from_matches(self, matches):
+        """All categories hit by a list of matched keywords, in taxonomy order"""
+        hit = {category for match in matches for category in self._categories(match)}
+        return [category for category in self.categories if category in hit]
+
+    def labels(self, text):
+        return self.labels_from_matches(self.pattern.findall((text or '').lower()))
+
+    def classify(self, text):
+        """Primary label: the first matching category in taxonomy order"""
+        labels = self.labels(text)
+        return labels[0] if labels else OTHER
+
+    def label_column(self, text):
+        """List of labels for every entry of a text Series"""
+        @per_unique
+        def labels(unique_text):
+            findall = self.pattern.findall
+            return pd.Series([self.labels_from_matches(findall(t)) for t in unique_text.fillna('').str.lower()],
+                             index=unique_text.index, dtype=object)
+        return labels(text)
+
+    def classify_frame(self, df):
+        """(primary, labels) Series for a frame with description and tagline columns"""
+        labels = self.label_column(industry_text(df))
+        primary = labels.map(lambda found: found[0] if found else OTHER)
+        return primary, labels
+
+_default = None
+
+def default_classifier():
+    """Classifier for the bundled taxonomy.json, loaded once"""
+    global _default
+    if _default is None:
+        _default = IndustryClassifier.from_file()
+    return _default
+
+def industry_labels(df):
+    """Primary industry and all matching industries for each company"""
+    primary, labels = default_classifier().classify_frame(df)
+    return pd.DataFrame({'industry': primary, 'industries': labels}, index=df.index)
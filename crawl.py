@@ -0,0 +1,198 @@
+"""Crawl many F6S listings in parallel across a pool of browser tabs"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from DrissionPage import ChromiumOptions, ChromiumPage
+from pathlib import Path
+from urllib.parse import urlparse
+import pandas as pd
+import argparse
+import re
+import threading
+import time
+
+from archive import ARCHIVE_DIR, SnapshotArchive
+from checkpoint import CHECKPOINT_DIR, Checkpoint
+from fixtures import serve_fixtures
+from scraper import iter_companies
+from snapshots import SNAPSHOT_DIR, write_snapshot
+
+OUTPUT_DIR = 'listings'
+WORKERS = 4
+HOST_INTERVAL = 2.0
+
+class HostRateLimiter:
+    """Space out requests to the same host - page loads and scrolls - by at least `interval` seconds"""
+
+    def __init__(self, interval=HOST_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def listing_name(url):
+    """File-friendly name for a listing URL, e.g. companies/kazakhstan/lo -> kazakhstan_lo"""
+    path = urlparse(url).path.strip('/')
+    path = re.sub(r'^companies/', '', path)
+    path = re.sub(r'\.html?$', '', path)
+    return re.sub(r'[^\w-]+', '_', path) or 'listing'
+
+def crawl_listing(browser, url, limiter, out_dir, archive=None, checkpoints=CHECKPOINT_DIR, resume=False,
+                  snapshots=None, archive_blocks=False, **scroll_options):
+    """Crawl one listing in its own tab and write its rows to `out_dir`
+
+    The page load and every scroll wait for `limiter`, since each scroll
+    makes the listing fetch its next page from the host.
+    Progress is checkpointed after every batch; with `resume` a finished
+    listing is skipped and an interrupted one continues where it stopped.
+    The rows are also added to the `snapshots` store when given.
+    With `archive_blocks` every block goes to `archive` as it is read and the
+    tab's full HTML, a serialisation of the whole scrolled DOM, is not.
+    """
+    started = time.monotonic()
+    path = Path(out_dir) / f"{listing_name(url)}.csv"
+    checkpoint = Checkpoint(url, checkpoints)
+    if resume:
+        checkpoint.load()
+        if checkpoint.done:
+            return url, len(checkpoint.rows), path, 0.0
+    else:
+        checkpoint.reset()
+    start, start_url = checkpoint.position
+
+    block_digests = []
+    on_block = (lambda html: block_digests.append(archive.put(html))) if archive and archive_blocks else None
+
+    limiter.wait(url)
+    tab = browser.new_tab(url)
+    try:
+        companies = list(checkpoint.rows)
+        for _, data in iter_companies(tab, start=start, start_url=start_url, on_batch=checkpoint.commit,
+                                      on_scroll=lambda: limiter.wait(url), on_block=on_block, **scroll_options):
+            if checkpoint.add(data):
+                companies.append(data)
+        if archive:
+            archive.record_crawl(url, None if archive_blocks else tab.html, block_digests)
+    finally:
+        tab.close()
+
+    if companies:
+        pd.DataFrame(companies).to_csv(path, index=False, encoding='utf-8-sig')
+        if snapshots:
+            write_snapshot(companies, snapshots, source=url)
+    checkpoint.finish()
+    return url, len(companies), path, time.monotonic() - started
+
+def crawl(urls, workers=WORKERS, out_dir=OUTPUT_DIR, host_interval=HOST_INTERVAL,
+          separate_browsers=False, archive=None, checkpoints=CHECKPOINT_DIR, resume=False, snapshots=None,
+          archive_blocks=False, **scroll_options):
+    """Crawl `urls` with at most `workers` listings in flight at once
+
+    By default every listing gets a tab in one shared Chromium; with
+    `separate_browsers` each worker thread drives its own browser process.
+    Raw page HTML, or each block with `archive_blocks`, goes to `archive`
+    (a SnapshotArchive) and rows to the `snapshots` store when given. With
+    `resume`, listings finished by an earlier run are not crawled again.
+    Returns {url: (rows, path)}; failed listings are reported and skipped.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    limiter = HostRateLimiter(host_interval)
+    shared = None if separate_browsers else ChromiumPage()
+    local = threading.local()
+    browsers = []
+    lock = threading.Lock()
+
+    def browser_for_thread():
+        if shared is not None:
+            return shared
+        if not hasattr(local, 'browser'):
+            local.browser = ChromiumPage(ChromiumOptions().auto_port())
+            with lock:
+                browsers.append(local.browser)
+        return local.browser
+
+    def run(url):
+        return crawl_listing(browser_for_thread(), url, limiter, out_dir, archive=archive,
+                             checkpoints=checkpoints, resume=resume, snapshots=snapshots,
+                             archive_blocks=archive_blocks, **scroll_options)
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    _, rows, path, elapsed = future.result()
+                except Exception as e:
+                    print(f"FAILED {url}: {str(e)[:80]}")
+                    continue
+                results[url] = (rows, path)
+                print(f"{rows:5d} companies  {elapsed:6.1f}s  {url} -> {path}")
+    finally:
+        for browser in browsers + ([shared] if shared is not None else []):
+            browser.quit()
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('urls', nargs='*', help='listing URLs to crawl')
+    parser.add_argument('--url-file', help='file with one listing URL per line')
+    parser.add_argument('--fixtures', help='serve this directory locally and crawl every .html page in it')
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    parser.add_argument('--out-dir', default=OUTPUT_DIR)
+    parser.add_argument('--host-interval', type=float, default=HOST_INTERVAL,
+                        help='minimum seconds between requests (page loads and scrolls) to the same host')
+    parser.add_argument('--separate-browsers', action='store_true',
+                        help='one browser process per worker instead of tabs in one browser')
+    parser.add_argument('--archive', default=ARCHIVE_DIR, help='snapshot archive directory')
+    parser.add_argument('--no-archive', action='store_true',
+                        help='do not archive crawls; by default each tab\'s whole page is kept, which costs a '
+                             'full serialisation of the scrolled DOM once its listing ends')
+    parser.add_argument('--archive-blocks', action='store_true',
+                        help='archive every company block as it is read instead of the whole page')
+    parser.add_argument('--snapshots', default=SNAPSHOT_DIR, help='dated crawl snapshots for trend analysis')
+    parser.add_argument('--no-snapshot', action='store_true', help='do not add the crawled rows to the snapshots')
+    parser.add_argument('--checkpoints', default=CHECKPOINT_DIR, help='directory for crawl checkpoints')
+    parser.add_argument('--resume', action='store_true',
+                        help='skip finished listings and continue interrupted ones')
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.url_file:
+        urls += [line.strip() for line in Path(args.url_file).read_text().splitlines() if line.strip()]
+
+    server = None
+    if args.fixtures:
+        server, base_url = serve_fixtures(args.fixtures)
+        urls += [f"{base_url}/{p.name}" for p in sorted(Path(args.fixtures).glob('*.html'))]
+
+    if not urls:
+        parser.error('no listing URLs given')
+
+    started = time.monotonic()
+    try:
+        results = crawl(urls, workers=args.workers, out_dir=args.out_dir,
+                        host_interval=args.host_interval,
+                        separate_browsers=args.separate_browsers,
+                        archive=None if args.no_archive else SnapshotArchive(args.archive),
+                        checkpoints=args.checkpoints, resume=args.resume,
+                        snapshots=None if args.no_snapshot else args.snapshots,
+                        archive_blocks=args.archive_blocks)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    total = sum(rows for rows, _ in results.values())
+    print(f"\nCrawled {len(results)}/{len(urls)} listings, {total} companies "
+          f"in {time.monotonic() - started:.1f}s with {args.workers} workers")
+
+if __name__ == '__main__':
+    main()
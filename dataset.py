@@ -0,0 +1,160 @@
+"""Typed company dataset - Parquet alongside the compatibility CSV
+
+The CSV keeps every field as text. The Parquet copy stores funding as
+float64 USD, founded year and counts as nullable integers, and investors and
+team members as list<string>, so analysis reads only the columns it needs
+and never re-parses them. Its file metadata records when the data was last
+crawled (CRAWLED_AT_KEY), which is what company ages are counted up to.
+"""
+from datetime import datetime, time, timezone
+from pathlib import Path
+import pandas as pd
+
+from extract import FIELDS
+from features import funding_column
+
+DATASET_CSV = 'f6s_kazakhstan_companies.csv'
+CRAWLED_AT_KEY = b'crawled_at'
+
+TEXT_FIELDS = ('company_name', 'tagline', 'company_url', 'logo_url', 'location',
+               'funding_amount', 'description')
+LIST_FIELDS = ('investors', 'team_members')
+INT_FIELDS = {'founded_year': 'Int16', 'investor_count': 'Int16', 'team_count': 'Int16'}
+
+def parse_funding(value):
+    if pd.isna(value) or value == '':
+        return 0
+    value = str(value).upper().replace('$', '').replace(',', '').strip()
+    multiplier = 1
+    if 'K' in value:
+        multiplier = 1000
+        value = value.replace('K', '')
+    elif 'M' in value:
+        multiplier = 1000000
+        value = value.replace('M', '')
+    elif 'B' in value:
+        multiplier = 1000000000
+        value = value.replace('B', '')
+    try:
+        return float(value) * multiplier
+    except:
+        return 0
+
+def split_names(value):
+    """'A, B' -> ['A', 'B']"""
+    if pd.isna(value) or value == '':
+        return []
+    return [name.strip() for name in str(value).split(',') if name.strip()]
+
+def parquet_path(csv_path):
+    return Path(csv_path).with_suffix('.parquet')
+
+def to_typed(df):
+    """Convert an all-text company frame to typed columns"""
+    typed = pd.DataFrame(index=df.index)
+    for field in FIELDS:
+        raw = df[field].fillna('').astype(str) if field in df else pd.Series('', index=df.index)
+        if field in LIST_FIELDS:
+            typed[field] = raw.map(split_names)
+        elif field in INT_FIELDS:
+            typed[field] = pd.to_numeric(raw, errors='coerce').astype(INT_FIELDS[field])
+        else:
+            typed[field] = raw
+    funding = df['funding_amount'].fillna('').astype(str)
+    typed['funding_usd'] = funding_column(funding).where(funding != '')
+    return typed
+
+def _with_crawled_at(table, crawled_at=None):
+    crawled_at = crawled_at or datetime.now(timezone.utc)
+    return table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                          CRAWLED_AT_KEY: crawled_at.isoformat().encode()})
+
+def write_parquet(rows, csv_path=DATASET_CSV, crawled_at=None):
+    """Write the typed Parquet copy next to `csv_path`, stamped with the crawl time; returns its path or None"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pa_parquet
+    except ImportError:
+        print("pyarrow not installed - skipping Parquet output")
+        return None
+    path = parquet_path(csv_path)
+    df = to_typed(pd.DataFrame(list(rows), columns=FIELDS))
+    pa_parquet.write_table(_with_crawled_at(pa.Table.from_pandas(df, preserve_index=False), crawled_at), path)
+    return path
+
+def mark_crawled(csv_path=DATASET_CSV, crawled_at=None):
+    """Record a crawl that changed nothing: restamp the Parquet copy's crawl time"""
+    path = parquet_path(csv_path)
+    try:
+        import pyarrow.parquet as pa_parquet
+    except ImportError:
+        return None
+    if not path.exists():
+        return None
+    pa_parquet.write_table(_with_crawled_at(pa_parquet.read_table(path), crawled_at), path)
+    return path
+
+def load_dataset(path=DATASET_CSV, columns=None):
+    """Load typed company data, preferring the Parquet copy when it is current
+
+    Falls back to converting the CSV when the Parquet file is missing, older
+    than the CSV, or pyarrow is unavailable.
+    """
+    pq = parquet_path(path)
+    if pq.exists() and (not Path(path).exists() or pq.stat().st_mtime >= Path(path).stat().st_mtime):
+        try:
+            return pd.read_parquet(pq, columns=columns)
+        except ImportError:
+            pass
+    df = to_typed(pd.read_csv(path, dtype=str, keep_default_na=False))
+    return df[columns] if columns else df
+
+def iter_dataset(path=DATASET_CSV, columns=None, chunk_size=100000):
+    """Typed company data in frames of at most `chunk_size` rows, like load_dataset
+
+    Only one chunk is held in memory at a time.
+    """
+    pq = parquet_path(path)
+    if pq.exists() and (not Path(path).exists() or pq.stat().st_mtime >= Path(path).stat().st_mtime):
+        try:
+            import pyarrow.parquet as pa_parquet
+        except ImportError:
+            pa_parquet = None
+        if pa_parquet is not None:
+            start = 0
+            for batch in pa_parquet.ParquetFile(pq).iter_batches(batch_size=chunk_size, columns=columns):
+                df = batch.to_pandas()
+                df.index = pd.RangeIndex(start, start + len(df))
+                start += len(df)
+                yield df
+            return
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size):
+        df = to_typed(chunk)
+        yield df[columns] if columns else df
+
+def crawled_at(path=DATASET_CSV):
+    """When the dataset was last crawled, or None when nothing records it
+
+    Read from the Parquet copy's metadata (write_parquet, mark_crawled), which
+    holds even when a checkout leaves the CSV newer; datasets without one fall
+    back to the latest crawl in the snapshot store.
+    """
+    pq = parquet_path(path)
+    if pq.exists():
+        try:
+            import pyarrow.parquet as pa_parquet
+            stamp = (pa_parquet.read_schema(pq).metadata or {}).get(CRAWLED_AT_KEY)
+        except ImportError:
+            stamp = None
+        if stamp:
+            return datetime.fromisoformat(stamp.decode())
+
+    from snapshots import latest_partition
+    latest = latest_partition()
+    return datetime.combine(latest[0], time(), timezone.utc) if latest else None
+
+def filled(series):
+    """True where a typed column holds a value (non-empty text or list, non-null number)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.notna()
+    return series.map(len) > 0
@@ -0,0 +1,137 @@
+"""Incremental updates of the canonical company CSV keyed by company_url
+
+Each crawl is diffed against the stored dataset by hashing every company's
+extracted fields. Only added, changed and removed companies are written to a
+timestamped delta file under deltas/, which doubles as the change history.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import csv
+import hashlib
+import json
+
+from dataset import mark_crawled, write_parquet
+from extract import FIELDS
+
+DELTA_DIR = 'deltas'
+KEY = 'company_url'
+
+def row_hash(row):
+    """Stable hash of a company's extracted fields"""
+    values = [str(row.get(field, '') or '') for field in FIELDS]
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [{field: row.get(field, '') or '' for field in FIELDS} for row in csv.DictReader(f)]
+
+def write_rows(rows, path, extra=()):
+    columns = tuple(extra) + FIELDS
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator='\n', extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+
+def index_rows(rows):
+    """Map company_url -> row, keeping the first row for each URL"""
+    index = {}
+    for row in rows:
+        index.setdefault(row[KEY], row)
+    return index
+
+def diff_companies(previous, current):
+    """Return [(change, row)] with change in 'added', 'changed', 'removed'
+
+    `previous` and `current` map company_url -> row.
+    """
+    changes = []
+    for url, row in current.items():
+        old = previous.get(url)
+        if old is None:
+            changes.append(('added', row))
+        elif row_hash(old) != row_hash(row):
+            changes.append(('changed', row))
+    for url, row in previous.items():
+        if url not in current:
+            changes.append(('removed', row))
+    return changes
+
+def apply_changes(previous, changes):
+    """Apply a delta to `previous`, keeping existing order and appending new companies"""
+    updated = dict(previous)
+    for change, row in changes:
+        if change == 'removed':
+            updated.pop(row[KEY], None)
+        else:
+            updated[row[KEY]] = row
+    return updated
+
+def write_delta(changes, delta_dir=DELTA_DIR, crawled_at=None):
+    crawled_at = crawled_at or datetime.now(timezone.utc)
+    Path(delta_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(delta_dir) / f"{crawled_at:%Y%m%dT%H%M%SZ}.csv"
+    write_rows([dict(row, change=change) for change, row in changes], path, extra=('change',))
+    return path
+
+def update_store(companies, store_path, delta_dir=DELTA_DIR):
+    """Merge freshly crawled rows into the canonical CSV at `store_path`
+
+    Writes a delta file and rewrites the store only when something changed.
+    Returns the list of (change, row).
+    """
+    current = index_rows({field: row.get(field, '') or '' for field in FIELDS} for row in companies)
+    previous = index_rows(read_rows(store_path)) if Path(store_path).exists() else {}
+    changes = diff_companies(previous, current)
+
+    if not changes:
+        mark_crawled(store_path)
+        print(f"No changes since the last crawl - {store_path} left as is")
+        return changes
+
+    delta_path = write_delta(changes, delta_dir)
+    updated = apply_changes(previous, changes).values()
+    write_rows(updated, store_path)
+    write_parquet(updated, store_path)
+
+    counts = {kind: sum(change == kind for change, _ in changes) for kind in ('added', 'changed', 'removed')}
+    print(f"Updated {store_path}: {counts['added']} added, {counts['changed']} changed, "
+          f"{counts['removed']} removed (delta: {delta_path})")
+    return changes
+
+def unchanged_urls(companies, changes):
+    """company_urls of crawled rows that a delta from update_store() leaves as stored"""
+    touched = {row[KEY] for _, row in changes}
+    return {row.get(KEY) for row in companies if row.get(KEY)} - touched
+
+def history(company_url, delta_dir=DELTA_DIR):
+    """Yield (delta file, change, row) for one company across all deltas, oldest first"""
+    for path in sorted(Path(delta_dir).glob('*.csv')):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                if row[KEY] == company_url:
+                    yield path.name, row['change'], row
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--deltas', default=DELTA_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    apply = sub.add_parser('apply', help='merge a crawl CSV into the canonical store')
+    apply.add_argument('crawl_csv')
+    apply.add_argument('store_csv')
+
+    show = sub.add_parser('history', help='show the recorded changes for one company')
+    show.add_argument('company_url')
+
+    args = parser.parse_args()
+
+    if args.command == 'apply':
+        update_store(read_rows(args.crawl_csv), args.store_csv, args.deltas)
+    else:
+        for name, change, row in history(args.company_url, args.deltas):
+            print(f"{name}  {change:8s} funding={row['funding_amount'] or '-'} "
+                  f"investors={row['investor_count'] or '-'} team={row['team_count'] or '-'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Profile-page enrichment (experimental) - fetch each company_url and fill in the full investor and team lists
+
+Listing blocks cut investors and team members off at "and X more" and
+descriptions at 2000 characters. This stage visits the profile pages through
+a bounded asyncio worker queue sharing one connection pool, spaces requests
+per host, and caches responses on disk so re-runs only send conditional
+(ETag / Last-Modified) requests.
+
+Experimental: the profile selectors have not been checked against live F6S
+profile pages, only against fixtures.py's rendering of them. Enriched rows
+go to a separate CSV; writing them over the canonical dataset would make the
+next crawl's delta (delta.update_store) see every enriched company as changed
+and put the truncated listing values back.
+"""
+from bs4 import BeautifulSoup
+from pathlib import Path
+from urllib.parse import urlparse
+import aiohttp
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+
+from delta import read_rows, write_rows
+from extract import F6S_ROOT, clean_text
+
+CACHE_DIR = 'profile_cache'
+ENRICHED_SUFFIX = '_enriched'
+CONCURRENCY = 8
+HOST_INTERVAL = 0.5
+TIMEOUT = 30
+
+# Profile page selectors (CSS, via BeautifulSoup.select) - unverified against live pages
+INVESTOR_LINKS = 'div.profile-investors a'
+TEAM_LINKS = 'div.profile-team a'
+DESCRIPTION_PARAGRAPHS = 'div.profile-description p'
+
+class AsyncHostRateLimiter:
+    """Space out requests to the same host by at least `interval` seconds"""
+
+    def __init__(self, interval=HOST_INTERVAL):
+        self.interval = interval
+        self._next_slot = {}
+
+    async def wait(self, url):
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class ProfileCache:
+    """On-disk cache of profile responses with their validators"""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.html.gz"
+
+    def validators(self, url):
+        """Conditional request headers for a cached response"""
+        meta_path, _ = self._paths(url)
+        if not meta_path.exists():
+            return {}
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def get(self, url):
+        _, body_path = self._paths(url)
+        return gzip.decompress(body_path.read_bytes()).decode('utf-8')
+
+    def put(self, url, body, etag=None, last_modified=None):
+        meta_path, body_path = self._paths(url)
+        body_path.write_bytes(gzip.compress(body.encode('utf-8'), mtime=0))
+        meta_path.write_text(json.dumps({'url': url, 'etag': etag, 'last_modified': last_modified}),
+                             encoding='utf-8')
+
+def parse_profile(html):
+    """Full investor, team and description data from a company profile page"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    investors = []
+    for link in soup.select(INVESTOR_LINKS):
+        name = clean_text(link.get_text())
+        if name and len(name) >= 3 and name not in investors:
+            investors.append(name)
+
+    team = []
+    for link in soup.select(TEAM_LINKS):
+        name = clean_text(link.get_text())
+        if name and len(name) > 1 and name not in team:
+            team.append(name)
+
+    paragraphs = [clean_text(p.get_text()) for p in soup.select(DESCRIPTION_PARAGRAPHS)]
+    return {
+        'investors': investors,
+        'team_members': team,
+        'description': ' '.join(p for p in paragraphs if p),
+    }
+
+def merge_profile(row, profile):
+    """Fill a listing row with the complete lists from its profile page"""
+    row = dict(row)
+    if profile['investors']:
+        row['investors'] = ', '.join(profile['investors'])
+        row['investor_count'] = str(max(len(profile['investors']), int(row.get('investor_count') or 0)))
+    if profile['team_members']:
+        row['team_members'] = ', '.join(profile['team_members'])
+        row['team_count'] = str(max(len(profile['team_members']), int(row.get('team_count') or 0)))
+    if len(profile['description']) > len(row.get('description', '')):
+        row['description'] = profile['description']
+    return row
+
+async def fetch_profile(session, url, cache, limiter):
+    """Fetch a profile page, answering from the cache on 304 Not Modified"""
+    await limiter.wait(url)
+    async with session.get(url, headers=cache.validators(url)) as resp:
+        if resp.status == 304:
+            return cache.get(url), True
+        resp.raise_for_status()
+        body = await resp.text(encoding='utf-8', errors='replace')
+        cache.put(url, body, resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+        return body, False
+
+async def enrich_companies(rows, concurrency=CONCURRENCY, host_interval=HOST_INTERVAL,
+                           cache_dir=CACHE_DIR, base_url=None):
+    """Return `rows` with profile data merged in, in the original order
+
+    `base_url` replaces https://www.f6s.com in profile URLs, e.g. to point
+    the stage at a local fixture server.
+    """
+    cache = ProfileCache(cache_dir)
+    limiter = AsyncHostRateLimiter(host_interval)
+    queue = asyncio.Queue()
+    for i, row in enumerate(rows):
+        if row.get('company_url'):
+            queue.put_nowait(i)
+
+    enriched = list(rows)
+    stats = {'fetched': 0, 'not_modified': 0, 'failed': 0}
+
+    async def worker(session):
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            url = rows[i]['company_url']
+            if base_url and url.startswith(F6S_ROOT):
+                url = base_url.rstrip('/') + url[len(F6S_ROOT):]
+            try:
+                body, cached = await fetch_profile(session, url, cache, limiter)
+                enriched[i] = merge_profile(rows[i], parse_profile(body))
+                stats['not_modified' if cached else 'fetched'] += 1
+            except Exception as e:
+                stats['failed'] += 1
+                print(f"    Error {url}: {str(e)[:80]}")
+            finally:
+                queue.task_done()
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+
+    print(f"Profiles: {stats['fetched']} fetched, {stats['not_modified']} not modified, "
+          f"{stats['failed']} failed")
+    return enriched
+
+def enriched_path(path):
+    """Default output next to the listing CSV: companies.csv -> companies_enriched.csv"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}{ENRICHED_SUFFIX}{path.suffix}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog='Experimental: profile selectors are unverified against live F6S pages.')
+    parser.add_argument('input', help='company CSV from the listing crawl')
+    parser.add_argument('-o', '--output', help='enriched CSV (default: <input>_enriched.csv; never the input)')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--host-interval', type=float, default=HOST_INTERVAL)
+    parser.add_argument('--cache', default=CACHE_DIR)
+    parser.add_argument('--base-url', help='fetch profiles from this host instead of f6s.com')
+    args = parser.parse_args()
+    output = Path(args.output) if args.output else enriched_path(args.input)
+    if output.resolve() == Path(args.input).resolve():
+        parser.error('the output must differ from the input: the crawl deltas would revert enriched rows')
+
+    rows = read_rows(args.input)
+    started = time.monotonic()
+    enriched = asyncio.run(enrich_companies(rows, args.concurrency, args.host_interval,
+                                            args.cache, args.base_url))
+    write_rows(enriched, output)
+    print(f"Enriched {len(enriched)} companies in {time.monotonic() - started:.1f}s -> {output}")
+
+if __name__ == '__main__':
+    main()
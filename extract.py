@@ -0,0 +1,318 @@
+"""Company block extraction - BeautifulSoup backend and parser backend registry"""
+from bs4 import BeautifulSoup, Tag
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import os
+import re
+
+F6S_ROOT = 'https://www.f6s.com'
+BACKENDS = ('bs4', 'lxml')
+CHUNK_SIZE = 250
+
+# Page sections extract_company_data() looks for; a section whose selector
+# matches nothing in a block is counted as a miss
+SECTIONS = ('name', 'tagline', 'location', 'founded', 'funding', 'team', 'description')
+
+FIELDS = (
+    'company_name',
+    'tagline',
+    'company_url',
+    'logo_url',
+    'location',
+    'founded_year',
+    'funding_amount',
+    'investors',
+    'investor_count',
+    'team_members',
+    'team_count',
+    'description',
+)
+
+WHITESPACE = re.compile(r'\s+')
+FOUNDED = re.compile(r'Founded\s+(\d{4})')
+FUNDING_AMOUNT = re.compile(r'\$[\d.]+[kmb]?', re.I)
+AND_MORE = re.compile(r'and\s+(\d+)\s+more')
+INVESTOR_NOISE = ('see', 'all', 'investor', 'more')
+
+# Elements extract_company_data() reads, as (tag, class) - BeautifulSoup's class_=
+# semantics: a single class matches any element carrying it, a space-separated
+# value must equal the whole class attribute
+NAME = ('h2', 'company-entry-title')
+TAGLINE = ('h3', 'mt4 mb8')
+LOGO = ('img', 'f6s-thumbnail')
+LOCATION_DIVS = ('div', 'centered-content g8')
+FOUNDED_PARAS = ('p', 'centered-content g8 mt8')
+FUNDING_DIVS = ('div', 'centered-content mt8')
+TEAM_WRAPPER = ('div', 'collection-team-summary-wrapper mb16')
+DESCRIPTION = ('div', 'profile-description mb16')
+SINGLE_CLASSES = {NAME, LOGO}
+WHOLE_CLASSES = {TAGLINE, LOCATION_DIVS, FOUNDED_PARAS, FUNDING_DIVS, TEAM_WRAPPER, DESCRIPTION}
+
+def clean_text(text):
+    if not text:
+        return ""
+    return WHITESPACE.sub(' ', text.strip())
+
+def index_block(block):
+    """Walk a block once and group the elements extract_company_data() reads by selector, in page order"""
+    found = {}
+    for node in block.descendants:
+        if not isinstance(node, Tag):
+            continue
+        classes = node.get('class')
+        if not classes:
+            continue
+        key = (node.name, ' '.join(classes))
+        if key in WHOLE_CLASSES:
+            found.setdefault(key, []).append(node)
+        for key in SINGLE_CLASSES:
+            if node.name == key[0] and key[1] in classes:
+                found.setdefault(key, []).append(node)
+    return found
+
+def _icon(node):
+    """xlink:href of the first <use> inside the first <svg> under `node`"""
+    svg = node.find('svg')
+    if svg:
+        use = svg.find('use')
+        if use:
+            return use.get('xlink:href')
+    return None
+
+def extract_company_data(block, misses=None):
+    """Extract all available data from company block
+
+    `misses` (a Counter) collects the SECTIONS not found in the block and
+    extraction errors under 'error'.
+    """
+    data = dict.fromkeys(FIELDS, '')
+    misses = Counter() if misses is None else misses
+
+    try:
+        found = index_block(block)
+        first = lambda key: found[key][0] if key in found else None
+
+        # Company Name & URL
+        name_elem = first(NAME)
+        if name_elem:
+            link = name_elem.find('a')
+            if link:
+                data['company_name'] = clean_text(link.get_text())
+                href = link.get('href', '')
+                if href:
+                    data['company_url'] = f"{F6S_ROOT}{href}" if href.startswith('/') else href
+        else:
+            misses['name'] += 1
+
+        # Tagline
+        tagline = first(TAGLINE)
+        if tagline:
+            data['tagline'] = clean_text(tagline.get_text())
+        else:
+            misses['tagline'] += 1
+
+        # Logo
+        logo_img = first(LOGO)
+        if logo_img and logo_img.get('src'):
+            data['logo_url'] = logo_img.get('src')
+
+        # Location - must have location icon
+        for div in found.get(LOCATION_DIVS, ()):
+            if _icon(div) == '#location':
+                data['location'] = clean_text(div.get_text())
+                break
+        else:
+            misses['location'] += 1
+
+        # Founded Year - must have clock icon
+        for p in found.get(FOUNDED_PARAS, ()):
+            if _icon(p) == '#clock':
+                match = FOUNDED.search(p.get_text())
+                if match:
+                    data['founded_year'] = match.group(1)
+                    break
+        else:
+            misses['founded'] += 1
+
+        # Funding & Investors - must have trend icon
+        for div in found.get(FUNDING_DIVS, ()):
+            if _icon(div) != '#trend':
+                continue
+            content = div.find('div', class_='overview-line-content ml8')
+            if content:
+                text = content.get_text()
+
+                # Extract funding amount
+                amount_match = FUNDING_AMOUNT.search(text)
+                if amount_match:
+                    data['funding_amount'] = amount_match.group(0)
+
+                # Extract investor names - SKIP LINKS WITH IMAGES
+                investor_names = {}  # insertion-ordered set
+                for link in content.find_all('a', target='_blank'):
+                    if link.find('img'):
+                        continue
+
+                    # Skip empty, "See all", etc
+                    name = clean_text(link.get_text())
+                    if not name or len(name) < 3:
+                        continue
+                    lowered = name.lower()
+                    if any(x in lowered for x in INVESTOR_NOISE):
+                        continue
+
+                    # Add unique investors only
+                    if name not in investor_names:
+                        investor_names[name] = None
+
+                if investor_names:
+                    data['investors'] = ', '.join(investor_names)
+
+                # Get total investor count from "and X more"
+                more_match = AND_MORE.search(text)
+                if more_match:
+                    data['investor_count'] = str(len(investor_names) + int(more_match.group(1)))
+                elif investor_names:
+                    data['investor_count'] = str(len(investor_names))
+                else:
+                    data['investor_count'] = '0'
+
+            break
+        else:
+            misses['funding'] += 1
+
+        # Team Members
+        team_wrapper = first(TEAM_WRAPPER)
+        if team_wrapper:
+            team_links = team_wrapper.find_all('a', class_='accent hand')
+            team_names = {}  # insertion-ordered set
+
+            for link in team_links:
+                name = clean_text(link.get_text())
+                if name and len(name) > 1 and name not in team_names:
+                    team_names[name] = None
+
+            if team_names:
+                data['team_members'] = ', '.join(team_names)
+
+            # Check for "and X more" in team section
+            more_team = AND_MORE.search(team_wrapper.get_text())
+            if more_team:
+                data['team_count'] = str(len(team_names) + int(more_team.group(1)))
+            elif team_names:
+                data['team_count'] = str(len(team_names))
+            else:
+                data['team_count'] = '0'
+        else:
+            data['team_count'] = '0'
+            misses['team'] += 1
+
+        # Description
+        desc_div = first(DESCRIPTION)
+        if desc_div:
+            inner_div = desc_div.find('div', class_='break-word')
+            if inner_div:
+                # Remove buttons
+                for button in inner_div.find_all('button'):
+                    button.decompose()
+
+                desc_parts = [clean_text(p.get_text()) for p in inner_div.find_all('p')]
+                data['description'] = ' '.join(part for part in desc_parts if part)[:2000]
+        else:
+            misses['description'] += 1
+
+    except Exception as e:
+        misses['error'] += 1
+        print(f"    Error extracting {data['company_name'] or 'company block'}: {type(e).__name__}: {e}")
+
+    return data
+
+def find_blocks(html):
+    """Return every company block in a page or fragment"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.find_all('div', class_='company-block')
+
+def get_backend(name='bs4'):
+    """Return (find_blocks, extract_company_data) for a parser backend
+
+    Every backend returns identical dicts for the same markup.
+    """
+    if name == 'bs4':
+        return find_blocks, extract_company_data
+    if name == 'lxml':
+        import extract_lxml
+        return extract_lxml.find_blocks, extract_lxml.extract_company_data
+    raise ValueError(f"Unknown parser backend {name!r}, expected one of {BACKENDS}")
+
+def extract_companies(html, backend='bs4'):
+    """Yield extracted rows for every company block in `html`"""
+    find, extract = get_backend(backend)
+    for block in find(html):
+        yield extract(block)
+
+def split_blocks(html):
+    """Cut a page into the markup of each company block, in page order
+
+    Always parsed with lxml whatever the extraction backend: this runs
+    serially in the parent, and a full BeautifulSoup parse of the page here
+    would cost more than the parallel extraction it feeds.
+    """
+    import extract_lxml
+    from lxml import etree
+
+    return [etree.tostring(block, encoding='unicode', method='html', with_tail=False)
+            for block in extract_lxml.find_blocks(html)]
+
+def extract_chunk(chunk, backend='bs4'):
+    """Extract rows from a list of block markup strings (runs in worker processes)"""
+    find, extract = get_backend(backend)
+    rows = []
+    for markup in chunk:
+        blocks = find(markup)
+        rows.append(extract(blocks[0]) if blocks else None)
+    return rows
+
+def extract_snapshots(paths, workers=None, backend='bs4', chunk_size=CHUNK_SIZE):
+    """Extract companies from saved HTML snapshots across a process pool
+
+    Blocks are split out in the parent with lxml, parsed by `backend` in
+    chunks across `workers` processes and merged back in snapshot and page
+    order, so the output is the same for any worker count. On well-formed
+    pages the rows match whole-page extraction; where unclosed tags nest one
+    block inside another they can differ, as each block is parsed on its own
+    copy here while whole-page extraction decomposes buttons in nested blocks
+    it has already read.
+    """
+    workers = workers or os.cpu_count()
+    companies = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            blocks = split_blocks(Path(path).read_text(encoding='utf-8'))
+            chunks = [blocks[i:i + chunk_size] for i in range(0, len(blocks), chunk_size)]
+            found = 0
+            for rows in pool.map(extract_chunk, chunks, [backend] * len(chunks)):
+                found += len(rows)
+                companies.extend(row for row in rows if row and row['company_name'])
+            print(f"{path}: {found} blocks")
+    return companies
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract companies from saved listing HTML snapshots')
+    parser.add_argument('snapshots', nargs='+', help='saved listing HTML files')
+    parser.add_argument('-o', '--output', default='extracted_companies.csv')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--backend', choices=BACKENDS, default='bs4')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    companies = extract_snapshots(args.snapshots, workers=args.workers,
+                                  backend=args.backend, chunk_size=args.chunk_size)
+    pd.DataFrame(companies, columns=FIELDS).to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"Saved {len(companies)} companies to {args.output}")
+
+if __name__ == '__main__':
+    main()
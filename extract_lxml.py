@@ -0,0 +1,204 @@
+"""Company block extraction - lxml backend with precompiled XPath selectors
+
+Mirrors extract.extract_company_data field for field: the block-level
+sections come from one walk over the block (index_block) and the lookups
+inside a section are precompiled XPath. Class selectors follow
+BeautifulSoup's `class_=` semantics: a single class matches any element
+carrying it, a space-separated value must equal the whole class attribute.
+"""
+from collections import Counter
+from lxml import etree, html as lxml_html
+
+from extract import (AND_MORE, DESCRIPTION, FIELDS, FOUNDED, FOUNDED_PARAS, FUNDING_AMOUNT, FUNDING_DIVS,
+                     INVESTOR_NOISE, LOCATION_DIVS, LOGO, NAME, SINGLE_CLASSES, TAGLINE, TEAM_WRAPPER,
+                     WHOLE_CLASSES, clean_text)
+
+def _class(name):
+    if ' ' in name:
+        return f"normalize-space(@class)='{name}'"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+def _xpath(tag, class_name=None, first=False):
+    path = f".//{tag}[{_class(class_name)}]" if class_name else f".//{tag}"
+    return etree.XPath(f"({path})[1]" if first else path)
+
+BLOCKS = etree.XPath(f"//div[{_class('company-block')}]")
+
+FUNDING_CONTENT = _xpath('div', 'overview-line-content ml8', first=True)
+TEAM_LINKS = _xpath('a', 'accent hand')
+BREAK_WORD = _xpath('div', 'break-word', first=True)
+
+FIRST_LINK = _xpath('a', first=True)
+FIRST_SVG = _xpath('svg', first=True)
+FIRST_USE = _xpath('use', first=True)
+FIRST_IMG = _xpath('img', first=True)
+BLANK_LINKS = etree.XPath(".//a[@target='_blank']")
+BUTTONS = _xpath('button')
+PARAGRAPHS = _xpath('p')
+
+def _first(xpath, node):
+    found = xpath(node)
+    return found[0] if found else None
+
+def _icon(node):
+    """xlink:href of the first <use> inside the first <svg> under `node`"""
+    svg = _first(FIRST_SVG, node)
+    if svg is None:
+        return None
+    use = _first(FIRST_USE, svg)
+    if use is None:
+        return None
+    return use.get('xlink:href')
+
+def index_block(block):
+    """Walk a block once and group the elements extract_company_data() reads by selector, in page order"""
+    found = {}
+    for el in block.iterdescendants(etree.Element):
+        classes = el.get('class')
+        if not classes:
+            continue
+        classes = classes.split()
+        key = (el.tag, ' '.join(classes))
+        if key in WHOLE_CLASSES:
+            found.setdefault(key, []).append(el)
+        for key in SINGLE_CLASSES:
+            if el.tag == key[0] and key[1] in classes:
+                found.setdefault(key, []).append(el)
+    return found
+
+def find_blocks(html):
+    """Return every company block in a page or fragment"""
+    return BLOCKS(lxml_html.fromstring(html))
+
+def extract_company_data(block, misses=None):
+    """Extract all available data from company block; see extract.extract_company_data for `misses`"""
+    data = dict.fromkeys(FIELDS, '')
+    misses = Counter() if misses is None else misses
+
+    try:
+        found = index_block(block)
+        first = lambda key: found[key][0] if key in found else None
+
+        # Company Name & URL
+        name_elem = first(NAME)
+        if name_elem is not None:
+            link = _first(FIRST_LINK, name_elem)
+            if link is not None:
+                data['company_name'] = clean_text(link.text_content())
+                href = link.get('href', '')
+                if href:
+                    data['company_url'] = f"https://www.f6s.com{href}" if href.startswith('/') else href
+        else:
+            misses['name'] += 1
+
+        # Tagline
+        tagline = first(TAGLINE)
+        if tagline is not None:
+            data['tagline'] = clean_text(tagline.text_content())
+        else:
+            misses['tagline'] += 1
+
+        # Logo
+        logo_img = first(LOGO)
+        if logo_img is not None and logo_img.get('src'):
+            data['logo_url'] = logo_img.get('src')
+
+        # Location - must have location icon
+        for div in found.get(LOCATION_DIVS, ()):
+            if _icon(div) == '#location':
+                data['location'] = clean_text(div.text_content())
+                break
+        else:
+            misses['location'] += 1
+
+        # Founded Year - must have clock icon
+        for p in found.get(FOUNDED_PARAS, ()):
+            if _icon(p) == '#clock':
+                match = FOUNDED.search(p.text_content())
+                if match:
+                    data['founded_year'] = match.group(1)
+                    break
+        else:
+            misses['founded'] += 1
+
+        # Funding & Investors - must have trend icon
+        for div in found.get(FUNDING_DIVS, ()):
+            if _icon(div) != '#trend':
+                continue
+            content = _first(FUNDING_CONTENT, div)
+            if content is not None:
+                text = content.text_content()
+
+                amount_match = FUNDING_AMOUNT.search(text)
+                if amount_match:
+                    data['funding_amount'] = amount_match.group(0)
+
+                investor_names = {}  # insertion-ordered set
+                for link in BLANK_LINKS(content):
+                    if _first(FIRST_IMG, link) is not None:
+                        continue
+                    name = clean_text(link.text_content())
+                    if not name or len(name) < 3:
+                        continue
+                    lowered = name.lower()
+                    if any(x in lowered for x in INVESTOR_NOISE):
+                        continue
+                    if name not in investor_names:
+                        investor_names[name] = None
+
+                if investor_names:
+                    data['investors'] = ', '.join(investor_names)
+
+                more_match = AND_MORE.search(text)
+                if more_match:
+                    data['investor_count'] = str(len(investor_names) + int(more_match.group(1)))
+                elif investor_names:
+                    data['investor_count'] = str(len(investor_names))
+                else:
+                    data['investor_count'] = '0'
+
+            break
+        else:
+            misses['funding'] += 1
+
+        # Team Members
+        team_wrapper = first(TEAM_WRAPPER)
+        if team_wrapper is not None:
+            team_names = {}  # insertion-ordered set
+            for link in TEAM_LINKS(team_wrapper):
+                name = clean_text(link.text_content())
+                if name and len(name) > 1 and name not in team_names:
+                    team_names[name] = None
+
+            if team_names:
+                data['team_members'] = ', '.join(team_names)
+
+            more_team = AND_MORE.search(team_wrapper.text_content())
+            if more_team:
+                data['team_count'] = str(len(team_names) + int(more_team.group(1)))
+            elif team_names:
+                data['team_count'] = str(len(team_names))
+            else:
+                data['team_count'] = '0'
+        else:
+            data['team_count'] = '0'
+            misses['team'] += 1
+
+        # Description
+        desc_div = first(DESCRIPTION)
+        if desc_div is not None:
+            inner_div = _first(BREAK_WORD, desc_div)
+            if inner_div is not None:
+                for button in BUTTONS(inner_div):
+                    button.drop_tree()
+
+                desc_parts = [clean_text(p.text_content()) for p in PARAGRAPHS(inner_div)]
+                data['description'] = ' '.join(part for part in desc_parts if part)[:2000]
+        else:
+            misses['description'] += 1
+
+    except Exception as e:
+        misses['error'] += 1
+        print(f"    Error extracting {data['company_name'] or 'company block'}: {type(e).__name__}: {e}")
+
+    return data
@@ -0,0 +1,91 @@
+"""Feature engineering for the company table - vectorized column transforms
+
+Each column transform has a scalar reference implementation next to it; the
+vectorized versions return the same values for the data the extractor
+produces and are what the analysis uses.
+"""
+import numpy as np
+import pandas as pd
+import re
+
+# Checked in order, first match wins
+INDUSTRY_KEYWORDS = {
+    'AI & Machine Learning': ['ai', 'artificial intelligence', 'machine learning', 'ml', 'neural'],
+    'FinTech': ['fintech', 'payment', 'banking', 'neobank', 'financial', 'investment', 'credit'],
+    'SaaS & Enterprise Software': ['saas', 'software', 'platform', 'cloud', 'crm'],
+    'Gaming': ['game', 'gaming', 'mobile game'],
+    'Blockchain & Web3': ['blockchain', 'web3', 'crypto', 'bitcoin'],
+    'HealthTech': ['health', 'medical', 'healthcare', 'diagnostic'],
+    'Clean Energy': ['energy', 'solar', 'wind', 'renewable'],
+    'E-commerce': ['ecommerce', 'e-commerce', 'marketplace', 'retail'],
+    'EdTech': ['education', 'learning', 'school', 'course'],
+}
+
+MULTIPLIERS = (('K', 1000), ('M', 1000000), ('B', 1000000000))
+
+# Extract cities from location
+def extract_city(location):
+    if pd.isna(location) or location == '':
+        return 'Unknown'
+    # Take first part before comma
+    city = location.split(',')[0].strip()
+    return city
+
+# Categorize by industry based on description and tagline
+def categorize_industry(row):
+    text = str(row['description']) + ' ' + str(row['tagline'])
+    text = text.lower()
+    for industry, words in INDUSTRY_KEYWORDS.items():
+        if any(word in text for word in words):
+            return industry
+    return 'Other'
+
+def per_unique(func):
+    """Run a column transform once per distinct value and broadcast the result
+
+    Funding strings, locations and descriptions repeat heavily across crawls
+    and countries, so factorizing first keeps the string work proportional to
+    the number of distinct values rather than rows.
+    """
+    def wrapper(column):
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        values = func(pd.Series(uniques, dtype=object)).to_numpy()
+        return pd.Series(values[codes], index=column.index)
+    wrapper.__doc__ = func.__doc__
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+@per_unique
+def funding_column(amounts):
+    """Vectorized dataset.parse_funding: '$1.5M' -> 1500000.0, blank or unparseable -> 0"""
+    value = (amounts.fillna('').astype(str).str.upper()
+             .str.replace('$', '', regex=False).str.replace(',', '', regex=False).str.strip())
+    multiplier = pd.Series(1.0, index=amounts.index)
+    unmatched = pd.Series(True, index=amounts.index)
+    for suffix, factor in MULTIPLIERS:
+        has_suffix = unmatched & value.str.contains(suffix, regex=False)
+        value = value.mask(has_suffix, value.str.replace(suffix, '', regex=False).str.strip())
+        multiplier = multiplier.mask(has_suffix, factor)
+        unmatched &= ~has_suffix
+    return (pd.to_numeric(value, errors='coerce') * multiplier).fillna(0.0)
+
+@per_unique
+def city_column(locations):
+    """Vectorized extract_city"""
+    missing = locations.isna() | (locations == '')
+    city = locations.fillna('').astype(str).str.split(',', n=1).str[0].str.strip()
+    return city.mask(missing, 'Unknown')
+
+def industry_text(df):
+    return (df['description'].fillna('').astype(str) + ' ' + df['tagline'].fillna('').astype(str)).str.lower()
+
+@per_unique
+def _industry_of_text(text):
+    conditions = [text.str.contains('|'.join(map(re.escape, words)), regex=True).to_numpy()
+                  for words in INDUSTRY_KEYWORDS.values()]
+    labels = np.select(conditions, list(INDUSTRY_KEYWORDS), default='Other')
+    return pd.Series(labels, index=text.index, dtype=object)
+
+def industry_column(df):
+    """Vectorized categorize_industry over a frame with description and tagline"""
+    return _industry_of_text(industry_text(df))
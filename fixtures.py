@@ -0,0 +1,206 @@
+"""Offline F6S listing fixtures - render saved rows as listing HTML and serve them locally"""
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from pathlib import Path
+import argparse
+import csv
+import json
+import threading
+
+from extract import F6S_ROOT
+
+PAGE_SIZE = 20
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div class="companies-list">
+{blocks}
+</div>
+</body>
+</html>
+"""
+
+def _icon(name):
+    return f'<svg class="icon"><use xlink:href="#{name}"></use></svg>'
+
+def _more(total, shown):
+    try:
+        extra = int(total or 0) - shown
+    except ValueError:
+        return ''
+    return f' and {extra} more' if extra > 0 else ''
+
+def render_block(row):
+    """Render one scraped row back into company-block markup the extractor understands"""
+    parts = ['<div class="company-block">']
+
+    if row.get('logo_url'):
+        parts.append(f'<img class="f6s-thumbnail" src="{escape(row["logo_url"])}">')
+
+    href = row.get('company_url', '')
+    if href.startswith(F6S_ROOT):
+        href = href[len(F6S_ROOT):]
+    parts.append(f'<h2 class="company-entry-title"><a href="{escape(href)}">'
+                 f'{escape(row.get("company_name", ""))}</a></h2>')
+
+    if row.get('tagline'):
+        parts.append(f'<h3 class="mt4 mb8">{escape(row["tagline"])}</h3>')
+
+    if row.get('location'):
+        parts.append(f'<div class="centered-content g8">{_icon("location")}'
+                     f'<span>{escape(row["location"])}</span></div>')
+
+    if row.get('founded_year'):
+        parts.append(f'<p class="centered-content g8 mt8">{_icon("clock")}'
+                     f'<span>Founded {escape(str(row["founded_year"]))}</span></p>')
+
+    investors = [name for name in row.get('investors', '').split(', ') if name]
+    if row.get('funding_amount') or investors or row.get('investor_count'):
+        content = []
+        if row.get('funding_amount'):
+            content.append(f'Raised {escape(row["funding_amount"])}')
+        if investors:
+            links = ', '.join(f'<a href="#" target="_blank">{escape(name)}</a>' for name in investors)
+            content.append(f'from {links}{_more(row.get("investor_count"), len(investors))}')
+        parts.append(f'<div class="centered-content mt8">{_icon("trend")}'
+                     f'<div class="overview-line-content ml8">{" ".join(content)}</div></div>')
+
+    team = [name for name in row.get('team_members', '').split(', ') if name]
+    if team:
+        links = ', '.join(f'<a class="accent hand">{escape(name)}</a>' for name in team)
+        parts.append(f'<div class="collection-team-summary-wrapper mb16">{links}'
+                     f'{_more(row.get("team_count"), len(team))}</div>')
+
+    if row.get('description'):
+        parts.append('<div class="profile-description mb16"><div class="break-word">'
+                     f'<p>{escape(row["description"])}</p><button>Read more</button></div></div>')
+
+    parts.append('</div>')
+    return ''.join(parts)
+
+def render_listing(rows, title='F6S companies'):
+    """Render a full listing page containing one block per row"""
+    blocks = '\n'.join(render_block(row) for row in rows)
+    return PAGE_TEMPLATE.format(title=escape(title), blocks=blocks)
+
+def render_pages(rows, out_dir, page_size=PAGE_SIZE, kind='json'):
+    """Write a paginated listing the way the infinite scroll serves it
+
+    index.html holds the first `page_size` companies; the rest come from
+    api/page-<n>.json ({"html": <blocks>, "page": n, "has_more": ...}) or
+    api/page-<n>.html, ending with an empty page. Returns the http_fetch
+    endpoint spec, relative to index.html.
+    """
+    out_dir = Path(out_dir)
+    (out_dir / 'api').mkdir(parents=True, exist_ok=True)
+    rows = list(rows)
+    pages = [rows[i:i + page_size] for i in range(0, len(rows), page_size)] or [[]]
+    (out_dir / 'index.html').write_text(render_listing(pages[0]), encoding='utf-8')
+    for number, page in enumerate(pages[1:] + [[]], 2):
+        blocks = '\n'.join(render_block(row) for row in page)
+        if kind == 'json':
+            body = json.dumps({'html': blocks, 'page': number, 'has_more': number < len(pages)})
+        else:
+            body = blocks
+        (out_dir / 'api' / f'page-{number}.{kind}').write_text(body, encoding='utf-8')
+    spec = {'url': f'api/page-{{page}}.{kind}', 'start': 2, 'step': 1, 'kind': kind, 'first_page': True}
+    if kind == 'json':
+        spec['html_field'] = 'html'
+    return spec
+
+PROFILE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{name}</title></head>
+<body>
+<h1>{name}</h1>
+<div class="profile-description"><p>{description}</p></div>
+<div class="profile-investors">{investors}</div>
+<div class="profile-team">{team}</div>
+</body>
+</html>
+"""
+
+def render_profile(row):
+    """Render a company profile page listing every investor and team member"""
+    investors = [name for name in row.get('investors', '').split(', ') if name]
+    team = [name for name in row.get('team_members', '').split(', ') if name]
+    return PROFILE_TEMPLATE.format(
+        name=escape(row.get('company_name', '')),
+        description=escape(row.get('description', '')),
+        investors=''.join(f'<a href="#">{escape(name)}</a>' for name in investors),
+        team=''.join(f'<a href="#">{escape(name)}</a>' for name in team),
+    )
+
+def load_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f))
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve_fixtures(directory, port=0):
+    """Serve `directory` over HTTP on localhost from a background thread
+
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    handler = partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    render = sub.add_parser('render', help='render a scraped CSV as a listing page')
+    render.add_argument('csv')
+    render.add_argument('out')
+
+    profiles = sub.add_parser('profiles', help='render a profile page per company under company/<slug>/')
+    profiles.add_argument('csv')
+    profiles.add_argument('out_dir')
+
+    pages = sub.add_parser('pages', help='render a scraped CSV as a paginated listing for http_fetch')
+    pages.add_argument('csv')
+    pages.add_argument('out_dir')
+    pages.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    pages.add_argument('--kind', choices=['json', 'html'], default='json')
+
+    serve = sub.add_parser('serve', help='serve a directory of fixture pages')
+    serve.add_argument('directory')
+    serve.add_argument('--port', type=int, default=8765)
+
+    args = parser.parse_args()
+
+    if args.command == 'render':
+        rows = load_rows(args.csv)
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(render_listing(rows, title=Path(args.csv).stem), encoding='utf-8')
+        print(f"Rendered {len(rows)} companies to {args.out}")
+    elif args.command == 'profiles':
+        rows = [row for row in load_rows(args.csv) if row.get('company_url', '').startswith(F6S_ROOT)]
+        for row in rows:
+            path = Path(args.out_dir) / row['company_url'][len(F6S_ROOT):].strip('/') / 'index.html'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(render_profile(row), encoding='utf-8')
+        print(f"Rendered {len(rows)} profile pages under {args.out_dir}")
+    elif args.command == 'pages':
+        rows = load_rows(args.csv)
+        spec = render_pages(rows, args.out_dir, page_size=args.page_size, kind=args.kind)
+        Path(args.out_dir, 'endpoint.json').write_text(json.dumps(spec, indent=2) + '\n', encoding='utf-8')
+        print(f"Rendered {len(rows)} companies as {args.kind} pages under {args.out_dir} (endpoint.json)")
+    else:
+        server, base_url = serve_fixtures(args.directory, args.port)
+        print(f"Serving {args.directory} at {base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""HTTP fetch backend - request the listing's pagination endpoint directly
+
+The infinite scroll loads further companies from an XHR endpoint. Once that
+endpoint is known, listings are fetched with a pooled requests.Session
+instead of a Chromium per run and every response goes through the same
+extractor as the browser path. `discover` watches the browser's network
+traffic once to find the endpoint and records it in endpoints.json:
+
+    {"<listing url>": {"url": "<template with {page}>", "start": 2, "step": 1,
+                       "kind": "html" | "json", "html_field": "<dotted path>",
+                       "first_page": true}}
+
+kind "html" responses are listing markup; kind "json" responses carry the
+markup in `html_field`, or, with "items" and "fields", a list of company
+objects mapped field by field. Relative endpoint URLs resolve against the
+listing URL. scraper.py falls back to the browser when no endpoint is known
+or the HTTP path fails.
+"""
+from collections import Counter
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, urljoin, urlparse
+import argparse
+import json
+import time
+
+from extract import FIELDS, get_backend, split_blocks
+
+ENDPOINTS_PATH = 'endpoints.json'
+POOL_SIZE = 8
+RETRIES = 3
+TIMEOUT = 30
+MAX_PAGES = 1000
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/124.0 Safari/537.36')
+
+def make_session(pool_size=POOL_SIZE, retries=RETRIES):
+    """requests.Session with a keep-alive connection pool and retries on 429/5xx"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(total=retries, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=('GET',), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'X-Requested-With': 'XMLHttpRequest'})
+    return session
+
+def load_endpoints(path=ENDPOINTS_PATH):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_endpoint(listing_url, spec, path=ENDPOINTS_PATH):
+    endpoints = load_endpoints(path)
+    endpoints[listing_url] = spec
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(endpoints, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+def lookup(payload, path):
+    """Follow a dotted path ('data.html', 'items.0.name') into decoded JSON"""
+    for key in path.split('.') if path else ():
+        if payload is None:
+            return None
+        payload = payload[int(key)] if isinstance(payload, list) else payload.get(key)
+    return payload
+
+def json_rows(payload, spec):
+    """Company rows from a JSON response listing company objects"""
+    rows = []
+    for item in lookup(payload, spec['items']) or []:
+        row = dict.fromkeys(FIELDS, '')
+        for field, path in spec['fields'].items():
+            value = lookup(item, path)
+            if isinstance(value, list):
+                value = ', '.join(str(v) for v in value)
+            row[field] = '' if value is None else str(value)
+        rows.append(row)
+    return rows
+
+def page_url(listing_url, spec, page):
+    return urljoin(listing_url, spec['url'].format(page=page))
+
+def iter_companies_http(session, listing_url, spec, backend='bs4', on_block=None, metrics=None,
+                        start=0, start_page=0, on_batch=None, on_page=None, max_pages=MAX_PAGES):
+    """Fetch the listing page by page and yield (index, row) like scraper.iter_companies
+
+    Stops at the first page without companies or without any company not
+    already seen. `start_page` pages (the listing page counts as one when
+    `first_page` is set) are skipped when resuming; `on_batch(seen, pages,
+    last_url)` runs after every page and `on_page(url, text)` gets every
+    response body.
+    """
+    from metrics import RunMetrics
+
+    find_blocks, extract_company_data = get_backend(backend)
+    metrics = metrics or RunMetrics()
+    urls = [listing_url] if spec.get('first_page', True) else []
+    urls += [page_url(listing_url, spec, spec.get('start', 1) + i * spec.get('step', 1)) for i in range(max_pages)]
+    seen = start
+    seen_urls = set()
+    last_url = None
+
+    for pages, url in enumerate(urls, 1):
+        if pages <= start_page:
+            continue
+        with metrics.phase('http_get'):
+            response = session.get(url, timeout=TIMEOUT)
+            response.raise_for_status()
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            # requests assumes ISO-8859-1 for text/*; HTML5 and JSON default to UTF-8
+            response.encoding = 'utf-8'
+        metrics.count('http_requests')
+        metrics.count('http_bytes', len(response.content))
+        if on_page:
+            on_page(url, response.text)
+
+        rows, markup = None, response.text
+        if url != listing_url and spec.get('kind', 'html') == 'json':
+            payload = response.json()
+            if spec.get('items'):
+                rows = json_rows(payload, spec)
+            else:
+                markup = lookup(payload, spec['html_field']) or ''
+
+        if rows is None:
+            with metrics.phase('parse'):
+                blocks = find_blocks(markup) if markup else []
+            if on_block:
+                for block_markup in split_blocks(markup):
+                    on_block(block_markup)
+            rows = []
+            for block in blocks:
+                with metrics.phase('extract'):
+                    rows.append(extract_company_data(block, metrics.misses))
+
+        new = [row for row in rows if row['company_url'] not in seen_urls]
+        if not new:
+            break
+        for row in rows:
+            seen += 1
+            metrics.count('blocks_found')
+            seen_urls.add(row['company_url'])
+            last_url = row['company_url']
+            if row['company_name']:
+                metrics.keep(row)
+                yield seen, row
+            else:
+                metrics.count('rows_dropped')
+        if on_batch:
+            on_batch(seen, pages, last_url)
+
+# Query parameters that usually carry the page position, and the page size for offset-style ones
+PAGINATION_PARAMS = ('page', 'p', 'pageNumber', 'page_num', 'offset', 'start', 'skip', 'from')
+OFFSET_PARAMS = ('offset', 'start', 'skip', 'from')
+SIZE_PARAMS = ('limit', 'per_page', 'perPage', 'size', 'count', 'page_size')
+
+def infer_pagination(urls):
+    """Endpoint template, start and step from consecutive XHR URLs of one listing"""
+    by_path = Counter(urlparse(url)._replace(query='').geturl() for url in urls)
+    if not by_path:
+        return None
+    base = by_path.most_common(1)[0][0]
+    queries = [dict(parse_qsl(urlparse(url).query)) for url in urls
+               if urlparse(url)._replace(query='').geturl() == base]
+
+    candidates = [key for key in queries[0] if all(q.get(key, '').isdigit() for q in queries)]
+    changing = [key for key in candidates if len({q[key] for q in queries}) > 1]
+    known = [key for key in candidates if key in PAGINATION_PARAMS]
+    # A known page parameter beats other changing ones such as cache busters
+    keys = [key for key in changing if key in known] or changing or known
+    if not keys:
+        return None
+    key = keys[0]
+    values = [int(q[key]) for q in queries]
+    if len(values) > 1:
+        step = values[1] - values[0]
+    elif key in OFFSET_PARAMS:
+        step = next((int(queries[0][size]) for size in SIZE_PARAMS if queries[0].get(size, '').isdigit()), 1)
+    else:
+        step = 1
+    query = '&'.join(f"{quote(k)}={'{page}' if k == key else quote(v)}" for k, v in queries[0].items())
+    return {'url': f"{base}?{query}", 'start': values[0], 'step': step}
+
+def find_html_field(payload, path=''):
+    """Dotted path of the first string in `payload` containing company-block markup"""
+    if isinstance(payload, str):
+        return path if 'company-block' in payload else None
+    items = payload.items() if isinstance(payload, dict) else enumerate(payload) if isinstance(payload, list) else ()
+    for key, value in items:
+        found = find_html_field(value, f"{path}.{key}" if path else str(key))
+        if found is not None:
+            return found
+    return None
+
+def discover(listing_url, scrolls=3, wait=3.0):
+    """Scroll the listing once in Chromium and infer its pagination endpoint from the XHR traffic"""
+    from DrissionPage import ChromiumPage
+
+    page = ChromiumPage()
+    try:
+        page.listen.start(res_type=('XHR', 'Fetch'))
+        page.get(listing_url)
+        for _ in range(scrolls):
+            page.scroll.to_bottom()
+            time.sleep(wait)
+        packets = page.listen.wait(count=100, timeout=wait, fit_count=False) or []
+    finally:
+        page.quit()
+
+    html_urls, json_urls, html_field = [], [], None
+    for packet in packets:
+        body = packet.response.body
+        if isinstance(body, (dict, list)):
+            field = find_html_field(body)
+            if field is not None:
+                json_urls.append(packet.url)
+                html_field = html_field or field
+        elif isinstance(body, str) and 'company-block' in body:
+            html_urls.append(packet.url)
+
+    urls, kind = (json_urls, 'json') if len(json_urls) >= len(html_urls) else (html_urls, 'html')
+    spec = infer_pagination(urls)
+    if spec is None:
+        return None
+    spec.update(kind=kind, first_page=True)
+    if kind == 'json':
+        spec['html_field'] = html_field
+    return spec
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--endpoints', default=ENDPOINTS_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    disc = sub.add_parser('discover', help='find a listing\'s pagination endpoint with the browser')
+    disc.add_argument('url')
+    disc.add_argument('--scrolls', type=int, default=3)
+
+    fetch = sub.add_parser('fetch', help='fetch a listing over HTTP and print its companies')
+    fetch.add_argument('url')
+    fetch.add_argument('--backend', default='bs4')
+
+    args = parser.parse_args()
+
+    if args.command == 'discover':
+        spec = discover(args.url, scrolls=args.scrolls)
+        if spec is None:
+            raise SystemExit("No paginated company endpoint found - keep using the browser for this listing")
+        save_endpoint(args.url, spec, args.endpoints)
+        print(f"{args.url}\n  -> {spec['url']} ({spec['kind']}, from {spec['start']} step {spec['step']})")
+        return
+
+    spec = load_endpoints(args.endpoints).get(args.url)
+    if spec is None:
+        raise SystemExit(f"No endpoint recorded for {args.url} in {args.endpoints}")
+    started = time.monotonic()
+    session = make_session()
+    try:
+        rows = [row for _, row in iter_companies_http(session, args.url, spec, backend=args.backend)]
+    finally:
+        session.close()
+    for row in rows:
+        print(row['company_name'])
+    print(f"{len(rows)} companies in {time.monotonic() - started:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""Investor index - investor -> portfolio map and sparse co-investment graph
+
+Built once from the dataset and persisted as a scipy.sparse company x
+investor incidence matrix plus the name tables. Co-investment weights
+(companies two investors share) come from one sparse product, so top-k,
+portfolio, co-investor and shortest-path queries are all array lookups.
+"""
+from pathlib import Path
+from scipy import sparse
+from scipy.sparse import csgraph
+import argparse
+import json
+import numpy as np
+import time
+
+from dataset import DATASET_CSV, load_dataset
+from normalize import default_aliases
+
+INDEX_DIR = 'investor_index'
+
+class InvestorIndex:
+    """Sparse investor/company incidence with co-investment queries"""
+
+    def __init__(self, investors, companies, incidence):
+        self.investors = list(investors)
+        self.companies = list(companies)
+        self.ids = {name: i for i, name in enumerate(self.investors)}
+
+        self.incidence = sparse.csr_matrix(incidence, dtype=np.int32)  # companies x investors
+        self.portfolios = self.incidence.T.tocsr()                      # investors x companies
+        self.deals = np.diff(self.portfolios.indptr)
+
+        coinvest = (self.portfolios @ self.incidence).tolil()
+        coinvest.setdiag(0)
+        self.coinvest = coinvest.tocsr()
+        self.coinvest.eliminate_zeros()
+
+    @classmethod
+    def build(cls, df):
+        """Index a frame with company_name, an investors list column and optionally company_url
+
+        Companies are keyed by company_url, so two companies sharing a name stay
+        apart and rows with the same URL are one company with their investors
+        combined. Rows without a URL are keyed by name.
+        """
+        investors, keys, companies = {}, {}, []
+        links = {}
+        urls = df['company_url'] if 'company_url' in df else [''] * len(df)
+        for url, company, names in zip(urls, df['company_name'], df['investors']):
+            key = url or ('name', company)
+            if key not in keys:
+                keys[key] = len(companies)
+                companies.append(company)
+            row = keys[key]
+            for name in names:
+                links.setdefault((row, investors.setdefault(name, len(investors))), None)
+        rows = [row for row, _ in links]
+        cols = [col for _, col in links]
+        incidence = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                                      shape=(len(companies), len(investors)))
+        return cls(investors, companies, incidence)
+
+    def save(self, path=INDEX_DIR):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        sparse.save_npz(path / 'incidence.npz', self.incidence)
+        with open(path / 'names.json', 'w', encoding='utf-8') as f:
+            json.dump({'investors': self.investors, 'companies': self.companies}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path=INDEX_DIR):
+        path = Path(path)
+        with open(path / 'names.json', encoding='utf-8') as f:
+            names = json.load(f)
+        return cls(names['investors'], names['companies'], sparse.load_npz(path / 'incidence.npz'))
+
+    def _id(self, investor):
+        try:
+            return self.ids[investor]
+        except KeyError:
+            raise KeyError(f"Unknown investor: {investor!r}") from None
+
+    def top_k(self, k=10):
+        """[(investor, number of companies)] for the k most active investors"""
+        k = min(k, len(self.investors))
+        if k <= 0:
+            return []
+        top = np.argpartition(-self.deals, k - 1)[:k]
+        top = top[np.lexsort((top, -self.deals[top]))]
+        return [(self.investors[i], int(self.deals[i])) for i in top]
+
+    def portfolio(self, investor):
+        """Companies an investor backs"""
+        row = self.portfolios[self._id(investor)]
+        return [self.companies[j] for j in row.indices]
+
+    def co_investors(self, investor, k=None):
+        """[(investor, shared companies)] sorted by the number of shared companies"""
+        row = self.coinvest[self._id(investor)]
+        order = np.lexsort((row.indices, -row.data))[:k]
+        return [(self.investors[row.indices[i]], int(row.data[i])) for i in order]
+
+    def path(self, source, target):
+        """Shortest co-investment chain from `source` to `target`
+
+        Returns [(investor, company shared with the previous investor)], the
+        first entry having company None, or [] when they are not connected.
+        """
+        a, b = self._id(source), self._id(target)
+        _, predecessors = csgraph.breadth_first_order(self.coinvest, a, directed=False,
+                                                      return_predecessors=True)
+        if a != b and predecessors[b] < 0:
+            return []
+
+        chain = [b]
+        while chain[-1] != a:
+            chain.append(predecessors[chain[-1]])
+        chain.reverse()
+
+        hops = [(self.investors[a], None)]
+        for prev, cur in zip(chain, chain[1:]):
+            shared = np.intersect1d(self.portfolios[prev].indices, self.portfolios[cur].indices)
+            hops.append((self.investors[cur], self.companies[shared[0]]))
+        return hops
+
+def build_index(path=DATASET_CSV, aliases=None):
+    """Index the dataset with investor and company names resolved through the alias table
+
+    Resolved company names are only shown; companies are told apart by URL.
+    """
+    aliases = aliases or default_aliases()
+    df = load_dataset(path, columns=['company_url', 'company_name', 'investors'])
+    df['company_name'] = aliases.column('companies', df['company_name'])
+    df['investors'] = aliases.list_column('investors', df['investors'])
+    return InvestorIndex.build(df)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--index', default=INDEX_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    build = sub.add_parser('build', help='build the index from the dataset')
+    build.add_argument('--data', default=DATASET_CSV)
+
+    top = sub.add_parser('top', help='most active investors')
+    top.add_argument('-k', type=int, default=10)
+
+    portfolio = sub.add_parser('portfolio', help="an investor's companies")
+    portfolio.add_argument('investor')
+
+    co = sub.add_parser('coinvestors', help='investors sharing companies with an investor')
+    co.add_argument('investor')
+    co.add_argument('-k', type=int)
+
+    path = sub.add_parser('path', help='shortest co-investment path between two investors')
+    path.add_argument('source')
+    path.add_argument('target')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        index = build_index(args.data)
+        index.save(args.index)
+        print(f"Indexed {len(index.investors)} investors, {index.incidence.nnz} investments "
+              f"in {time.perf_counter() - started:.2f}s -> {args.index}")
+        return
+
+    index = InvestorIndex.load(args.index)
+    started = time.perf_counter()
+    if args.command == 'top':
+        result = [f"{deals:4d}  {name}" for name, deals in index.top_k(args.k)]
+    elif args.command == 'portfolio':
+        result = index.portfolio(args.investor)
+    elif args.command == 'coinvestors':
+        result = [f"{shared:4d}  {name}" for name, shared in index.co_investors(args.investor, args.k)]
+    else:
+        hops = index.path(args.source, args.target)
+        result = [name if via is None else f"-> {name}  (via {via})" for name, via in hops] or ['not connected']
+    elapsed = time.perf_counter() - started
+
+    print('\n'.join(result))
+    print(f"({elapsed * 1000:.2f} ms)")
+
+if __name__ == '__main__':
+    main()
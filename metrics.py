@@ -0,0 +1,158 @@
+"""Run metrics - phase timers, counters, field fill rates and selector misses
+
+A RunMetrics object is threaded through a scrape. At the end of the run its
+report is appended as one JSON line to runs.jsonl and can also be written as
+a Prometheus textfile (node_exporter textfile collector), so slowdowns and
+F6S markup changes (a selector suddenly missing in every block) show up on a
+dashboard.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import os
+import time
+
+from extract import FIELDS, SECTIONS
+
+RUN_LOG = 'runs.jsonl'
+PROMETHEUS_PREFIX = 'f6s_scraper'
+
+class RunMetrics:
+    """Timers and counters for one run"""
+
+    def __init__(self, run='scrape'):
+        self.run = run
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.counters = Counter()
+        self.misses = Counter()
+        self.filled = Counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one occurrence of phase `name`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name, seconds):
+        stats = self.phases.setdefault(name, {'count': 0, 'seconds': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['seconds'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def keep(self, row):
+        """Count an extracted row towards rows_kept and the field fill rates"""
+        self.counters['rows_kept'] += 1
+        for field in FIELDS:
+            if row.get(field):
+                self.filled[field] += 1
+
+    def fill_rates(self):
+        rows = self.counters['rows_kept']
+        return {field: self.filled[field] / rows if rows else 0.0 for field in FIELDS}
+
+    def report(self):
+        blocks = self.counters['blocks_found']
+        return {
+            'run': self.run,
+            'started_at': self.started_at.isoformat(),
+            'duration': round(time.perf_counter() - self.started, 3),
+            'phases': {name: {'count': stats['count'], 'seconds': round(stats['seconds'], 4),
+                              'max': round(stats['max'], 4)}
+                       for name, stats in self.phases.items()},
+            'counters': dict(self.counters),
+            'fill_rates': {field: round(rate, 4) for field, rate in self.fill_rates().items()},
+            'selector_misses': {section: self.misses[section] for section in SECTIONS + ('error',)},
+            'selector_miss_rates': {section: round(self.misses[section] / blocks, 4) if blocks else 0.0
+                                    for section in SECTIONS},
+        }
+
+    def write_report(self, path=RUN_LOG):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.report(), ensure_ascii=False) + '\n')
+
+    def write_prometheus(self, path):
+        write_prometheus(self.report(), path)
+
+    def print_summary(self):
+        report = self.report()
+        print(f"\nRun metrics ({report['duration']:.1f}s):")
+        for name, stats in report['phases'].items():
+            print(f"  {name:15s} {stats['count']:6d}x  {stats['seconds']:8.2f}s  max {stats['max']:.3f}s")
+        print("  " + ", ".join(f"{name}={value}" for name, value in report['counters'].items()))
+        missing = {section: count for section, count in report['selector_misses'].items() if count}
+        if missing:
+            print("  selector misses: " + ", ".join(f"{section}={count}" for section, count in missing.items()))
+
+def write_prometheus(report, path):
+    """Write a run report in the Prometheus text exposition format, atomically"""
+    p = PROMETHEUS_PREFIX
+    run = f'run="{report["run"]}"'
+    lines = [
+        f'# HELP {p}_last_run_timestamp_seconds Start time of the last run.',
+        f'# TYPE {p}_last_run_timestamp_seconds gauge',
+        f'{p}_last_run_timestamp_seconds{{{run}}} {datetime.fromisoformat(report["started_at"]).timestamp():.0f}',
+        f'# HELP {p}_run_duration_seconds Wall time of the last run.',
+        f'# TYPE {p}_run_duration_seconds gauge',
+        f'{p}_run_duration_seconds{{{run}}} {report["duration"]}',
+        f'# HELP {p}_phase_seconds Time spent in each phase of the last run.',
+        f'# TYPE {p}_phase_seconds gauge',
+    ]
+    lines += [f'{p}_phase_seconds{{{run},phase="{name}"}} {stats["seconds"]}'
+              for name, stats in report['phases'].items()]
+    lines += [f'# HELP {p}_phase_count Occurrences of each phase in the last run.',
+              f'# TYPE {p}_phase_count gauge']
+    lines += [f'{p}_phase_count{{{run},phase="{name}"}} {stats["count"]}'
+              for name, stats in report['phases'].items()]
+    lines += [f'# HELP {p}_events Counters of the last run (blocks found, rows kept, ...).',
+              f'# TYPE {p}_events gauge']
+    lines += [f'{p}_events{{{run},event="{name}"}} {value}' for name, value in report['counters'].items()]
+    lines += [f'# HELP {p}_field_fill_ratio Share of kept rows with a non-empty field.',
+              f'# TYPE {p}_field_fill_ratio gauge']
+    lines += [f'{p}_field_fill_ratio{{{run},field="{field}"}} {rate}'
+              for field, rate in report['fill_rates'].items()]
+    lines += [f'# HELP {p}_selector_misses Blocks in which a section selector matched nothing.',
+              f'# TYPE {p}_selector_misses gauge']
+    lines += [f'{p}_selector_misses{{{run},section="{section}"}} {count}'
+              for section, count in report['selector_misses'].items()]
+
+    tmp = Path(f'{path}.tmp')
+    tmp.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    os.replace(tmp, path)
+
+def load_reports(path=RUN_LOG):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', default=RUN_LOG)
+    parser.add_argument('-n', type=int, default=10, help='number of recent runs to show')
+    parser.add_argument('--prometheus', help='write the latest run as a Prometheus textfile')
+    args = parser.parse_args()
+
+    reports = load_reports(args.log)
+    for report in reports[-args.n:]:
+        phases = report['phases']
+        slowest = max(phases, key=lambda name: phases[name]['seconds']) if phases else '-'
+        worst = max(report['selector_miss_rates'].items(), key=lambda item: item[1], default=('-', 0))
+        print(f"{report['started_at'][:19]}  {report['run']:8s} {report['duration']:8.1f}s  "
+              f"rows {report['counters'].get('rows_kept', 0):6d}  slowest {slowest}  "
+              f"top miss {worst[0]} {worst[1] * 100:.0f}%")
+
+    if args.prometheus and reports:
+        write_prometheus(reports[-1], args.prometheus)
+        print(f"Wrote {args.prometheus}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Entity normalisation - canonical investor, city and company names with a persistent alias table
+
+The same fund shows up as 'Quest Ventures', 'Quest Ventures LLP' or
+'quest  ventures' across listings, and a company listed in two countries
+under two spellings. canonical_name() folds case, accents,
+punctuation and legal forms into a match key; learn() groups the
+remaining near-duplicates with a sorted-neighbourhood pass - each key is
+compared by character-trigram Jaccard score only with its neighbours when
+the keys are sorted as written and with their tokens sorted - so the work
+grows as n log n in the number of names rather than n^2. Merges are kept in
+aliases.json (canonical -> spellings) and can be edited by hand; resolving a
+name is then one dict lookup.
+
+Team members are not a section: listings show first names only ('Murat'),
+so equal spellings in different companies are usually different people and
+there is nothing to merge across companies. Within a block they are already
+deduplicated by the extractor.
+"""
+from collections import Counter
+from pathlib import Path
+import argparse
+import json
+import re
+import unicodedata
+
+from features import per_unique
+
+ALIASES_PATH = Path(__file__).with_name('aliases.json')
+SECTIONS = ('cities', 'investors', 'companies')
+
+# Written after the name ('... LLP'); as first words they are usually ordinary ones ('Limited Run Games')
+LEGAL_FORMS = {'llp', 'llc', 'ltd', 'limited', 'inc', 'jsc', 'corp', 'gmbh'}
+# Kazakh forms, written before the name ('ТОО ...'); the Latin spellings only count in capitals,
+# so 'Too Good To Go' keeps its first word
+LEADING_LEGAL_FORMS = {'тоо', 'ао', 'too', 'ao'}
+SIMILARITY = 0.75
+WINDOW = 8
+
+def canonical_name(name):
+    """Match key for a name: 'Quest Ventures, LLP' -> 'quest ventures'"""
+    text = name
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    words = re.sub(r'[\W_]+', ' ', text.replace('&', ' and ')).split()
+    while len(words) > 1 and (words[-1].casefold() in LEGAL_FORMS or is_leading_form(words[-1])):
+        words.pop()
+    while len(words) > 1 and is_leading_form(words[0]):
+        words.pop(0)
+    return ' '.join(word.casefold() for word in words)
+
+def is_leading_form(word):
+    """'ТОО', 'АО' in any case, 'TOO', 'AO' only in capitals"""
+    return (word.isupper() or not word.isascii()) and word.casefold() in LEADING_LEGAL_FORMS
+
+def blocking_keys(key):
+    """Sort keys for the neighbourhood pass: as written, and with tokens sorted"""
+    return key, ' '.join(sorted(key.split()))
+
+def trigrams(key):
+    padded = f'  {key} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def signature(key):
+    """(numbers, trigrams) of a match key - what similarity() compares"""
+    return tuple(re.findall(r'\d+', key)), trigrams(key)
+
+def similarity(a, b):
+    """Character-trigram Jaccard similarity of two signature()s
+
+    Keys whose numbers differ ('fund 1' and 'fund 2') never match.
+    """
+    (a_numbers, a_grams), (b_numbers, b_grams) = a, b
+    if a_numbers != b_numbers:
+        return 0.0
+    return len(a_grams & b_grams) / len(a_grams | b_grams)
+
+class AliasTable:
+    """Canonical name lookup per section (cities, investors, companies)"""
+
+    def __init__(self, aliases=None):
+        self.aliases = {section: {} for section in SECTIONS}
+        self.keys = {section: {} for section in SECTIONS}
+        for section, groups in (aliases or {}).items():
+            for canonical, spellings in groups.items():
+                self.add(section, canonical, *spellings)
+
+    @classmethod
+    def from_file(cls, path=ALIASES_PATH):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def save(self, path=ALIASES_PATH):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.aliases, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+    def add(self, section, canonical, *spellings):
+        """Record `spellings` (and the canonical form itself) as names for `canonical`"""
+        keys = self.keys.setdefault(section, {})
+        known = self.aliases.setdefault(section, {}).setdefault(canonical, [])
+        for spelling in (canonical, *spellings):
+            keys.setdefault(canonical_name(spelling), canonical)
+            if spelling != canonical and spelling not in known:
+                known.append(spelling)
+
+    def resolve(self, section, name):
+        """Canonical spelling of `name`, or `name` itself when it is not in the table"""
+        return self.keys[section].get(canonical_name(name), name)
+
+    def column(self, section, values):
+        """resolve() over a text column, once per distinct value"""
+        return per_unique(lambda unique: unique.map(lambda name: self.resolve(section, name)))(values)
+
+    def list_column(self, section, lists):
+        """resolve() over a list column, dropping duplicates an entry collapses into"""
+        memo = {}
+        def resolve(name):
+            if name not in memo:
+                memo[name] = self.resolve(section, name)
+            return memo[name]
+        return lists.map(lambda names: list(dict.fromkeys(resolve(name) for name in names)))
+
+    def learn(self, section, names, threshold=SIMILARITY, window=WINDOW):
+        """Merge near-duplicate spellings in `names` into the table; returns the new merges
+
+        Names already mapped keep their canonical form. Every group of
+        unmapped spellings is canonicalised to its most frequent spelling.
+        """
+        counts = Counter(names)
+        keys = self.keys.setdefault(section, {})
+
+        # Spellings per match key; known keys join their existing group
+        spellings = {}
+        for name, count in counts.items():
+            spellings.setdefault(canonical_name(name), Counter())[name] += count
+        match_keys = [key for key in spellings if key]
+
+        # Union-find over match keys, comparing only sorted neighbours
+        signatures = {key: signature(key) for key in match_keys}
+        parent = {key: key for key in match_keys}
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for order in range(2):
+            ranked = sorted(match_keys, key=lambda key: blocking_keys(key)[order])
+            for i, a in enumerate(ranked):
+                for b in ranked[i + 1:i + 1 + window]:
+                    if find(a) != find(b) and similarity(signatures[a], signatures[b]) >= threshold:
+                        parent[find(a)] = find(b)
+
+        groups = {}
+        for key in match_keys:
+            groups.setdefault(find(key), []).append(key)
+
+        merges = {}
+        for group in groups.values():
+            known = [keys[key] for key in group if key in keys]
+            total = sum((spellings[key] for key in group), Counter())
+            canonical = known[0] if known else total.most_common(1)[0][0]
+            new = [name for name in total if name != canonical and keys.get(canonical_name(name)) != canonical]
+            if new:
+                self.add(section, canonical, *new)
+                merges[canonical] = new
+        return merges
+
+def default_aliases():
+    return AliasTable.from_file(ALIASES_PATH)
+
+def main():
+    from dataset import DATASET_CSV, load_dataset
+    from features import city_column
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--aliases', default=ALIASES_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    learn = sub.add_parser('learn', help='merge near-duplicate investor, city and company names from the dataset')
+    learn.add_argument('--data', default=DATASET_CSV)
+    learn.add_argument('--threshold', type=float, default=SIMILARITY)
+    learn.add_argument('--dry-run', action='store_true', help='print the merges without saving them')
+
+    add = sub.add_parser('add', help='record spellings for a canonical name')
+    add.add_argument('section', choices=SECTIONS)
+    add.add_argument('canonical')
+    add.add_argument('spellings', nargs='+')
+
+    resolve = sub.add_parser('resolve', help='print the canonical form of names')
+    resolve.add_argument('section', choices=SECTIONS)
+    resolve.add_argument('names', nargs='+')
+
+    args = parser.parse_args()
+    table = AliasTable.from_file(args.aliases)
+
+    if args.command == 'resolve':
+        for name in args.names:
+            print(f"{name} -> {table.resolve(args.section, name)}")
+        return
+
+    if args.command == 'add':
+        table.add(args.section, args.canonical, *args.spellings)
+    else:
+        df = load_dataset(args.data, columns=['company_name', 'location', 'investors'])
+        sources = {
+            'cities': city_column(df['location']).tolist(),
+            'investors': [name for names in df['investors'] for name in names],
+            'companies': df['company_name'].tolist(),
+        }
+        for section, names in sources.items():
+            merges = table.learn(section, names, args.threshold)
+            print(f"{section}: {len(set(names))} distinct names, {sum(map(len, merges.values()))} new aliases")
+            for canonical, spellings in merges.items():
+                print(f"  {canonical} <- {', '.join(spellings)}")
+        if args.dry_run:
+            return
+
+    table.save(args.aliases)
+    print(f"Saved {args.aliases}")
+
+if __name__ == '__main__':
+    main()
@@ -1,231 +1,346 @@
 """F6S Kazakhstan Companies Scraper - Fixed Selectors"""
+from contextlib import closing
 from DrissionPage import ChromiumPage
-from bs4 import BeautifulSoup
 import pandas as pd
-import re
+from pathlib import Path
+import argparse
 import time
 
-def clean_text(text):
-    if not text:
-        return ""
-    return re.sub(r'\s+', ' ', text.strip())
-
-def extract_company_data(block):
-    """Extract all available data from company block"""
-    data = {
-        'company_name': '',
-        'tagline': '',
-        'company_url': '',
-        'logo_url': '',
-        'location': '',
-        'founded_year': '',
-        'funding_amount': '',
-        'investors': '',
-        'investor_count': '',
-        'team_members': '',
-        'team_count': '',
-        'description': ''
-    }
-
-    try:
-        # Company Name & URL
-        name_elem = block.find('h2', class_='company-entry-title')
-        if name_elem:
-            link = name_elem.find('a')
-            if link:
-                data['company_name'] = clean_text(link.get_text())
-                href = link.get('href', '')
-                if href:
-                    data['company_url'] = f"https://www.f6s.com{href}" if href.startswith('/') else href
-
-        # Tagline
-        tagline = block.find('h3', class_='mt4 mb8')
-        if tagline:
-            data['tagline'] = clean_text(tagline.get_text())
-
-        # Logo
-        logo_img = block.find('img', class_='f6s-thumbnail')
-        if logo_img and logo_img.get('src'):
-            data['logo_url'] = logo_img.get('src')
-
-        # Location - must have location icon
-        location_divs = block.find_all('div', class_='centered-content g8')
-        for div in location_divs:
-            svg = div.find('svg')
-            if svg:
-                use = svg.find('use')
-                if use and use.get('xlink:href') == '#location':
-                    data['location'] = clean_text(div.get_text())
-                    break
-
-        # Founded Year - must have clock icon
-        founded_paras = block.find_all('p', class_='centered-content g8 mt8')
-        for p in founded_paras:
-            svg = p.find('svg')
-            if svg:
-                use = svg.find('use')
-                if use and use.get('xlink:href') == '#clock':
-                    text = p.get_text()
-                    match = re.search(r'Founded\s+(\d{4})', text)
-                    if match:
-                        data['founded_year'] = match.group(1)
-                        break
-
-        # Funding & Investors - must have trend icon
-        funding_divs = block.find_all('div', class_='centered-content mt8')
-        for div in funding_divs:
-            svg = div.find('svg')
-            if svg:
-                use = svg.find('use')
-                if use and use.get('xlink:href') == '#trend':
-                    content = div.find('div', class_='overview-line-content ml8')
-                    if content:
-                        text = content.get_text()
-
-                        # Extract funding amount
-                        amount_match = re.search(r'\$[\d.]+[kmb]?', text, re.I)
-                        if amount_match:
-                            data['funding_amount'] = amount_match.group(0)
-
-                        # Extract investor names - SKIP LINKS WITH IMAGES
-                        investor_links = content.find_all('a', target='_blank')
-                        investor_names = []
-
-                        for link in investor_links:
-                            # Skip if link contains an image
-                            if link.find('img'):
-                                continue
-
-                            # Get text
-                            name = clean_text(link.get_text())
-
-                            # Skip empty, "See all", etc
-                            if not name or len(name) < 3:
-                                continue
-                            if any(x in name.lower() for x in ['see', 'all', 'investor', 'more']):
-                                continue
-
-                            # Add unique investors only
-                            if name and name not in investor_names:
-                                investor_names.append(name)
-
-                        if investor_names:
-                            data['investors'] = ', '.join(investor_names)
-
-                        # Get total investor count from "and X more"
-                        more_match = re.search(r'and\s+(\d+)\s+more', text)
-                        if more_match:
-                            additional = int(more_match.group(1))
-                            total_count = len(investor_names) + additional
-                            data['investor_count'] = str(total_count)
-                        elif investor_names:
-                            data['investor_count'] = str(len(investor_names))
-                        else:
-                            data['investor_count'] = '0'
-
-                    break
-
-        # Team Members
-        team_wrapper = block.find('div', class_='collection-team-summary-wrapper mb16')
-        if team_wrapper:
-            team_links = team_wrapper.find_all('a', class_='accent hand')
-            team_names = []
-
-            for link in team_links:
-                name = clean_text(link.get_text())
-                if name and len(name) > 1 and name not in team_names:
-                    team_names.append(name)
-
-            if team_names:
-                data['team_members'] = ', '.join(team_names)
-
-            # Check for "and X more" in team section
-            team_text = team_wrapper.get_text()
-            more_team = re.search(r'and\s+(\d+)\s+more', team_text)
-            if more_team:
-                additional = int(more_team.group(1))
-                total_count = len(team_names) + additional
-                data['team_count'] = str(total_count)
-            elif team_names:
-                data['team_count'] = str(len(team_names))
+from archive import ARCHIVE_DIR, SnapshotArchive
+from checkpoint import CHECKPOINT_DIR, Checkpoint
+from dataset import write_parquet
+from delta import DELTA_DIR, unchanged_urls, update_store
+from extract import BACKENDS, get_backend
+from http_fetch import ENDPOINTS_PATH, load_endpoints
+from metrics import RUN_LOG, RunMetrics
+from snapshots import SNAPSHOT_DIR, write_snapshot
+from store import DB_PATH, connect, upsert_companies
+
+LISTING_URL = "https://www.f6s.com/companies/kazakhstan/lo"
+OUTPUT_CSV = 'f6s_kazakhstan_companies.csv'
+BATCH_SIZE = 50
+
+# Scroll termination: stop once MAX_IDLE_SCROLLS scrolls in a row add no blocks
+PAGE_LOAD_TIMEOUT = 30.0
+SCROLL_TIMEOUT = 8.0
+SCROLL_BACKOFF = 1.5
+POLL_INTERVAL = 0.25
+MAX_IDLE_SCROLLS = 2
+MAX_SCROLLS = 500
+
+COUNT_BLOCKS_JS = "return document.querySelectorAll('div.company-block').length;"
+
+# outerHTML of the company blocks appended after index `start`, at most `limit` of them
+NEW_BLOCKS_JS = """
+const blocks = document.querySelectorAll('div.company-block');
+const out = [];
+for (let i = arguments[0]; i < blocks.length && out.length < arguments[1]; i++) {
+    out.push(blocks[i].outerHTML);
+}
+return out;
+"""
+
+def fetch_new_blocks(page, start, limit=BATCH_SIZE):
+    """Return raw HTML of up to `limit` company blocks after the first `start`"""
+    return page.run_js(NEW_BLOCKS_JS, start, limit) or []
+
+def count_blocks(page):
+    return page.run_js(COUNT_BLOCKS_JS) or 0
+
+def wait_for_growth(page, previous, timeout=SCROLL_TIMEOUT, poll=POLL_INTERVAL):
+    """Poll the company-block count until it exceeds `previous` or `timeout` passes"""
+    deadline = time.monotonic() + timeout
+    count = count_blocks(page)
+    while count <= previous and time.monotonic() < deadline:
+        time.sleep(poll)
+        count = count_blocks(page)
+    return count
+
+def iter_companies(page, batch_size=BATCH_SIZE, timeout=SCROLL_TIMEOUT,
+                   backoff=SCROLL_BACKOFF, max_idle=MAX_IDLE_SCROLLS,
+                   max_scrolls=MAX_SCROLLS, timings=None, backend='bs4', on_block=None, metrics=None,
+                   start=0, start_url=None, on_batch=None, on_scroll=None):
+    """Scroll the listing and yield (index, row) as soon as new blocks appear
+
+    Only blocks appended since the previous batch are pulled from the browser,
+    so memory is bounded by `batch_size` rather than the size of the listing.
+    Scrolling stops once `max_idle` consecutive scrolls add no blocks; each idle
+    scroll multiplies the wait by `backoff`. Per-scroll durations are appended
+    to `timings` when given. `backend` picks the parser (see extract.BACKENDS);
+    `on_block` is called with the raw markup of every block, e.g. to archive it.
+    Phase timings and block/row counters go to `metrics` (metrics.RunMetrics).
+
+    To resume, `start` blocks are scrolled past without being extracted,
+    provided the last of them still links to `start_url`; otherwise the
+    listing has shifted and is read from the top. `on_batch(seen, scrolls,
+    last_url)` is called after every batch, once its rows have been yielded.
+    `on_scroll()` is called before every scroll, e.g. to rate-limit requests
+    to the host; time spent in it is not counted as scrolling.
+    """
+    find_blocks, extract_company_data = get_backend(backend)
+    metrics = metrics or RunMetrics()
+    seen = start
+    check_start = start > 0
+    last_url = start_url
+    with metrics.phase('page_load'):
+        count = wait_for_growth(page, 0, timeout=PAGE_LOAD_TIMEOUT)
+    wait = timeout
+    idle = 0
+    scrolls = 0
+
+    while True:
+        if check_start and count >= seen:
+            check_start = False
+            previous = fetch_new_blocks(page, seen - 1, 1)
+            blocks = find_blocks(previous[0]) if previous else []
+            if not blocks or extract_company_data(blocks[0])['company_url'] != start_url:
+                print("  listing changed since the checkpoint - reading it again from the top")
+                seen = 0
             else:
-                data['team_count'] = '0'
+                print(f"  resumed after {seen} blocks")
+
+        while seen < count:
+            with metrics.phase('html_fetch'):
+                batch = fetch_new_blocks(page, seen, batch_size)
+            if not batch:
+                break
+            for html in batch:
+                seen += 1
+                metrics.count('blocks_found')
+                if on_block:
+                    on_block(html)
+                with metrics.phase('parse'):
+                    blocks = find_blocks(html)
+                if not blocks:
+                    metrics.count('blocks_unparsed')
+                    continue
+                with metrics.phase('extract'):
+                    data = extract_company_data(blocks[0], metrics.misses)
+                last_url = data['company_url']
+                if data['company_name']:
+                    metrics.keep(data)
+                    yield seen, data
+                else:
+                    metrics.count('rows_dropped')
+            if on_batch:
+                on_batch(seen, scrolls, last_url)
+
+        if idle >= max_idle or scrolls >= max_scrolls:
+            break
+
+        if on_scroll:
+            on_scroll()
+        started = time.monotonic()
+        page.scroll.to_bottom()
+        scrolls += 1
+        new_count = wait_for_growth(page, count, timeout=wait)
+        elapsed = time.monotonic() - started
+        metrics.observe('scroll', elapsed)
+        if timings is not None:
+            timings.append(elapsed)
+
+        if new_count > count:
+            idle = 0
+            wait = timeout
         else:
-            data['team_count'] = '0'
-
-        # Description
-        desc_div = block.find('div', class_='profile-description mb16')
-        if desc_div:
-            inner_div = desc_div.find('div', class_='break-word')
-            if inner_div:
-                # Remove buttons
-                for button in inner_div.find_all('button'):
-                    button.decompose()
+            idle += 1
+            wait *= backoff
+        print(f"  scroll {scrolls}: {count} -> {new_count} blocks ({elapsed:.1f}s)")
+        count = new_count
+
+def save_companies(companies, path=OUTPUT_CSV):
+    """Write rows to CSV and print a data quality summary"""
+    df = pd.DataFrame(companies)
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+    write_parquet(companies, path)
+
+    print(f"\n{'='*60}")
+    print(f"SUCCESS! Saved {len(companies)} companies")
+    print(f"File: {path}")
+    print(f"{'='*60}")
+
+    print("\nDATA QUALITY:")
+    print(f"  With funding: {(df['funding_amount'] != '').sum()}")
+    print(f"  With investors: {(df['investors'] != '').sum()}")
+    print(f"  With team info: {(df['team_members'] != '').sum()}")
+    print(f"  With descriptions: {(df['description'] != '').sum()}")
+
+    # Show sample with investors
+    sample = df[df['investors'] != ''].head(3)
+    if len(sample) > 0:
+        print(f"\nSAMPLE INVESTOR DATA:")
+        for _, row in sample.iterrows():
+            print(f"  {row['company_name']}: {row['investors']} (count: {row['investor_count']})")
+
+def crawl_browser(url, checkpoint, metrics, backend='bs4', on_block=None, archive=False):
+    """Scroll `url` in Chromium; returns (companies, final page HTML or None)
+
+    The page HTML holds the whole scrolled DOM, so it is only read when `archive` is set.
+    """
+    start, start_url = checkpoint.position
+    checkpoint.state['fetch'] = 'browser'
+    print("Initializing browser...")
+    with metrics.phase('browser_launch'):
+        page = ChromiumPage()
 
-                paragraphs = inner_div.find_all('p')
-                desc_parts = [clean_text(p.get_text()) for p in paragraphs if clean_text(p.get_text())]
-                data['description'] = ' '.join(desc_parts)[:2000]
+    try:
+        print(f"Loading {url}...")
+        started = time.monotonic()
+        with metrics.phase('page_get'):
+            page.get(url)
+
+        print("Scrolling and extracting companies...")
+        companies = list(checkpoint.rows)
+        timings = []
+        for idx, data in iter_companies(page, timings=timings, backend=backend, on_block=on_block,
+                                        metrics=metrics, start=start, start_url=start_url,
+                                        on_batch=checkpoint.commit):
+            if not checkpoint.add(data):
+                continue
+            companies.append(data)
+            print(f"[{idx:3d}] {data['company_name']}")
 
-    except Exception as e:
-        print(f"    Error: {str(e)[:80]}")
+        print(f"\nCrawl finished in {time.monotonic() - started:.1f}s "
+              f"({len(timings)} scrolls, {sum(timings):.1f}s scrolling)")
+        return companies, page.html if archive else None
+    finally:
+        page.quit()
+
+def crawl_http(url, spec, checkpoint, metrics, backend='bs4', on_block=None, archive=False):
+    """Fetch `url` page by page from its recorded endpoint; returns (companies, first response or None)
+
+    Only the first response body is kept, and only when `archive` is set.
+    """
+    from http_fetch import iter_companies_http, make_session
+
+    print(f"Fetching {url} over HTTP...")
+    started = time.monotonic()
+    first = []
+    fetched = 0
+
+    def on_page(page_url, text):
+        nonlocal fetched
+        fetched += 1
+        if archive and not first:
+            first.append(text)
+
+    companies = list(checkpoint.rows)
+    # On this path the checkpoint's scroll count is the number of pages fetched
+    pages_done = checkpoint.state['scrolls'] if checkpoint.state.get('fetch') == 'http' else 0
+    checkpoint.state['fetch'] = 'http'
+    with closing(make_session()) as session:
+        for idx, data in iter_companies_http(session, url, spec, backend=backend, on_block=on_block,
+                                             metrics=metrics, start=checkpoint.state['seen'],
+                                             start_page=pages_done, on_batch=checkpoint.commit,
+                                             on_page=on_page):
+            if not checkpoint.add(data):
+                continue
+            companies.append(data)
+            print(f"[{idx:3d}] {data['company_name']}")
 
-    return data
+    print(f"\nFetch finished in {time.monotonic() - started:.1f}s ({fetched} requests)")
+    return companies, first[0] if first else None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default=LISTING_URL)
+    parser.add_argument('-o', '--output', default=OUTPUT_CSV)
+    parser.add_argument('--backend', choices=BACKENDS, default='bs4')
+    parser.add_argument('--fetch', choices=['auto', 'http', 'browser'], default='auto',
+                        help='auto: HTTP when an endpoint is recorded for the URL, else (or on failure) the browser')
+    parser.add_argument('--endpoints', default=ENDPOINTS_PATH, help='recorded listing endpoints (http_fetch.py)')
+    parser.add_argument('--no-archive', action='store_true',
+                        help='do not archive the crawl; by default the whole page is kept, which costs a full '
+                             'serialisation of the scrolled DOM once a browser crawl ends')
+    parser.add_argument('--archive', default=ARCHIVE_DIR, help='snapshot archive directory')
+    parser.add_argument('--archive-blocks', action='store_true',
+                        help='archive every company block as it is read instead of the whole page')
+    parser.add_argument('--full', action='store_true', help='overwrite the output instead of applying a delta')
+    parser.add_argument('--deltas', default=DELTA_DIR, help='directory for per-crawl change files')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite store the crawl is upserted into')
+    parser.add_argument('--no-db', action='store_true', help='do not update the SQLite store')
+    parser.add_argument('--snapshots', default=SNAPSHOT_DIR, help='dated crawl snapshots for trend analysis')
+    parser.add_argument('--no-snapshot', action='store_true', help='do not add this crawl to the snapshots')
+    parser.add_argument('--metrics', default=RUN_LOG, help='JSON-lines file the run report is appended to')
+    parser.add_argument('--prometheus', help='also write the run report as a Prometheus textfile')
+    parser.add_argument('--checkpoints', default=CHECKPOINT_DIR, help='directory for crawl checkpoints')
+    parser.add_argument('--resume', action='store_true', help='continue an interrupted crawl from its checkpoint')
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.url, args.checkpoints)
+    if args.resume:
+        checkpoint.load()
+        if checkpoint.done:
+            print(f"{args.url} already finished - nothing to resume")
+            return
+        print(f"Resuming with {len(checkpoint.rows)} companies from {checkpoint.state_path}")
+    else:
+        checkpoint.reset()
 
-print("Initializing browser...")
-page = ChromiumPage()
+    metrics = RunMetrics('scrape')
 
-try:
-    url = "https://www.f6s.com/companies/kazakhstan/lo"
-    print(f"Loading {url}...")
-    page.get(url)
-    time.sleep(5)
+    archive = None if args.no_archive else SnapshotArchive(args.archive)
+    block_digests = []
+    on_block = (lambda html: block_digests.append(archive.put(html))) if archive and args.archive_blocks else None
+    # Archived blocks already hold everything replay needs, so the page copy is only read without them
+    keep_page = archive is not None and not args.archive_blocks
 
-    print("Scrolling to load all companies...")
-    for i in range(15):
-        page.scroll.to_bottom()
-        time.sleep(2)
-        if (i+1) % 5 == 0:
-            print(f"  {i+1}/15")
+    spec = load_endpoints(args.endpoints).get(args.url) if args.fetch != 'browser' else None
+    if args.fetch == 'http' and spec is None:
+        parser.error(f"no endpoint recorded for {args.url} - run: python http_fetch.py discover {args.url}")
 
-    time.sleep(3)
+    try:
+        companies = None
+        if spec is not None:
+            try:
+                companies, page_html = crawl_http(args.url, spec, checkpoint, metrics, args.backend, on_block,
+                                                  archive=keep_page)
+            except Exception as e:
+                if args.fetch == 'http':
+                    raise
+                print(f"HTTP fetch failed ({type(e).__name__}: {e}) - falling back to the browser")
+                metrics.count('http_fallbacks')
+            if companies is not None and not companies and args.fetch == 'auto':
+                print("HTTP fetch found no companies - falling back to the browser")
+                metrics.count('http_fallbacks')
+                companies = None
+        if companies is None:
+            companies, page_html = crawl_browser(args.url, checkpoint, metrics, args.backend, on_block,
+                                                 archive=keep_page)
+
+        if archive:
+            with metrics.phase('archive'):
+                entry = archive.record_crawl(args.url, page_html, block_digests)
+            print(f"Archived crawl {entry['crawl_id']} to {args.archive}")
+
+        # Companies the delta left as they were only get marked as seen by this crawl downstream
+        unchanged = set()
+        with metrics.phase('write'):
+            if not companies:
+                print("No companies extracted")
+            elif args.full or not Path(args.output).exists():
+                save_companies(companies, args.output)
+            else:
+                unchanged = unchanged_urls(companies, update_store(companies, args.output, args.deltas))
 
-    print("\nExtracting data...")
-    html = page.html
-    soup = BeautifulSoup(html, 'html.parser')
-    blocks = soup.find_all('div', class_='company-block')
+        if companies and not args.no_db:
+            with metrics.phase('db_upsert'), closing(connect(args.db)) as conn:
+                crawl, count = upsert_companies(conn, companies, source=args.url, unchanged=unchanged)
+            print(f"Upserted {count} companies into {args.db} (crawl {crawl}); "
+                  f"ones unchanged since the last crawl were only marked as seen")
 
-    print(f"Found {len(blocks)} companies\n")
+        if companies and not args.no_snapshot:
+            with metrics.phase('snapshot'):
+                path = write_snapshot(companies, args.snapshots, source=args.url)
+            print(f"Stored snapshot {path}")
 
-    companies = []
-    for idx, block in enumerate(blocks, 1):
-        data = extract_company_data(block)
-        if data['company_name']:
-            companies.append(data)
-            print(f"[{idx:3d}] {data['company_name']}")
+        checkpoint.finish()
 
-    if companies:
-        df = pd.DataFrame(companies)
-        df.to_csv('f6s_kazakhstan_companies.csv', index=False, encoding='utf-8-sig')
-
-        print(f"\n{'='*60}")
-        print(f"SUCCESS! Saved {len(companies)} companies")
-        print(f"File: f6s_kazakhstan_companies.csv")
-        print(f"{'='*60}")
-
-        print("\nDATA QUALITY:")
-        print(f"  With funding: {(df['funding_amount'] != '').sum()}")
-        print(f"  With investors: {(df['investors'] != '').sum()}")
-        print(f"  With team info: {(df['team_members'] != '').sum()}")
-        print(f"  With descriptions: {(df['description'] != '').sum()}")
-
-        # Show sample with investors
-        sample = df[df['investors'] != ''].head(3)
-        if len(sample) > 0:
-            print(f"\nSAMPLE INVESTOR DATA:")
-            for _, row in sample.iterrows():
-                print(f"  {row['company_name']}: {row['investors']} (count: {row['investor_count']})")
-    else:
-        print("No companies extracted")
+    finally:
+        metrics.print_summary()
+        metrics.write_report(args.metrics)
+        if args.prometheus:
+            metrics.write_prometheus(args.prometheus)
 
-finally:
-    page.quit()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""Crawl snapshot store - every crawl kept as a dated, append-only Parquet partition
+
+Layout:
+    <root>/crawl_date=2024-05-01/<HHMMSSffffff>-<source hash>.parquet
+
+Each file holds one crawl's typed rows (dataset.to_typed) plus crawled_at
+and source columns, and is never rewritten. Readers select partitions by
+their directory name, so a query over a date range opens only the files of
+the crawl dates in that range.
+"""
+from datetime import date, datetime, timezone
+from pathlib import Path
+import argparse
+import hashlib
+import os
+
+import pandas as pd
+
+from dataset import to_typed
+from extract import FIELDS
+
+SNAPSHOT_DIR = 'snapshots'
+PARTITION = 'crawl_date'
+
+def _as_date(value):
+    """date from a date, datetime or 'YYYY-MM-DD...' string; None passes through"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+def write_snapshot(rows, root=SNAPSHOT_DIR, crawled_at=None, source=''):
+    """Append one crawl as a new partition file; returns its path"""
+    crawled_at = crawled_at or datetime.now(timezone.utc)
+    raw = pd.DataFrame(list(rows), columns=FIELDS).fillna('')
+    df = to_typed(raw[raw['company_url'] != ''].drop_duplicates('company_url'))
+    df.insert(0, 'crawled_at', pd.Timestamp(crawled_at))
+    df['source'] = source
+
+    directory = Path(root) / f"{PARTITION}={crawled_at.date().isoformat()}"
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]
+    path = directory / f"{crawled_at:%H%M%S%f}-{digest}.parquet"
+    if path.exists():
+        raise FileExistsError(f"{path} already exists - snapshots are append-only")
+    tmp = directory / f".{path.name}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+def partitions(root=SNAPSHOT_DIR, start=None, end=None):
+    """[(crawl date, directory)] for the crawl dates between `start` and `end` inclusive, oldest first"""
+    start, end = _as_date(start), _as_date(end)
+    found = []
+    for directory in Path(root).glob(f'{PARTITION}=*'):
+        crawl_date = date.fromisoformat(directory.name.split('=', 1)[1])
+        if (start is None or crawl_date >= start) and (end is None or crawl_date <= end):
+            found.append((crawl_date, directory))
+    return sorted(found)
+
+def latest_partition(root=SNAPSHOT_DIR, on_or_before=None):
+    """(crawl date, directory) of the last crawl date up to `on_or_before`, or None"""
+    found = partitions(root, end=on_or_before)
+    return found[-1] if found else None
+
+def read_partitions(directories, columns=None, companies=None):
+    """Rows of the given partition directories, oldest crawl first
+
+    `companies` (company_url values) is pushed down into the Parquet scan.
+    """
+    import pyarrow.dataset as ds
+
+    files = sorted(str(path) for directory in directories for path in Path(directory).glob('*.parquet'))
+    if not files:
+        return pd.DataFrame(columns=columns or ['crawled_at', *FIELDS, 'funding_usd', 'source'])
+    if columns is not None and 'crawled_at' not in columns:
+        columns = ['crawled_at', *columns]
+    dataset = ds.dataset(files, format='parquet')
+    row_filter = ds.field('company_url').isin(list(companies)) if companies is not None else None
+    df = dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+    return df.sort_values('crawled_at', kind='stable', ignore_index=True)
+
+def read_snapshots(root=SNAPSHOT_DIR, start=None, end=None, columns=None, companies=None):
+    """Rows of every crawl dated between `start` and `end`, touching only those partitions"""
+    return read_partitions([directory for _, directory in partitions(root, start, end)], columns, companies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', default=SNAPSHOT_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help='store a company CSV as one crawl')
+    add.add_argument('csv')
+    add.add_argument('--crawled-at', help='ISO timestamp of the crawl (default: the file\'s modification time)')
+    add.add_argument('--source', help='listing URL or label (default: the CSV path)')
+    sub.add_parser('list', help='list crawl dates and their files')
+    args = parser.parse_args()
+
+    if args.command == 'add':
+        from delta import read_rows
+
+        if args.crawled_at:
+            crawled_at = datetime.fromisoformat(args.crawled_at)
+            crawled_at = crawled_at if crawled_at.tzinfo else crawled_at.replace(tzinfo=timezone.utc)
+        else:
+            crawled_at = datetime.fromtimestamp(Path(args.csv).stat().st_mtime, timezone.utc)
+        path = write_snapshot(read_rows(args.csv), args.dir, crawled_at, source=args.source or args.csv)
+        print(f"Stored {args.csv} as {path}")
+        return
+
+    for crawl_date, directory in partitions(args.dir):
+        files = sorted(directory.glob('*.parquet'))
+        size = sum(path.stat().st_size for path in files)
+        print(f"{crawl_date}  {len(files):3d} crawls  {size / 1e6:8.2f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+"""SQLite company store - crawled rows upserted by company_url
+
+Companies, investors and team members live in normalised tables with
+indexes on city, location, founded year and funding; every crawl is
+recorded with its timestamp and each company keeps the crawl it was first
+and last seen in. summarize_db() computes aggregate.summarize() with
+GROUP BY queries, so only aggregated rows leave the database. It counts the
+companies listed in the latest crawl of each source - what the delta-updated
+CSV holds - unless asked for every company ever stored.
+"""
+from contextlib import closing
+from datetime import datetime, timezone
+import argparse
+import sqlite3
+import pandas as pd
+
+from aggregate import (AGE_BINS, AGE_LABELS, COMPLETENESS_FIELDS, TEAM_BINS,
+                       TEAM_LABELS, TOP_INVESTORS, _bucket_counts, crawl_year)
+from classifier import industry_labels
+from dataset import DATASET_CSV, to_typed
+from extract import FIELDS
+from features import city_column
+from normalize import default_aliases
+
+DB_PATH = 'f6s_companies.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    crawled_at TEXT NOT NULL,
+    companies INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    company_url TEXT NOT NULL UNIQUE,
+    company_name TEXT NOT NULL,
+    tagline TEXT NOT NULL,
+    logo_url TEXT NOT NULL,
+    location TEXT NOT NULL,
+    city TEXT NOT NULL,
+    industry TEXT NOT NULL,
+    founded_year INTEGER,
+    funding_amount TEXT NOT NULL,
+    funding_usd REAL,
+    investor_count INTEGER,
+    team_count INTEGER,
+    description TEXT NOT NULL,
+    first_crawl INTEGER NOT NULL REFERENCES crawls(id),
+    last_crawl INTEGER NOT NULL REFERENCES crawls(id)
+);
+CREATE TABLE IF NOT EXISTS investors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS company_investors (
+    company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+    investor_id INTEGER NOT NULL REFERENCES investors(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (company_id, investor_id)
+);
+CREATE TABLE IF NOT EXISTS team_members (
+    company_id INTEGER NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (company_id, position)
+);
+CREATE INDEX IF NOT EXISTS companies_city ON companies(city);
+CREATE INDEX IF NOT EXISTS companies_location ON companies(location);
+CREATE INDEX IF NOT EXISTS companies_founded_year ON companies(founded_year);
+CREATE INDEX IF NOT EXISTS companies_funding ON companies(funding_usd);
+CREATE INDEX IF NOT EXISTS companies_industry ON companies(industry);
+CREATE INDEX IF NOT EXISTS company_investors_investor ON company_investors(investor_id);
+"""
+
+# Companies listed by the most recent crawl of their source
+CURRENT = '(SELECT * FROM companies WHERE last_crawl IN (SELECT MAX(id) FROM crawls GROUP BY source))'
+
+COLUMNS = ('company_url', 'company_name', 'tagline', 'logo_url', 'location', 'city', 'industry',
+           'founded_year', 'funding_amount', 'funding_usd', 'investor_count', 'team_count', 'description')
+
+UPSERT = f"""
+INSERT INTO companies ({', '.join(COLUMNS)}, first_crawl, last_crawl)
+VALUES ({', '.join('?' * (len(COLUMNS) + 2))})
+ON CONFLICT(company_url) DO UPDATE SET
+    {', '.join(f'{column} = excluded.{column}' for column in COLUMNS[1:])},
+    last_crawl = excluded.last_crawl
+RETURNING id
+"""
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+def _value(value):
+    """pandas scalar -> sqlite parameter"""
+    if value is None or value is pd.NA or (isinstance(value, float) and value != value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+def upsert_companies(conn, rows, source, crawled_at=None, unchanged=()):
+    """Record a crawl and upsert its rows; returns (crawl id, companies written)
+
+    Rows without a company_url cannot be keyed and are skipped. Stored
+    companies whose URL is in `unchanged` (see delta.unchanged_urls) only have
+    last_crawl moved to this crawl; they are not re-typed, re-classified or
+    rewritten.
+    """
+    crawled_at = crawled_at or datetime.now(timezone.utc)
+    raw = pd.DataFrame(list(rows), columns=FIELDS).fillna('')
+    raw = raw[raw['company_url'] != ''].drop_duplicates('company_url')
+    listed = len(raw)
+
+    seen = []
+    if unchanged:
+        stored = {url for (url,) in conn.execute('SELECT company_url FROM companies')}
+        seen = [url for url in raw['company_url'] if url in unchanged and url in stored]
+        raw = raw[~raw['company_url'].isin(seen)]
+
+    df = to_typed(raw)
+    aliases = default_aliases()
+    df['investors'] = aliases.list_column('investors', df['investors'])
+    df['city'] = aliases.column('cities', city_column(df['location']))
+    df['industry'] = industry_labels(df)['industry']
+
+    with conn:
+        crawl = conn.execute('INSERT INTO crawls (source, crawled_at, companies) VALUES (?, ?, ?)',
+                             (source, crawled_at.isoformat(), listed)).lastrowid
+        conn.executemany('UPDATE companies SET last_crawl = ? WHERE company_url = ?', [(crawl, url) for url in seen])
+
+        investor_ids = dict(conn.execute('SELECT name, id FROM investors'))
+        new_investors = {name for names in df['investors'] for name in names} - investor_ids.keys()
+        conn.executemany('INSERT INTO investors (name) VALUES (?)', [(name,) for name in sorted(new_investors)])
+        if new_investors:
+            investor_ids = dict(conn.execute('SELECT name, id FROM investors'))
+
+        links, members = [], []
+        for record in df[list(COLUMNS) + ['investors', 'team_members']].itertuples(index=False):
+            values = [_value(v) for v in record[:len(COLUMNS)]]
+            company_id = conn.execute(UPSERT, values + [crawl, crawl]).fetchone()[0]
+            links.append((company_id, record.investors))
+            members.append((company_id, record.team_members))
+
+        ids = [(company_id,) for company_id, _ in links]
+        conn.executemany('DELETE FROM company_investors WHERE company_id = ?', ids)
+        conn.executemany('DELETE FROM team_members WHERE company_id = ?', ids)
+        conn.executemany('INSERT INTO company_investors VALUES (?, ?, ?)',
+                         [(company_id, investor_ids[name], position)
+                          for company_id, names in links for position, name in enumerate(names)])
+        conn.executemany('INSERT INTO team_members VALUES (?, ?, ?)',
+                         [(company_id, position, name)
+                          for company_id, names in members for position, name in enumerate(names)])
+    return crawl, len(df)
+
+def _pairs(conn, sql, *params):
+    return conn.execute(sql, params).fetchall()
+
+def summarize_db(conn, reference_year=None, all_history=False):
+    """aggregate.summarize() computed with SQL aggregations
+
+    Only companies seen in the latest crawl of their source are counted, as
+    in the CSV dataset; `all_history` counts every company ever upserted,
+    delisted ones included. Ties in the ranked lists are broken by name
+    rather than by row order. Company ages are counted up to the year of the
+    latest crawl by default.
+    """
+    companies = 'companies' if all_history else CURRENT
+    if reference_year is None:
+        last = conn.execute('SELECT MAX(crawled_at) FROM crawls').fetchone()[0]
+        reference_year = crawl_year(datetime.fromisoformat(last) if last else None)
+    has_investors = 'EXISTS (SELECT 1 FROM company_investors ci WHERE ci.company_id = c.id)'
+    has_team = 'EXISTS (SELECT 1 FROM team_members t WHERE t.company_id = c.id)'
+    (total, with_funding, with_investors, with_team, with_description, total_funding,
+     average_funding, average_team_size, cities, industries) = conn.execute(f"""
+        SELECT COUNT(*),
+               COALESCE(SUM(funding_usd > 0), 0),
+               COALESCE(SUM({has_investors}), 0),
+               COALESCE(SUM({has_team}), 0),
+               COALESCE(SUM(description != ''), 0),
+               COALESCE(SUM(funding_usd), 0.0),
+               AVG(CASE WHEN funding_usd > 0 THEN funding_usd END),
+               AVG(COALESCE(team_count, 0)),
+               COUNT(DISTINCT city),
+               COUNT(DISTINCT industry)
+        FROM {companies} c""").fetchone()
+
+    filled_sql = {field: f"{field} != ''" for field in COMPLETENESS_FIELDS}
+    filled_sql.update({'founded_year': 'founded_year IS NOT NULL', 'investors': has_investors,
+                       'team_members': has_team})
+    completeness = conn.execute('SELECT ' + ', '.join(f'COALESCE(SUM({filled_sql[field]}), 0)'
+                                                      for field in COMPLETENESS_FIELDS)
+                                + f' FROM {companies} c').fetchone()
+
+    city_counts = _pairs(conn, f'SELECT city, COUNT(*) AS n FROM {companies} c GROUP BY city '
+                               'ORDER BY n DESC, city')
+    industry_counts = _pairs(conn, f'SELECT industry, COUNT(*) AS n FROM {companies} c GROUP BY industry '
+                                   'ORDER BY n DESC, industry')
+    industry_funding = _pairs(conn, f'SELECT industry, COALESCE(SUM(funding_usd), 0.0) AS f FROM {companies} c '
+                                    'GROUP BY industry ORDER BY f, industry')
+    funded = _pairs(conn, f'SELECT company_name, funding_usd FROM {companies} c WHERE funding_usd > 0 '
+                          'ORDER BY funding_usd, id')
+    year_counts = _pairs(conn, f'SELECT founded_year, COUNT(*) FROM {companies} c '
+                               'WHERE founded_year IS NOT NULL GROUP BY founded_year ORDER BY founded_year')
+    team_histogram = _pairs(conn, f'SELECT COALESCE(team_count, 0), COUNT(*) FROM {companies} c GROUP BY 1')
+    investor_counts = _pairs(conn, 'SELECT i.name, COUNT(*) AS n FROM company_investors ci '
+                                   f'JOIN {companies} c ON c.id = ci.company_id '
+                                   'JOIN investors i ON i.id = ci.investor_id '
+                                   'GROUP BY i.id ORDER BY n DESC, i.name LIMIT ?', TOP_INVESTORS)
+    most_funded = conn.execute(f'SELECT company_name, funding_usd FROM {companies} c WHERE funding_usd > 0 '
+                               'ORDER BY funding_usd DESC, id LIMIT 1').fetchone()
+
+    years = pd.Series(dict(year_counts), dtype='int64')
+    age_counts = _bucket_counts(pd.Series(years.to_numpy(), index=reference_year - years.index),
+                                AGE_BINS, AGE_LABELS)
+    team_counts = _bucket_counts(pd.Series(dict(team_histogram), dtype='int64'), TEAM_BINS, TEAM_LABELS)
+
+    def column(pairs, i):
+        return [pair[i] for pair in pairs]
+
+    return {
+        'reference_year': reference_year,
+        'companies': total,
+        'with_funding': with_funding,
+        'with_investors': with_investors,
+        'with_team': with_team,
+        'with_description': with_description,
+        'total_funding': float(total_funding),
+        'average_funding': average_funding,
+        'average_team_size': float(average_team_size or 0.0),
+        'cities': cities,
+        'industries': industries,
+        'top_city': list(city_counts[0]) if city_counts else None,
+        'top_industry': list(industry_counts[0]) if industry_counts else None,
+        'most_funded': {'company': most_funded[0], 'amount': most_funded[1]} if most_funded else None,
+        'charts': {
+            '01_funding_distribution': {
+                'companies': column(funded, 0),
+                'funding': column(funded, 1),
+            },
+            '02_geographic_distribution': {
+                'cities': column(city_counts[::-1], 0),
+                'counts': column(city_counts[::-1], 1),
+            },
+            '03_industry_distribution': {
+                'industries': column(industry_counts, 0),
+                'counts': column(industry_counts, 1),
+            },
+            '04_founding_timeline': {
+                'years': column(year_counts, 0),
+                'counts': column(year_counts, 1),
+            },
+            '05_funding_by_industry': {
+                'industries': column(industry_funding, 0),
+                'funding': column(industry_funding, 1),
+            },
+            '06_maturity_and_team': {
+                'age_labels': AGE_LABELS,
+                'age_counts': [int(v) for v in age_counts],
+                'team_labels': TEAM_LABELS,
+                'team_counts': [int(v) for v in team_counts],
+            },
+            '07_investor_engagement': {
+                'with_investors': with_investors,
+                'without_investors': total - with_investors,
+                'top_investors': column(investor_counts, 0),
+                'top_counts': column(investor_counts, 1),
+            },
+            '08_data_completeness': {
+                'fields': COMPLETENESS_FIELDS,
+                'completeness': [count / total * 100 if total else 0.0 for count in completeness],
+            },
+        },
+    }
+
+def main():
+    from delta import read_rows
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    load = sub.add_parser('import', help='upsert a company CSV as one crawl')
+    load.add_argument('csv', nargs='?', default=DATASET_CSV)
+
+    sub.add_parser('crawls', help='list recorded crawls')
+
+    args = parser.parse_args()
+
+    with closing(connect(args.db)) as conn:
+        if args.command == 'import':
+            crawl, count = upsert_companies(conn, read_rows(args.csv), source=args.csv)
+            print(f"Upserted {count} companies from {args.csv} as crawl {crawl} into {args.db}")
+        else:
+            for crawl_id, source, crawled_at, companies in conn.execute('SELECT * FROM crawls ORDER BY id'):
+                print(f"{crawl_id:4d}  {crawled_at}  {companies:6d}  {source}")
+
+if __name__ == '__main__':
+    main()
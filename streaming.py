@@ -0,0 +1,291 @@
+"""Streaming analysis - summarize datasets too large to load at once
+
+The dataset is read in chunks (dataset.iter_dataset); each chunk gets the
+usual analysis columns and is folded into a PartialSummary of counters,
+sums and histograms. Partials merge with each other, so several datasets
+(one per country or crawl) are combined without ever holding more than one
+chunk of rows. finish() returns the same dict as aggregate.summarize().
+
+Memory is bounded by the number of distinct cities, industries, founding
+years and team sizes, plus two fixed-size structures: a Misra-Gries sketch
+for the top investors and the TOP_FUNDED best-funded companies for the
+funding chart.
+
+Past SKETCH_CAPACITY distinct investors the sketch's counts are lower
+bounds. summarize_stream() then re-reads the investors column and counts the
+sketch's candidates exactly; the top-investor list is flagged approximate
+(top_counts_error) only if an investor outside the candidates could still
+rank in it.
+"""
+from collections import Counter
+import argparse
+import heapq
+
+import pandas as pd
+
+from aggregate import (AGE_BINS, AGE_LABELS, COMPLETENESS_FIELDS, TEAM_BINS, TEAM_LABELS, TOP_INVESTORS,
+                       _bucket_counts, crawl_year, save_summary)
+from dataset import DATASET_CSV, crawled_at, filled, iter_dataset
+
+CHUNK_SIZE = 100000
+TOP_FUNDED = 50
+SKETCH_CAPACITY = 1000
+
+FLAGS = ('has_funding', 'has_investors', 'has_team', 'has_description')
+
+class TopK:
+    """Misra-Gries heavy-hitters sketch holding at most `capacity` counters
+
+    Counts are exact while no more than `capacity` distinct items have been
+    seen; past that every estimate is low by at most n / (capacity + 1), so
+    any item more frequent than that is still present. Merging two sketches
+    gives the same guarantee over both inputs.
+    """
+
+    def __init__(self, capacity=SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.counts = Counter()
+        self.n = 0
+
+    def update(self, counts):
+        """Add an item -> count mapping"""
+        for item, count in counts.items():
+            self.counts[item] += count
+            self.n += count
+        self._prune()
+
+    def merge(self, other):
+        self.update(other.counts)
+        # update() counted the other sketch's surviving counts; its n covers everything it saw
+        self.n += other.n - sum(other.counts.values())
+
+    def _prune(self):
+        if len(self.counts) <= self.capacity:
+            return
+        cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = Counter({item: count - cut for item, count in self.counts.items() if count > cut})
+
+    @property
+    def error(self):
+        """Largest amount any count may be under-estimated by"""
+        return self.n // (self.capacity + 1) if self.n > sum(self.counts.values()) else 0
+
+class PartialSummary:
+    """Mergeable aggregates of prepared company chunks (analyze_data.add_analysis_columns)"""
+
+    def __init__(self, top_funded=TOP_FUNDED, sketch_capacity=SKETCH_CAPACITY):
+        self.top_funded = top_funded
+        self.companies = 0
+        self.flags = Counter()
+        self.total_funding = 0.0
+        self.team_total = 0
+        self.cities = Counter()
+        self.industries = Counter()
+        self.industry_funding = Counter()
+        self.years = Counter()
+        self.team_sizes = Counter()
+        self.filled = Counter()
+        self.investors = TopK(sketch_capacity)
+        # Min-heap of (funding, -row, name) keeping the best funded companies; rows break ties by page order
+        self.funded = []
+        self.most_funded = None
+
+    def add(self, df):
+        """Fold one prepared chunk in; row positions come from its index"""
+        self.companies += len(df)
+        self.flags.update({flag: int(df[flag].sum()) for flag in FLAGS})
+        funding = df['funding_numeric']
+        self.total_funding += float(funding.sum())
+        self.team_total += int(df['team_count_numeric'].sum())
+
+        # sort=False keeps first-seen order; with a stable sort in finish() ties come out like value_counts()
+        self.cities.update(df['city'].value_counts(sort=False).to_dict())
+        self.industries.update(df['industry'].value_counts(sort=False).to_dict())
+        self.industry_funding.update(funding.groupby(df['industry'], sort=False).sum().to_dict())
+        self.years.update(df['founded_year_numeric'].dropna().astype(int).value_counts(sort=False).to_dict())
+        self.team_sizes.update(df['team_count_numeric'].value_counts(sort=False).to_dict())
+        self.filled.update({field: int(filled(df[field]).sum())
+                            for field in COMPLETENESS_FIELDS if field in df.columns})
+        self.investors.update(df.loc[df['has_investors'], 'investors'].explode()
+                              .value_counts(sort=False).to_dict())
+
+        funded = df.loc[df['has_funding'], ['company_name', 'funding_numeric']]
+        for row, name, amount in zip(funded.index, funded['company_name'], funded['funding_numeric']):
+            self._add_funded((float(amount), -int(row), name))
+        return self
+
+    def _add_funded(self, entry):
+        if len(self.funded) < self.top_funded:
+            heapq.heappush(self.funded, entry)
+        elif entry > self.funded[0]:
+            heapq.heapreplace(self.funded, entry)
+        if self.most_funded is None or entry[:2] > self.most_funded[:2]:
+            self.most_funded = entry
+
+    def merge(self, other):
+        """Add another partial's aggregates into this one; returns self"""
+        self.companies += other.companies
+        self.total_funding += other.total_funding
+        self.team_total += other.team_total
+        for name in ('flags', 'cities', 'industries', 'industry_funding', 'years', 'team_sizes', 'filled'):
+            getattr(self, name).update(getattr(other, name))
+        self.investors.merge(other.investors)
+        for entry in other.funded:
+            self._add_funded(entry)
+        return self
+
+    def finish(self, reference_year=None, investor_counts=None):
+        """The aggregate.summarize() dict for everything added so far
+
+        `investor_counts` are exact counts for the sketch's candidates (see
+        count_investors); without them the sketch's estimates are used.
+        """
+        reference_year = reference_year or crawl_year()
+        total = self.companies
+        city_counts = pd.Series(self.cities, dtype='int64').sort_values(ascending=False, kind='stable')
+        industry_counts = pd.Series(self.industries, dtype='int64').sort_values(ascending=False, kind='stable')
+        industry_funding = pd.Series(self.industry_funding, dtype='float64').sort_index().sort_values()
+
+        funded = sorted(self.funded, key=lambda entry: -entry[1])
+        funded = pd.DataFrame({'company_name': [entry[2] for entry in funded],
+                               'funding_numeric': [entry[0] for entry in funded]}).sort_values('funding_numeric')
+
+        year_counts = pd.Series(self.years, dtype='int64').sort_index()
+        age_counts = _bucket_counts(pd.Series(year_counts.to_numpy(), index=reference_year - year_counts.index),
+                                    AGE_BINS, AGE_LABELS)
+        team_counts = _bucket_counts(pd.Series(self.team_sizes, dtype='int64'), TEAM_BINS, TEAM_LABELS)
+        exact = investor_counts is not None
+        investor_counts = pd.Series(investor_counts if exact else self.investors.counts, dtype='int64')
+        investor_counts = investor_counts.sort_values(ascending=False, kind='stable').head(TOP_INVESTORS)
+        # Investors dropped from the sketch occur at most `error` times; estimates are low by up to as much
+        error = self.investors.error
+        if exact and (investor_counts.empty or investor_counts.iloc[-1] > error):
+            error = 0
+
+        with_funding = self.flags['has_funding']
+        with_investors = self.flags['has_investors']
+        return {
+            'reference_year': reference_year,
+            'companies': total,
+            'with_funding': with_funding,
+            'with_investors': with_investors,
+            'with_team': self.flags['has_team'],
+            'with_description': self.flags['has_description'],
+            'total_funding': self.total_funding,
+            'average_funding': self.total_funding / with_funding if with_funding else None,
+            'average_team_size': self.team_total / total if total else float('nan'),
+            'cities': int(city_counts.size),
+            'industries': int(industry_counts.size),
+            'top_city': [city_counts.index[0], int(city_counts.iloc[0])] if total else None,
+            'top_industry': [industry_counts.index[0], int(industry_counts.iloc[0])] if total else None,
+            'most_funded': ({'company': self.most_funded[2], 'amount': self.most_funded[0]}
+                            if self.most_funded else None),
+            'charts': {
+                '01_funding_distribution': {
+                    'companies': funded['company_name'].tolist(),
+                    'funding': funded['funding_numeric'].tolist(),
+                },
+                '02_geographic_distribution': {
+                    'cities': city_counts.sort_values().index.tolist(),
+                    'counts': city_counts.sort_values().tolist(),
+                },
+                '03_industry_distribution': {
+                    'industries': industry_counts.index.tolist(),
+                    'counts': industry_counts.tolist(),
+                },
+                '04_founding_timeline': {
+                    'years': year_counts.index.tolist(),
+                    'counts': year_counts.tolist(),
+                },
+                '05_funding_by_industry': {
+                    'industries': industry_funding.index.tolist(),
+                    'funding': industry_funding.tolist(),
+                },
+                '06_maturity_and_team': {
+                    'age_labels': AGE_LABELS,
+                    'age_counts': [int(v) for v in age_counts],
+                    'team_labels': TEAM_LABELS,
+                    'team_counts': [int(v) for v in team_counts],
+                },
+                '07_investor_engagement': {
+                    'with_investors': with_investors,
+                    'without_investors': total - with_investors,
+                    'top_investors': investor_counts.index.tolist(),
+                    'top_counts': investor_counts.tolist(),
+                    **({'top_counts_error': error} if error else {}),
+                },
+                '08_data_completeness': {
+                    'fields': COMPLETENESS_FIELDS,
+                    'completeness': [self.filled[field] / total * 100 if total else 0.0
+                                     for field in COMPLETENESS_FIELDS],
+                },
+            },
+        }
+
+def summarize_partial(path, chunk_size=CHUNK_SIZE, aliases=None):
+    """PartialSummary of one dataset, read `chunk_size` rows at a time"""
+    from analyze_data import COLUMNS, add_analysis_columns
+    from normalize import default_aliases
+
+    aliases = aliases or default_aliases()
+    partial = PartialSummary()
+    for chunk in iter_dataset(path, columns=COLUMNS, chunk_size=chunk_size):
+        partial.add(add_analysis_columns(chunk, aliases))
+    return partial
+
+def count_investors(paths, candidates, chunk_size=CHUNK_SIZE, aliases=None):
+    """Exact number of companies per investor in `candidates`, reading only the investors column"""
+    from normalize import default_aliases
+
+    aliases = aliases or default_aliases()
+    counts = Counter(dict.fromkeys(candidates, 0))
+    for path in paths:
+        for chunk in iter_dataset(path, columns=['investors'], chunk_size=chunk_size):
+            names = aliases.list_column('investors', chunk['investors']).explode()
+            counts.update(names[names.isin(counts.keys())].value_counts(sort=False).to_dict())
+    return counts
+
+def summarize_stream(paths, chunk_size=CHUNK_SIZE, reference_year=None, exact_investors=True):
+    """aggregate.summarize() over one or more datasets without loading any of them whole
+
+    Company ages are counted up to the year of the most recently crawled
+    dataset by default. When the investor sketch overflowed, a second pass
+    counts its candidates exactly unless `exact_investors` is false.
+    """
+    from normalize import default_aliases
+
+    reference_year = reference_year or crawl_year(max(filter(None, map(crawled_at, paths)), default=None))
+    aliases = default_aliases()
+    total = PartialSummary()
+    for path in paths:
+        partial = summarize_partial(path, chunk_size, aliases)
+        print(f"{path}: {partial.companies} companies")
+        total.merge(partial)
+
+    investor_counts = None
+    if total.investors.error and exact_investors:
+        print(f"Over {total.investors.capacity} distinct investors - recounting "
+              f"{len(total.investors.counts)} candidates exactly")
+        investor_counts = count_investors(paths, total.investors.counts, chunk_size, aliases)
+    return total.finish(reference_year, investor_counts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('datasets', nargs='*', default=[DATASET_CSV], help='dataset CSVs to combine')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--json', help='write every aggregate to this JSON file')
+    parser.add_argument('--single-pass', action='store_true',
+                        help='skip the exact investor recount; top-investor counts may be estimates')
+    args = parser.parse_args()
+
+    summary = summarize_stream(args.datasets, args.chunk_size, exact_investors=not args.single_pass)
+    print(f"Total companies: {summary['companies']}")
+    error = summary['charts']['07_investor_engagement'].get('top_counts_error')
+    if error:
+        print(f"Top-investor counts are approximate (may be low by up to {error})")
+    if args.json:
+        save_summary(summary, args.json)
+        print(f"Wrote {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+"""Shared test helpers"""
+import pytest
+
+from extract import get_backend
+
+def extract_rows(html, backend):
+    """Every row a backend extracts from `html`, straight from the page"""
+    find_blocks, extract_company_data = get_backend(backend)
+    return [extract_company_data(block) for block in find_blocks(html)]
+
+@pytest.fixture
+def extract_all():
+    return extract_rows
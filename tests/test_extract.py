@@ -0,0 +1,61 @@
+"""Parser backends - identical rows from bs4 and lxml, snapshot extraction and throughput
+
+The throughput cases need pytest-benchmark and take about a minute for bs4;
+they are marked slow and only run with -m slow.
+"""
+import pytest
+
+from benchmark import synthetic_listing
+from extract import BACKENDS, extract_snapshots, get_backend
+
+BENCH_BLOCKS = 10000
+
+@pytest.fixture(scope='module')
+def listing():
+    return synthetic_listing(300)
+
+@pytest.mark.parametrize('variant', [
+    pytest.param(lambda html: html, id='clean'),
+    pytest.param(lambda html: html.replace('</div>', '', 20), id='unclosed-divs'),
+    pytest.param(lambda html: html.replace('<h3 class="mt4 mb8">', '<h3 class="mt4 mb8"><b>', 30),
+                 id='extra-tags'),
+    pytest.param(lambda html: html.replace('<div class="company-block',
+                                           '<!-- <div> --><div class="company-block', 40), id='comments'),
+    pytest.param(lambda html: html.replace('Almaty', 'Alma&amp;ty &nbsp;'), id='entities'),
+])
+def test_backends_return_identical_rows(extract_all, listing, variant):
+    html = variant(listing)
+    reference = extract_all(html, 'bs4')
+    assert len(reference) == 300
+    assert extract_all(html, 'lxml') == reference
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('html5lib')
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_snapshot_extraction_matches_pages(extract_all, tmp_path, backend):
+    pages = []
+    for i, size in enumerate((120, 75)):
+        html = synthetic_listing(size)
+        path = tmp_path / f'listing_{i}.html'
+        path.write_text(html, encoding='utf-8')
+        pages.append((path, html))
+    expected = [row for _, html in pages for row in extract_all(html, 'bs4')]
+
+    paths = [path for path, _ in pages]
+    serial = extract_snapshots(paths, workers=1, backend=backend, chunk_size=500)
+    assert serial == expected
+    assert extract_snapshots(paths, workers=3, backend=backend, chunk_size=16) == serial
+
+@pytest.fixture(scope='module')
+def large_listing():
+    return synthetic_listing(BENCH_BLOCKS)
+
+@pytest.mark.slow
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_extract_throughput(benchmark, extract_all, large_listing, backend):
+    benchmark.group = f'extract {BENCH_BLOCKS} blocks'
+    rows = benchmark.pedantic(extract_all, args=(large_listing, backend), rounds=1, iterations=1)
+    assert len(rows) == BENCH_BLOCKS
+    benchmark.extra_info['blocks_per_sec'] = BENCH_BLOCKS / benchmark.stats.stats.min
@@ -0,0 +1,31 @@
+"""Vectorized feature columns against the scalar reference functions"""
+import pandas as pd
+import pytest
+
+from benchmark import EDGE_ROWS, synthetic_table
+from dataset import parse_funding
+import features
+
+@pytest.fixture(scope='module')
+def table():
+    # The saved dataset and every edge row, cycled so per_unique sees repeated values
+    return synthetic_table(500)
+
+def same(expected, actual):
+    assert list(expected.astype(object)) == list(actual.astype(object))
+
+def test_funding_column(table):
+    same(table['funding_amount'].apply(parse_funding), features.funding_column(table['funding_amount']))
+
+def test_city_column(table):
+    same(table['location'].apply(features.extract_city), features.city_column(table['location']))
+
+def test_industry_column(table):
+    same(table.apply(features.categorize_industry, axis=1), features.industry_column(table))
+
+@pytest.mark.parametrize('row', EDGE_ROWS, ids=[row['funding_amount'] for row in EDGE_ROWS])
+def test_edge_rows(row):
+    df = pd.DataFrame([row])
+    assert features.funding_column(df['funding_amount'])[0] == parse_funding(row['funding_amount'])
+    assert features.city_column(df['location'])[0] == features.extract_city(row['location'])
+    assert features.industry_column(df)[0] == features.categorize_industry(df.iloc[0])
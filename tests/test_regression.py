@@ -0,0 +1,89 @@
+"""Extraction regression suite - golden rows, throughput and peak memory
+
+data/golden_listing.html holds twelve companies from the saved dataset in
+the page layout the selectors were written against, written independently
+of fixtures.py and including what the extractor has to skip: overview lines
+with other icons, investor avatar and "See all" links, a promo block. Its
+expected rows, copied from the dataset, are in data/golden_listing.csv.
+Every <name>.html / <name>.csv pair in data/ is checked, so a page recorded
+with archive.py and its hand-checked rows can be dropped in next to it.
+
+Throughput and memory floors are fixed here rather than measured against a
+local baseline, so a regression fails on any machine; they sit well below
+what a laptop does (bs4 ~380, lxml ~2,600 blocks/sec, bs4 ~22 MB peak per
+1,000 blocks). tracemalloc only sees Python allocations, so the lxml peak
+leaves out libxml2's tree.
+"""
+from pathlib import Path
+import csv
+import time
+import tracemalloc
+
+import pytest
+
+from benchmark import synthetic_listing
+from extract import BACKENDS, FIELDS
+
+DATA = Path(__file__).with_name('data')
+GOLDEN = sorted(DATA.glob('*.html'))
+
+SIZE = 1000
+MIN_BLOCKS_PER_SEC = {'bs4': 120, 'lxml': 800}
+MAX_PEAK_MB = {'bs4': 35, 'lxml': 4}
+
+def read_rows(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return [{field: row.get(field, '') for field in FIELDS} for row in csv.DictReader(f)]
+
+def field_mismatches(expected, actual):
+    """{field: [company names whose value differs]}"""
+    mismatches = {}
+    for want, got in zip(expected, actual):
+        for field in FIELDS:
+            if want[field] != got[field]:
+                mismatches.setdefault(field, []).append(want['company_name'])
+    return mismatches
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('page', GOLDEN, ids=[path.stem for path in GOLDEN])
+def test_golden_rows(extract_all, page, backend):
+    expected = read_rows(page.with_suffix('.csv'))
+    rows = extract_all(page.read_text(encoding='utf-8'), backend)
+    assert len(rows) == len(expected)
+    assert field_mismatches(expected, rows) == {}
+
+@pytest.mark.parametrize('drift, field', [
+    (('class="mt4 mb8"', 'class="mt4 mb12"'), 'tagline'),
+    (('xlink:href="#location"', 'xlink:href="#map-pin"'), 'location'),
+    (('class="accent hand"', 'class="accent"'), 'team_members'),
+])
+def test_golden_rows_catch_markup_drift(extract_all, drift, field):
+    page = GOLDEN[0]
+    html = page.read_text(encoding='utf-8').replace(*drift)
+    for backend in BACKENDS:
+        assert field in field_mismatches(read_rows(page.with_suffix('.csv')), extract_all(html, backend))
+
+@pytest.fixture(scope='module')
+def listing():
+    return synthetic_listing(SIZE)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_extraction_throughput(extract_all, listing, backend):
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        rows = extract_all(listing, backend)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    assert len(rows) == SIZE
+    assert SIZE / best >= MIN_BLOCKS_PER_SEC[backend]
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_extraction_peak_memory(extract_all, listing, backend):
+    tracemalloc.start()
+    try:
+        extract_all(listing, backend)
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+    assert peak <= MAX_PEAK_MB[backend]
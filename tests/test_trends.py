@@ -0,0 +1,29 @@
+"""Snapshot trends - company status and deltas across crawl dates"""
+from datetime import datetime, timezone
+
+from dataset import DATASET_CSV
+from delta import read_rows
+from snapshots import write_snapshot
+from trends import compare
+
+def at(day, hour, minute):
+    return datetime(2025, 3, day, hour, minute, tzinfo=timezone.utc)
+
+def test_two_listings_crawled_the_same_day(tmp_path):
+    rows = read_rows(DATASET_CSV)
+    listing_a, listing_b = rows[:40], rows[40:]
+    removed, added = listing_b[-1], dict(listing_b[0], company_url='https://www.f6s.com/new-company')
+    grown = dict(listing_a[0], team_count='250')
+
+    for day, a, b in ((1, listing_a, listing_b),
+                      (2, [grown, *listing_a[1:]], [*listing_b[:-1], added])):
+        write_snapshot(a, tmp_path, at(day, 10, 0), source='listing-a')
+        write_snapshot(b, tmp_path, at(day, 10, 5), source='listing-b')
+
+    for window in (False, True):
+        trends, read = compare(tmp_path, window=window)
+        assert len(read) == 2
+        assert trends['status'].value_counts().to_dict() == {'tracked': 95, 'new': 1, 'removed': 1}
+        assert trends.loc[added['company_url'], 'status'] == 'new'
+        assert trends.loc[removed['company_url'], 'status'] == 'removed'
+        assert trends.loc[grown['company_url'], 'team_count_delta'] == 250 - int(listing_a[0]['team_count'] or 0)
@@ -0,0 +1,145 @@
+"""Trend analytics over crawl snapshots - per-company deltas and growth between crawls
+
+compare reads two partitions only, the last crawl date on or before each
+end of the range; with --window it reads every crawl date in the range and
+measures each company from its first to its last appearance. timeline
+aggregates every crawl date in the range from the metric columns alone.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from snapshots import SNAPSHOT_DIR, latest_partition, partitions, read_partitions, read_snapshots
+
+KEY = 'company_url'
+METRICS = ('funding_usd', 'investor_count', 'team_count')
+TREND_COLUMNS = [KEY, 'company_name', *METRICS]
+
+def company_trends(df):
+    """Per-company first and last observation, delta and growth of every metric
+
+    `df` holds snapshot rows ordered by crawled_at; missing funding and
+    counts count as 0, like in the analysis. Growth is relative to the first
+    observation and NaN when that was 0. status is 'new' for companies
+    missing from the first crawl date, 'removed' for ones missing from the
+    last - by date, as each listing crawled that day has its own timestamp.
+    """
+    df = df[df[KEY] != '']
+    first = df.drop_duplicates(KEY, keep='first').set_index(KEY)
+    last = df.drop_duplicates(KEY, keep='last').set_index(KEY).reindex(first.index)
+
+    trends = pd.DataFrame({
+        'company_name': last['company_name'],
+        'first_seen': first['crawled_at'],
+        'last_seen': last['crawled_at'],
+        'crawls': df.groupby(KEY, sort=False).size().reindex(first.index),
+    })
+    trends['days'] = (trends['last_seen'] - trends['first_seen']).dt.days
+    crawl_dates = df['crawled_at'].dt.date
+    trends['status'] = np.select([trends['first_seen'].dt.date > crawl_dates.min(),
+                                  trends['last_seen'].dt.date < crawl_dates.max()],
+                                 ['new', 'removed'], 'tracked')
+    for metric in METRICS:
+        start = first[metric].astype('float64').fillna(0)
+        end = last[metric].astype('float64').fillna(0)
+        trends[f'{metric}_start'] = start
+        trends[f'{metric}_end'] = end
+        trends[f'{metric}_delta'] = end - start
+        trends[f'{metric}_growth'] = (end - start) / start.where(start > 0)
+    return trends
+
+def compare(root=SNAPSHOT_DIR, start=None, end=None, window=False):
+    """(company trends, crawl dates read) between the crawls at `start` and `end`
+
+    Dates default to the first and last crawl date in the store.
+    """
+    if window:
+        found = partitions(root, start, end)
+        return company_trends(read_partitions([d for _, d in found], TREND_COLUMNS)), [day for day, _ in found]
+
+    found = partitions(root)
+    if not found:
+        return company_trends(read_partitions([], TREND_COLUMNS)), []
+    before = latest_partition(root, start) if start else found[0]
+    after = latest_partition(root, end) if end else found[-1]
+    chosen = sorted({part for part in (before or found[0], after) if part is not None})
+    return company_trends(read_partitions([d for _, d in chosen], TREND_COLUMNS)), [day for day, _ in chosen]
+
+def timeline(root=SNAPSHOT_DIR, start=None, end=None):
+    """Companies, funding, investors and team size per crawl date in the range"""
+    df = read_snapshots(root, start, end, columns=[KEY, *METRICS])
+    df = df[df[KEY] != ''].assign(crawl_date=df['crawled_at'].dt.date)
+    # A company crawled twice in a day counts once, with its later values
+    df = df.drop_duplicates(['crawl_date', KEY], keep='last')
+    funding = df['funding_usd'].fillna(0)
+    grouped = df.assign(funding=funding, funded=funding > 0,
+                        investors=df['investor_count'].astype('float64').fillna(0),
+                        team=df['team_count'].astype('float64').fillna(0)).groupby('crawl_date')
+    return pd.DataFrame({
+        'companies': grouped.size(),
+        'funded': grouped['funded'].sum(),
+        'total_funding': grouped['funding'].sum(),
+        'investor_links': grouped['investors'].sum(),
+        'average_team_size': grouped['team'].mean(),
+    })
+
+def company_history(root, url, start=None, end=None):
+    """Every snapshot row of one company in the range"""
+    return read_snapshots(root, start, end, columns=TREND_COLUMNS, companies=[url])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dir', default=SNAPSHOT_DIR)
+    parser.add_argument('--from', dest='start', help='first crawl date, YYYY-MM-DD')
+    parser.add_argument('--to', dest='end', help='last crawl date, YYYY-MM-DD')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    comp = sub.add_parser('compare', help='biggest per-company changes between two crawls')
+    comp.add_argument('--window', action='store_true', help='read every crawl in the range, not just its ends')
+    comp.add_argument('--sort', default='funding_usd_delta',
+                      choices=[f'{metric}_{kind}' for metric in METRICS for kind in ('delta', 'growth')])
+    comp.add_argument('-n', type=int, default=10)
+    comp.add_argument('-o', '--output', help='write every company\'s trend to this CSV')
+
+    sub.add_parser('timeline', help='totals per crawl date')
+
+    history = sub.add_parser('company', help='one company across crawls')
+    history.add_argument('url')
+
+    args = parser.parse_args()
+    total = len(partitions(args.dir))
+
+    if args.command == 'compare':
+        trends, read = compare(args.dir, args.start, args.end, args.window)
+        dates = ', '.join(map(str, read)) if len(read) <= 4 else f"{read[0]} .. {read[-1]}"
+        print(f"Read {len(read)} of {total} crawl dates: {dates}")
+        counts = trends['status'].value_counts()
+        print(f"{len(trends)} companies: {counts.get('new', 0)} new, {counts.get('removed', 0)} removed")
+        top = trends[trends['status'] == 'tracked'].sort_values(args.sort, ascending=False, kind='stable')
+        metric = args.sort.rsplit('_', 1)[0]
+        for _, row in top.head(args.n).iterrows():
+            growth = row[f'{metric}_growth']
+            growth = f"{growth:+.0%}" if pd.notna(growth) else 'from 0'
+            print(f"  {row['company_name'][:40]:40s} {row[f'{metric}_start']:>14,.0f} -> "
+                  f"{row[f'{metric}_end']:>14,.0f}  ({growth})")
+        if args.output:
+            trends.to_csv(args.output, encoding='utf-8-sig')
+            print(f"Wrote {args.output}")
+    elif args.command == 'timeline':
+        table = timeline(args.dir, args.start, args.end)
+        print(f"Read {len(table)} of {total} crawl dates")
+        for day, row in table.iterrows():
+            print(f"  {day}  {row['companies']:6.0f} companies  {row['funded']:5.0f} funded  "
+                  f"${row['total_funding']:>14,.0f}  {row['investor_links']:6.0f} investor links  "
+                  f"team {row['average_team_size']:.1f}")
+    else:
+        rows = company_history(args.dir, args.url, args.start, args.end)
+        rows['funding_usd'] = rows['funding_usd'].fillna(0)
+        for _, row in rows.iterrows():
+            print(f"  {row['crawled_at']:%Y-%m-%d %H:%M}  funding {row['funding_usd']:>14,.0f}  "
+                  f"investors {row['investor_count']}  team {row['team_count']}")
+        print(f"{len(rows)} snapshots of {args.url}")
+
+if __name__ == '__main__':
+    main()